@@ -3,3 +3,16 @@ from django.apps import AppConfig
 
 class AcademicsConfig(AppConfig):
     name = 'academics'
+
+    def ready(self):
+        from core.versioning import track_model_versions
+        from .models import (
+            Program,
+            AcademicLevel,
+            Section,
+            Subject,
+            SubjectAssignment,
+        )
+
+        # Version counters for the academic structure endpoints and tree cache
+        track_model_versions(Program, AcademicLevel, Section, Subject, SubjectAssignment)
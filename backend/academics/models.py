@@ -32,6 +32,10 @@ class AcademicLevel(models.Model):
     )
     name = models.CharField(max_length=50, help_text="e.g. 'Grade 10', 'Semester 1'")
     order = models.IntegerField(default=1, help_text="For sorting: 1, 2, 3...")
+    auto_enroll_compulsory = models.BooleanField(
+        default=True,
+        help_text="Enroll students placed in this level into its non-elective subjects",
+    )
 
     class Meta:
         ordering = ["program", "order"]
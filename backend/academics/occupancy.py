@@ -0,0 +1,132 @@
+"""
+Section / level / program occupancy built from one grouped aggregate over
+current StudentLevel rows joined to the student's Profile.
+
+The structure (names, capacities) comes from the cached academic tree, so
+on a warm cache the report costs a single query; the finished report is
+itself cached per tenant until enrollments, profiles or the structure change.
+"""
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Q
+
+from core.versioning import get_versioned_key
+from students.models import Student, StudentLevel
+from .tree import TREE_MODELS, get_academic_tree
+
+OCCUPANCY_MODELS = TREE_MODELS + (Student, StudentLevel)
+
+GENDERS = ("male", "female", "other")
+
+COUNTERS = ("headcount", *GENDERS, "unspecified", "activated")
+
+
+def _empty():
+    return dict.fromkeys(COUNTERS, 0)
+
+
+def _add(total, row):
+    for key in COUNTERS:
+        total[key] += row[key]
+
+
+def _finish(node, counts, capacity):
+    node.update(
+        {
+            "headcount": counts["headcount"],
+            "capacity": capacity,
+            "free_seats": max(capacity - counts["headcount"], 0),
+            "gender": {g: counts[g] for g in (*GENDERS, "unspecified")},
+            "activated": counts["activated"],
+            "activation_ratio": (
+                round(counts["activated"] / counts["headcount"], 3)
+                if counts["headcount"]
+                else 0
+            ),
+        }
+    )
+    return node
+
+
+def _count_current_enrollments():
+    """The only query: headcounts per (level, section) in one GROUP BY."""
+    gender_counts = {
+        g: Count("id", filter=Q(student__profile__gender=g)) for g in GENDERS
+    }
+    return (
+        StudentLevel.objects.filter(is_current=True)
+        .values("level_id", "section_id")
+        .annotate(
+            headcount=Count("id"),
+            unspecified=Count("id", filter=~Q(student__profile__gender__in=GENDERS)),
+            activated=Count("id", filter=Q(student__profile__user_id__isnull=False)),
+            **gender_counts,
+        )
+        .order_by()
+    )
+
+
+def build_occupancy():
+    by_section, by_level = {}, {}
+    for row in _count_current_enrollments():
+        _add(by_level.setdefault(row["level_id"], _empty()), row)
+        if row["section_id"]:
+            _add(by_section.setdefault(row["section_id"], _empty()), row)
+
+    programs, totals, total_capacity = [], _empty(), 0
+    for program in get_academic_tree():
+        program_counts, program_capacity, levels = _empty(), 0, []
+
+        for level in program["levels"]:
+            sections = [
+                _finish(
+                    {"id": s["id"], "name": s["name"]},
+                    by_section.get(s["id"], _empty()),
+                    s["capacity"],
+                )
+                for s in level["sections"]
+            ]
+            level_counts = by_level.get(level["id"], _empty())
+            level_capacity = sum(s["capacity"] for s in sections)
+            node = _finish(
+                {"id": level["id"], "name": level["name"], "sections": sections},
+                level_counts,
+                level_capacity,
+            )
+            # Current students placed in the level but not yet in a section
+            node["unassigned"] = level_counts["headcount"] - sum(
+                s["headcount"] for s in sections
+            )
+            levels.append(node)
+
+            _add(program_counts, level_counts)
+            program_capacity += level_capacity
+
+        programs.append(
+            _finish(
+                {
+                    "id": program["id"],
+                    "name": program["name"],
+                    "code": program["code"],
+                    "levels": levels,
+                },
+                program_counts,
+                program_capacity,
+            )
+        )
+        _add(totals, program_counts)
+        total_capacity += program_capacity
+
+    return {"programs": programs, "totals": _finish({}, totals, total_capacity)}
+
+
+def get_occupancy():
+    key = get_versioned_key("academics:occupancy", *OCCUPANCY_MODELS)
+    report = cache.get(key)
+    if report is None:
+        report = build_occupancy()
+        cache.set(
+            key, report, timeout=getattr(settings, "ACADEMIC_TREE_CACHE_TTL", 3600)
+        )
+    return report
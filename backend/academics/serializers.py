@@ -31,6 +31,7 @@ class AcademicLevelSerializer(serializers.ModelSerializer):
             "program_name",
             "name",
             "order",
+            "auto_enroll_compulsory",
             "sections",
         ]
 
@@ -1,3 +1,140 @@
-from django.test import TestCase
+import uuid
 
-# Create your tests here.
+from django.core.cache import cache
+from django.test import SimpleTestCase
+from django_tenants.test.cases import TenantTestCase
+from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
+from rest_framework.test import APIRequestFactory
+from rest_framework.views import APIView
+
+from core.mixins import ConditionalGetMixin
+from core.versioning import bump_model_version
+from profiles.models import Profile
+from staff.models import Instructor, StaffMember
+from students.models import Student, StudentLevel
+from .models import AcademicLevel, Program, Section, Subject, SubjectAssignment
+from .occupancy import get_occupancy
+from .tree import get_academic_tree
+
+
+class ProgramCountView(ConditionalGetMixin, APIView):
+    permission_classes = [AllowAny]
+    authentication_classes = []
+    version_models = (Program,)
+    calls = 0
+
+    def get(self, request):
+        ProgramCountView.calls += 1
+        return Response({"ok": True})
+
+
+class ConditionalGetMixinTest(SimpleTestCase):
+    """304s are served from the version counters without running the handler."""
+
+    def setUp(self):
+        cache.clear()
+        ProgramCountView.calls = 0
+        self.factory = APIRequestFactory()
+        self.view = ProgramCountView.as_view()
+
+    def test_not_modified_until_table_changes(self):
+        first = self.view(self.factory.get("/api/academics/programs/"))
+        self.assertEqual(first.status_code, 200)
+        etag = first["ETag"]
+
+        cached = self.view(
+            self.factory.get("/api/academics/programs/", HTTP_IF_NONE_MATCH=etag)
+        )
+        self.assertEqual(cached.status_code, 304)
+        self.assertEqual(ProgramCountView.calls, 1)
+
+        bump_model_version(Program)
+        changed = self.view(
+            self.factory.get("/api/academics/programs/", HTTP_IF_NONE_MATCH=etag)
+        )
+        self.assertEqual(changed.status_code, 200)
+        self.assertNotEqual(changed["ETag"], etag)
+
+
+class AcademicStructureTest(TenantTestCase):
+    def setUp(self):
+        cache.clear()
+        self.program = Program.objects.create(name="High School", code="HS")
+        self.level = AcademicLevel.objects.create(program=self.program, name="Grade 10")
+        self.section_a = Section.objects.create(level=self.level, name="A", capacity=30)
+        self.section_b = Section.objects.create(level=self.level, name="B", capacity=20)
+        self.subject = Subject.objects.create(level=self.level, name="Maths", code="MTH")
+        self.teacher = StaffMember.objects.create(
+            profile=Profile.objects.create(first_name="Ada", last_name="Teacher"),
+            employee_id="T-1",
+            designation="Teacher",
+        )
+        instructor = Instructor.objects.create(
+            staff_member=self.teacher, specialization="Algebra"
+        )
+        SubjectAssignment.objects.create(
+            section=self.section_a, subject=self.subject, instructor=instructor
+        )
+
+    def test_tree_nests_levels_sections_subjects_and_instructors(self):
+        (program,) = get_academic_tree()
+        (level,) = program["levels"]
+
+        self.assertEqual(program["code"], "HS")
+        self.assertEqual([s["name"] for s in level["sections"]], ["A", "B"])
+        self.assertEqual([s["code"] for s in level["subjects"]], ["MTH"])
+        (assignment,) = level["sections"][0]["assignments"]
+        self.assertEqual(assignment["subject_code"], "MTH")
+        self.assertEqual(assignment["instructor"]["name"], "Ada Teacher")
+        self.assertEqual(level["sections"][1]["assignments"], [])
+
+    def test_tree_is_rebuilt_when_an_instructor_is_renamed(self):
+        get_academic_tree()
+        profile = self.teacher.profile
+        profile.first_name = "Grace"
+        profile.save()
+
+        (program,) = get_academic_tree()
+        assignment = program["levels"][0]["sections"][0]["assignments"][0]
+        self.assertEqual(assignment["instructor"]["name"], "Grace Teacher")
+
+    def place(self, enrollment_id, gender, section=None, is_current=True, user_id=None):
+        student = Student.objects.create(
+            profile=Profile.objects.create(
+                first_name=enrollment_id,
+                last_name="Student",
+                gender=gender,
+                user_id=user_id,
+            ),
+            enrollment_id=enrollment_id,
+        )
+        StudentLevel.objects.create(
+            student=student,
+            level=self.level,
+            section=section,
+            academic_year="2026" if is_current else "2025",
+            is_current=is_current,
+        )
+
+    def test_occupancy_counts_current_students_per_section(self):
+        self.place("S-1", "female", self.section_a, user_id=uuid.uuid4())
+        self.place("S-2", "male", self.section_a)
+        self.place("S-3", "", self.section_b)
+        self.place("S-4", "female")  # placed in the level, no section yet
+        self.place("S-5", "male", self.section_b, is_current=False)
+
+        report = get_occupancy()
+        (level,) = report["programs"][0]["levels"]
+        section_a, section_b = level["sections"]
+
+        self.assertEqual((section_a["headcount"], section_a["free_seats"]), (2, 28))
+        self.assertEqual(
+            section_a["gender"], {"male": 1, "female": 1, "other": 0, "unspecified": 0}
+        )
+        self.assertEqual(section_a["activation_ratio"], 0.5)
+        self.assertEqual(section_b["gender"]["unspecified"], 1)
+        self.assertEqual(
+            (level["headcount"], level["unassigned"], level["capacity"]), (4, 1, 50)
+        )
+        self.assertEqual(report["totals"]["headcount"], 4)
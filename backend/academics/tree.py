@@ -0,0 +1,106 @@
+"""
+Nested academic structure: program -> level -> sections / subjects, with the
+instructor assigned to each subject in each section.
+
+Built with one query per table (five in total) and cached per tenant under
+the version counters of every table it reads, so any change to the
+structure, an assignment or an instructor's name yields a fresh tree.
+"""
+
+from django.conf import settings
+from django.core.cache import cache
+
+from core.versioning import get_versioned_key
+from profiles.models import Profile
+from staff.models import Instructor
+from .models import Program, AcademicLevel, Section, Subject, SubjectAssignment
+
+TREE_MODELS = (
+    Program,
+    AcademicLevel,
+    Section,
+    Subject,
+    SubjectAssignment,
+    Instructor,
+    Profile,
+)
+
+
+def build_academic_tree():
+    programs = {
+        p.id: {
+            "id": p.id,
+            "name": p.name,
+            "code": p.code,
+            "is_active": p.is_active,
+            "levels": [],
+        }
+        for p in Program.objects.order_by("name")
+    }
+
+    levels = {}
+    for level in AcademicLevel.objects.order_by("program", "order"):
+        node = {
+            "id": level.id,
+            "name": level.name,
+            "order": level.order,
+            "sections": [],
+            "subjects": [],
+        }
+        levels[level.id] = node
+        programs[level.program_id]["levels"].append(node)
+
+    sections = {}
+    for section in Section.objects.order_by("level", "name"):
+        node = {
+            "id": section.id,
+            "name": section.name,
+            "capacity": section.capacity,
+            "assignments": [],
+        }
+        sections[section.id] = node
+        levels[section.level_id]["sections"].append(node)
+
+    for subject in Subject.objects.order_by("level", "code"):
+        levels[subject.level_id]["subjects"].append(
+            {
+                "id": subject.id,
+                "name": subject.name,
+                "code": subject.code,
+                "credits": str(subject.credits),
+                "is_elective": subject.is_elective,
+            }
+        )
+
+    assignments = SubjectAssignment.objects.select_related(
+        "subject", "instructor__staff_member__profile"
+    ).order_by("subject__code")
+    for assignment in assignments:
+        instructor = None
+        if assignment.instructor:
+            profile = assignment.instructor.staff_member.profile
+            instructor = {
+                "id": assignment.instructor.id,
+                "name": f"{profile.first_name} {profile.last_name}".strip(),
+                "specialization": assignment.instructor.specialization,
+            }
+        sections[assignment.section_id]["assignments"].append(
+            {
+                "id": assignment.id,
+                "subject_id": assignment.subject_id,
+                "subject_code": assignment.subject.code,
+                "subject_name": assignment.subject.name,
+                "instructor": instructor,
+            }
+        )
+
+    return list(programs.values())
+
+
+def get_academic_tree():
+    key = get_versioned_key("academics:tree", *TREE_MODELS)
+    tree = cache.get(key)
+    if tree is None:
+        tree = build_academic_tree()
+        cache.set(key, tree, timeout=getattr(settings, "ACADEMIC_TREE_CACHE_TTL", 3600))
+    return tree
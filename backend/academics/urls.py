@@ -6,6 +6,8 @@ from .views import (
     SectionViewSet,
     SubjectViewSet,
     SubjectAssignmentViewSet,
+    AcademicTreeView,
+    OccupancyView,
 )
 
 router = DefaultRouter()
@@ -16,5 +18,7 @@ router.register(r"subjects", SubjectViewSet)
 router.register(r"assignments", SubjectAssignmentViewSet, basename="assignment")
 
 urlpatterns = [
+    path("tree/", AcademicTreeView.as_view(), name="academic-tree"),
+    path("occupancy/", OccupancyView.as_view(), name="academic-occupancy"),
     path("", include(router.urls)),
 ]
@@ -1,4 +1,6 @@
 from rest_framework import viewsets, permissions
+from rest_framework.response import Response
+from rest_framework.views import APIView
 from .models import Program, AcademicLevel, Section, Subject, SubjectAssignment
 from .serializers import (
     ProgramSerializer,
@@ -8,9 +10,13 @@ from .serializers import (
     SubjectAssignmentSerializer,
 )
 from roles.permissions import HasPermission
+from core.mixins import ConditionalGetMixin
+from .tree import TREE_MODELS, get_academic_tree
+from .occupancy import OCCUPANCY_MODELS, get_occupancy
 
 
-class ProgramViewSet(viewsets.ModelViewSet):
+class ProgramViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
+    version_models = (Program, AcademicLevel, Section)
     queryset = Program.objects.all().prefetch_related("levels__sections")
     serializer_class = ProgramSerializer
 
@@ -48,7 +54,8 @@ class AcademicLevelViewSet(viewsets.ModelViewSet):
         return [permissions.IsAuthenticated(), HasPermission("view_academic_level")]
 
 
-class SectionViewSet(viewsets.ModelViewSet):
+class SectionViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
+    version_models = (Section, AcademicLevel, Program)
     queryset = Section.objects.all().select_related("level__program")
     serializer_class = SectionSerializer
 
@@ -64,10 +71,31 @@ class SectionViewSet(viewsets.ModelViewSet):
         return [permissions.IsAuthenticated(), HasPermission("view_section")]
 
 
-class SubjectViewSet(viewsets.ModelViewSet):
+class SubjectViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
+    version_models = (Subject, AcademicLevel)
     queryset = Subject.objects.all().select_related("level")
     serializer_class = SubjectSerializer
 
+    def perform_create(self, serializer):
+        self._enroll_current_students(serializer.save())
+
+    def perform_update(self, serializer):
+        self._enroll_current_students(serializer.save())
+
+    def _enroll_current_students(self, subject):
+        # A new compulsory subject applies to students already in the level
+        if subject.is_elective:
+            return
+
+        from course_content.enrollment import enroll_compulsory_subjects
+        from students.models import StudentLevel
+
+        enroll_compulsory_subjects(
+            StudentLevel.objects.filter(
+                level_id=subject.level_id, is_current=True
+            ).only("student_id", "level_id", "academic_year", "is_current")
+        )
+
     def get_permissions(self):
         if self.action in ["list", "retrieve"]:
             return [permissions.IsAuthenticated(), HasPermission("view_subject")]
@@ -123,3 +151,33 @@ class SubjectAssignmentViewSet(viewsets.ModelViewSet):
                 HasPermission("delete_subject_assignment"),
             ]
         return [permissions.IsAuthenticated(), HasPermission("view_subject_assignment")]
+
+
+class AcademicTreeView(ConditionalGetMixin, APIView):
+    """
+    Full program -> level -> section/subject hierarchy with instructor
+    assignments, in place of four separate list calls.
+    """
+
+    version_models = TREE_MODELS
+
+    def get_permissions(self):
+        return [permissions.IsAuthenticated(), HasPermission("view_program")]
+
+    def get(self, request):
+        return Response(get_academic_tree())
+
+
+class OccupancyView(ConditionalGetMixin, APIView):
+    """
+    Headcount, free seats, gender split and account-activation ratio per
+    section, level and program for current enrollments.
+    """
+
+    version_models = OCCUPANCY_MODELS
+
+    def get_permissions(self):
+        return [permissions.IsAuthenticated(), HasPermission("view_student")]
+
+    def get(self, request):
+        return Response(get_occupancy())
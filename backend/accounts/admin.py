@@ -1,7 +1,7 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 from django.db import connection
-from .models import User
+from .models import User, UserSession
 from roles.models import UserRole
 
 
@@ -60,3 +60,11 @@ class UserAdmin(GlobalOnlyAdminMixin, BaseUserAdmin):
             },
         ),
     )
+
+
+@admin.register(UserSession)
+class UserSessionAdmin(GlobalOnlyAdminMixin, admin.ModelAdmin):
+    list_display = ("user", "schema_name", "ip_address", "last_used_at", "revoked_at")
+    list_filter = ("schema_name",)
+    search_fields = ("user__username", "user__email")
+    readonly_fields = ("jti", "created_at", "last_used_at", "expires_at")
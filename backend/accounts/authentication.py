@@ -1,5 +1,39 @@
+import uuid
+
+from django.conf import settings
+from django.utils.functional import cached_property
+from rest_framework.exceptions import AuthenticationFailed
 from rest_framework_simplejwt.authentication import JWTAuthentication
 from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+from rest_framework_simplejwt.models import TokenUser
+
+from .utils.sessions import is_session_revoked
+from .utils.token_versions import is_token_revoked
+
+
+class TokenClaimsUser(TokenUser):
+    """
+    Lightweight request user built from access-token claims (see
+    utils.jwt_cookies.add_user_claims). Has no DB row attached; views that
+    need to write to the user must load accounts.User themselves.
+    """
+
+    @cached_property
+    def id(self):
+        # Matches the UUID primary key so comparisons with user_id soft links work
+        return uuid.UUID(str(super().id))
+
+    @cached_property
+    def is_active(self):
+        return self.token.get("is_active", True)
+
+    @cached_property
+    def needs_password_change(self):
+        return self.token.get("needs_password_change", False)
+
+    @cached_property
+    def token_version(self):
+        return self.token.get("token_version", 0)
 
 
 class JWTCookieAuthentication(JWTAuthentication):
@@ -12,7 +46,35 @@ class JWTCookieAuthentication(JWTAuthentication):
 
         try:
             validated_token = self.get_validated_token(access_token)
-            user = self.get_user(validated_token)
+            if (
+                getattr(settings, "JWT_STATELESS_AUTH", False)
+                and "token_version" in validated_token
+            ):
+                user = self.get_stateless_user(validated_token)
+            else:
+                user = self.get_user(validated_token)
             return (user, validated_token)
         except (InvalidToken, TokenError):
             return None
+
+    def get_user(self, validated_token):
+        user = super().get_user(validated_token)
+        if user.token_version != validated_token.get("token_version", 0):
+            raise InvalidToken("Token has been revoked")
+        if is_session_revoked(validated_token.get("sid")):
+            raise InvalidToken("Session has been revoked")
+        return user
+
+    def get_stateless_user(self, validated_token):
+        user = TokenClaimsUser(validated_token)
+
+        if not user.is_active:
+            raise AuthenticationFailed("User is inactive", code="user_inactive")
+
+        if is_token_revoked(user.id, user.token_version):
+            raise InvalidToken("Token has been revoked")
+
+        if is_session_revoked(validated_token.get("sid")):
+            raise InvalidToken("Session has been revoked")
+
+        return user
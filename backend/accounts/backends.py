@@ -1,55 +1,62 @@
 from django.contrib.auth.backends import ModelBackend
 from django.contrib.auth import get_user_model
 from django.db import connection
+from django.db.models import Exists, OuterRef, Q
+from django_tenants.utils import get_public_schema_name
 from profiles.models import Profile
 
 User = get_user_model()
 
 
+def resolve_login_user(identifier):
+    """
+    Resolves what a person typed in the login form to at most one User,
+    in a single query.
+
+    In a tenant schema the school's local_username wins, then the global
+    username (or email if it contains '@'). The Profile lookup runs as a
+    subquery of the User query: the tenant search_path covers both the
+    tenant and public schemas, so no separate round trip is needed.
+    """
+    if "@" in identifier:
+        global_match = Q(email=identifier)
+    else:
+        global_match = Q(username=identifier)
+
+    if connection.schema_name == get_public_schema_name():
+        return User.objects.filter(global_match).first()
+
+    local_profiles = Profile.objects.filter(
+        local_username=identifier, user_id__isnull=False
+    )
+    return (
+        User.objects.annotate(
+            is_local=Exists(local_profiles.filter(user_id=OuterRef("id")))
+        )
+        .filter(Q(id__in=local_profiles.values("user_id")) | global_match)
+        .order_by("-is_local")
+        .first()
+    )
+
+
 class TenantUsernameBackend(ModelBackend):
     """
     Allows authentication using the 'local_username' stored in the tenant's profile.
     This enables school-wide unique usernames instead of globally unique ones.
+    Falls back to the global username/email, and hashes the password exactly
+    once per attempt.
     """
 
     def authenticate(self, request, username=None, password=None, **kwargs):
         if not username or not password:
             return None
 
-        # 1. Get current context
-        schema_name = connection.schema_name
-
-        # Helper to find user by global identifiers (username or email)
-        def get_global_user(identifier):
-            try:
-                if "@" in identifier:
-                    return User.objects.get(email=identifier)
-                return User.objects.get(username=identifier)
-            except User.DoesNotExist:
-                return None
-
-        # 2. PUBLIC SCHEMA: Only check global identifiers
-        if schema_name == "public":
-            user = get_global_user(username)
-            if user and user.check_password(password):
-                return user
+        user = resolve_login_user(username)
+        if user is None:
+            # Run the hasher anyway so unknown usernames cost the same time
+            User().set_password(password)
             return None
 
-        # 3. TENANT SCHEMA: Check local identity, then fallback
-        # First check local_username in the current tenant's Profile table
-        try:
-            profile = Profile.objects.filter(local_username=username).first()
-            if profile and profile.user_id:
-                user = User.objects.filter(id=profile.user_id).first()
-                if user and user.check_password(password):
-                    return user
-        except Exception:
-            # Table might not exist in this context or other DB error
-            pass
-
-        # Fallback to global identifier
-        user = get_global_user(username)
-        if user and user.check_password(password):
+        if user.check_password(password):
             return user
-
         return None
@@ -0,0 +1,21 @@
+from django.conf import settings
+from django.core.checks import Tags, Warning, register
+
+
+@register(Tags.security)
+def stateless_auth_cache_check(app_configs, **kwargs):
+    """Token revocation is published to the cache, which must be shared."""
+    backend = settings.CACHES["default"]["BACKEND"]
+    if getattr(settings, "JWT_STATELESS_AUTH", False) and "locmem" in backend.lower():
+        return [
+            Warning(
+                "JWT_STATELESS_AUTH is enabled with a per-process LocMemCache.",
+                hint=(
+                    "Revoked tokens are only rejected by the worker that saved "
+                    "the user. Use a shared CACHE_BACKEND (Redis/Memcached) or "
+                    "set JWT_STATELESS_AUTH=False."
+                ),
+                id="accounts.W001",
+            )
+        ]
+    return []
@@ -0,0 +1,34 @@
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.management.base import BaseCommand
+from accounts.utils.login_throttle import get_rejection_metrics, reset_rejection_metrics
+
+
+class Command(BaseCommand):
+    help = "Shows how many login attempts the failed-login throttle has rejected."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--reset",
+            action="store_true",
+            help="Reset the counters after printing them.",
+        )
+
+    def handle(self, *args, **options):
+        if isinstance(caches["default"], LocMemCache):
+            self.stdout.write(
+                self.style.WARNING(
+                    "The cache is LocMemCache: counters live in each server process "
+                    "and cannot be read from here. Configure a shared CACHE_BACKEND."
+                )
+            )
+        metrics = get_rejection_metrics()
+
+        self.stdout.write(self.style.MIGRATE_HEADING("--- Login Throttle Rejections ---"))
+        for scope, count in metrics.items():
+            self.stdout.write(f"  - {scope}: {count}")
+        self.stdout.write(f"  Total: {sum(metrics.values())}")
+
+        if options["reset"]:
+            reset_rejection_metrics()
+            self.stdout.write(self.style.SUCCESS("Counters reset."))
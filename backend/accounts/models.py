@@ -15,6 +15,8 @@ class User(AbstractBaseUser, PermissionsMixin):
     # Security & Identity Management
     needs_password_change = models.BooleanField(default=False)
     initial_password_display = models.CharField(max_length=255, null=True, blank=True)
+    # Embedded in JWTs; bumped on password change/deactivation to revoke them
+    token_version = models.PositiveIntegerField(default=0)
 
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -26,3 +28,44 @@ class User(AbstractBaseUser, PermissionsMixin):
 
     def __str__(self):
         return self.username
+
+    def save(self, *args, **kwargs):
+        # Partial saves that deactivate or set a new password must also write
+        # the bumped token_version (see accounts.signals.bump_token_version).
+        # Hasher upgrades (password only, _password cleared) are left alone.
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and (
+            "is_active" in update_fields
+            or ("password" in update_fields and self._password is not None)
+        ):
+            kwargs["update_fields"] = {*update_fields, "token_version"}
+        super().save(*args, **kwargs)
+
+
+class UserSession(models.Model):
+    """
+    One row per login (per user, per tenant). The refresh token's jti is
+    rotated in place on every refresh, so the table stays one row per
+    device instead of growing like a blacklist.
+    """
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="sessions")
+    schema_name = models.CharField(max_length=63)
+
+    # jti of the only refresh token currently valid for this session
+    jti = models.CharField(max_length=255, unique=True)
+
+    user_agent = models.CharField(max_length=255, blank=True, default="")
+    ip_address = models.GenericIPAddressField(null=True, blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    last_used_at = models.DateTimeField(auto_now=True)
+    expires_at = models.DateTimeField()
+    revoked_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [models.Index(fields=["user", "schema_name"])]
+
+    def __str__(self):
+        return f"{self.user_id} @ {self.schema_name}"
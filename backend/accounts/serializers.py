@@ -20,31 +20,13 @@ class LoginSerializer(serializers.Serializer):
     password = serializers.CharField(write_only=True)
 
     def validate(self, attrs):
-        local_username = attrs.get(
-            "username"
-        )  # User enters their school-specific username
-        password = attrs.get("password")
-
-        # Step 1: Try to find the Profile with this local_username in the current tenant
-        from profiles.models import Profile
-        from django.db import connection
-
-        profile = Profile.objects.filter(local_username=local_username).first()
-
-        if not profile or not profile.user_id:
-            # Fallback: Try direct authentication (for backwards compatibility or owner accounts)
-            user = authenticate(username=local_username, password=password)
-        else:
-            # Step 2: Get the global User linked to this Profile
-            from accounts.models import User
-
-            global_user = User.objects.filter(id=profile.user_id).first()
-
-            if not global_user:
-                raise AuthenticationFailed("Invalid credentials")
-
-            # Step 3: Authenticate using the global username
-            user = authenticate(username=global_user.username, password=password)
+        # User enters their school-specific username (or a global username/email).
+        # TenantUsernameBackend resolves it in one query and checks the password once.
+        user = authenticate(
+            self.context.get("request"),
+            username=attrs.get("username"),
+            password=attrs.get("password"),
+        )
 
         if not user:
             raise AuthenticationFailed("Invalid credentials")
@@ -1,4 +1,4 @@
-from django.db.models.signals import pre_delete
+from django.db.models.signals import pre_delete, pre_save, post_save
 from django.dispatch import receiver
 from django.db import connection
 from django.apps import apps
@@ -8,9 +8,46 @@ import logging
 logger = logging.getLogger(__name__)
 
 from .models import User
+from .utils.token_versions import revoke_user_tokens
+from .utils.me_cache import invalidate_me_for_user
 from organizations.models import Organization
 
 
+@receiver(pre_save, sender=User)
+def bump_token_version(sender, instance, update_fields=None, **kwargs):
+    """
+    A password change or deactivation invalidates every JWT issued so far.
+    User.save() adds token_version to partial saves of is_active or a new
+    password; the rest (last_login, hasher upgrades in check_password)
+    cannot revoke anything and are left alone.
+    """
+    if instance._state.adding:
+        return
+    if update_fields is not None and "token_version" not in update_fields:
+        return
+
+    password_changed = instance._password is not None
+    deactivated = (
+        not instance.is_active
+        and User.objects.filter(pk=instance.pk, is_active=True).exists()
+    )
+    if password_changed or deactivated:
+        instance.token_version += 1
+        instance._tokens_revoked = True
+
+
+@receiver(post_save, sender=User)
+def publish_token_revocation(sender, instance, **kwargs):
+    if getattr(instance, "_tokens_revoked", False):
+        revoke_user_tokens(instance)
+        instance._tokens_revoked = False
+
+
+@receiver(post_save, sender=User)
+def invalidate_me_payload(sender, instance, **kwargs):
+    invalidate_me_for_user(instance.id)
+
+
 @receiver(pre_delete, sender=User)
 def cleanup_user_tenant_data(sender, instance, **kwargs):
     """
@@ -1,4 +1,5 @@
-from django.test import TransactionTestCase
+from django.test import TransactionTestCase, SimpleTestCase
+from django.core.cache import cache
 from django.core.management import call_command
 from django.contrib.auth import authenticate
 from django.db import connection
@@ -8,6 +9,18 @@ from accounts.models import User
 from organizations.models import Organization, Domain
 from profiles.models import Profile
 from django_tenants.utils import tenant_context
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.tokens import AccessToken
+from accounts.authentication import JWTCookieAuthentication, TokenClaimsUser
+from accounts.utils.jwt_cookies import add_user_claims
+from accounts.utils.token_versions import revoke_user_tokens
+from accounts.utils.me_cache import get_me_etag, invalidate_me_for_user
+from accounts.utils.login_throttle import LoginThrottle, get_rejection_metrics
+from django.test import RequestFactory, override_settings
+from django_tenants.test.cases import TenantTestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+from accounts.utils.sessions import rotate_session, start_session
+from rest_framework.exceptions import Throttled
 import uuid
 
 
@@ -134,3 +147,158 @@ class EduSekaiIdentityJanitorTest(TransactionTestCase):
         connection.set_schema_to_public()
         self.school_a.delete()
         self.school_b.delete()
+
+
+class StatelessTokenUserTest(SimpleTestCase):
+    """
+    Token-backed request users and the token_version revocation set.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.user = User(
+            id=uuid.uuid4(),
+            username="prof.jones_7f3a19",
+            email="jones@edu.com",
+            needs_password_change=True,
+            token_version=3,
+        )
+
+    def test_claims_user_matches_model(self):
+        token = add_user_claims(AccessToken.for_user(self.user), self.user)
+        claims_user = TokenClaimsUser(token)
+
+        self.assertEqual(claims_user.id, self.user.id)
+        self.assertEqual(claims_user.username, self.user.username)
+        self.assertEqual(claims_user.email, self.user.email)
+        self.assertTrue(claims_user.needs_password_change)
+        self.assertEqual(claims_user.token_version, 3)
+
+    def test_me_etag_changes_with_user_version(self):
+        claims_user = TokenClaimsUser(
+            add_user_claims(AccessToken.for_user(self.user), self.user)
+        )
+        etag = get_me_etag(claims_user, None)
+
+        self.assertEqual(etag, get_me_etag(claims_user, None))
+        self.assertNotEqual(etag, get_me_etag(claims_user, "owner"))
+
+        invalidate_me_for_user(self.user.id)
+        self.assertNotEqual(etag, get_me_etag(claims_user, None))
+
+    def test_revoked_token_is_rejected(self):
+        token = add_user_claims(AccessToken.for_user(self.user), self.user)
+        auth = JWTCookieAuthentication()
+        self.assertEqual(auth.get_stateless_user(token).id, self.user.id)
+
+        self.user.token_version = 4
+        revoke_user_tokens(self.user)
+
+        with self.assertRaises(InvalidToken):
+            auth.get_stateless_user(token)
+
+
+@override_settings(LOGIN_THROTTLE={"USERNAME_LIMIT": 3, "IP_LIMIT": 10})
+class LoginThrottleTest(SimpleTestCase):
+    """
+    Failed logins lock out the username (and throttle the IP) without
+    touching the database or hashing a password.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.request = RequestFactory().post("/api/auth/login/")
+
+    def test_username_locked_after_limit(self):
+        throttle = LoginThrottle(self.request, "Student1")
+        for _ in range(3):
+            throttle.check()
+            throttle.record_failure()
+
+        with self.assertRaises(Throttled) as ctx:
+            LoginThrottle(self.request, "student1").check()
+        self.assertGreater(ctx.exception.wait, 0)
+        self.assertEqual(get_rejection_metrics()["username"], 1)
+
+        # Other usernames from the same IP are still allowed
+        LoginThrottle(self.request, "student2").check()
+
+    def test_success_resets_username_counter(self):
+        throttle = LoginThrottle(self.request, "student1")
+        for _ in range(2):
+            throttle.record_failure()
+        throttle.reset()
+        throttle.record_failure()
+
+        LoginThrottle(self.request, "student1").check()
+
+    def test_ip_limit_rejects_spray_before_hashing(self):
+        for n in range(10):
+            throttle = LoginThrottle(self.request, f"student{n}")
+            throttle.check()
+            throttle.record_failure()
+
+        # Each username is under its own limit; the IP is not
+        with self.assertRaises(Throttled):
+            LoginThrottle(self.request, "teacher").check()
+        self.assertEqual(get_rejection_metrics()["ip"], 1)
+
+        other_ip = RequestFactory().post("/api/auth/login/", REMOTE_ADDR="10.0.0.9")
+        LoginThrottle(other_ip, "teacher").check()
+
+
+@override_settings(REFRESH_ROTATION_GRACE_SECONDS=10)
+class SessionRotationTest(TenantTestCase):
+    """A spent refresh token only works again inside the grace window."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="rotator", password="pw-12345")
+        self.refresh = RefreshToken.for_user(self.user)
+        start_session(self.user, self.refresh)
+
+    def test_parallel_refresh_gets_the_same_replacement(self):
+        first = rotate_session(self.refresh, self.user)
+        second = rotate_session(self.refresh, self.user)
+
+        self.assertNotEqual(first["jti"], self.refresh["jti"])
+        self.assertEqual(str(second), str(first))
+
+    def test_spent_token_rejected_after_grace_window(self):
+        rotate_session(self.refresh, self.user)
+        cache.clear()  # the grace entry has expired
+
+        with self.assertRaises(InvalidToken):
+            rotate_session(self.refresh, self.user)
+
+    def test_spent_token_rejected_once_replacement_is_rotated(self):
+        replacement = rotate_session(self.refresh, self.user)
+        rotate_session(replacement, self.user)
+
+        with self.assertRaises(InvalidToken):
+            rotate_session(self.refresh, self.user)
+
+
+class TokenVersionTest(TenantTestCase):
+    """Partial saves that deactivate or change the password still revoke."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="revokee", password="pw-12345")
+
+    def stored_version(self):
+        return User.objects.values_list("token_version", flat=True).get(pk=self.user.pk)
+
+    def test_partial_deactivation_bumps_token_version(self):
+        self.user.is_active = False
+        self.user.save(update_fields=["is_active"])
+        self.assertEqual(self.stored_version(), 1)
+
+    def test_partial_password_change_bumps_token_version(self):
+        self.user.set_password("new-pw-67890")
+        self.user.save(update_fields=["password"])
+        self.assertEqual(self.stored_version(), 1)
+
+    def test_other_partial_saves_leave_tokens_alone(self):
+        self.user.save(update_fields=["needs_password_change"])
+        self.assertEqual(self.stored_version(), 0)
@@ -2,18 +2,33 @@ from rest_framework.response import Response
 from rest_framework_simplejwt.tokens import RefreshToken
 
 
-def set_jwt_cookies(response: Response, user) -> Response:
+def add_user_claims(token, user):
+    """
+    Embeds the claims JWTCookieAuthentication needs to build the request
+    user without querying the public User table.
+    """
+    token["username"] = user.username
+    token["email"] = user.email
+    token["is_active"] = user.is_active
+    token["is_superuser"] = user.is_superuser
+    token["needs_password_change"] = user.needs_password_change
+    token["token_version"] = user.token_version
+    return token
 
-    refresh = RefreshToken.for_user(user)
 
-    response.set_cookie(
-        key="access_token",
-        value=str(refresh.access_token),
-        httponly=True,
-        samesite="Lax",
-        max_age=60 * 15,
-        secure=False,
-    )
+def set_jwt_cookies(response: Response, user, request=None) -> Response:
+    """Starts a new session for the user and sets both token cookies."""
+    from .sessions import start_session
+
+    refresh = add_user_claims(RefreshToken.for_user(user), user)
+    start_session(user, refresh, request)
+
+    return set_refresh_cookies(response, refresh)
+
+
+def set_refresh_cookies(response: Response, refresh) -> Response:
+
+    set_access_cookie(response, str(refresh.access_token))
 
     response.set_cookie(
         key="refresh_token",
@@ -0,0 +1,145 @@
+"""
+Failed-login throttling, applied before any password hashing.
+
+Every failed login costs a full PBKDF2 hash, so a burst of bad attempts can
+starve CPU for legitimate users. Failures are counted in the cache per
+(tenant, username) and per client IP using a sliding window, and both are
+checked before any hashing. Going over the username limit locks that
+username out for a while. A whole school often sits behind one NAT
+address, so the IP limit is much higher and has no extra lockout: it only
+refuses attempts while the IP's recent failures stay above it, which stops
+a password spray across many usernames from one address.
+
+Rejected attempts are logged and counted so they can be inspected with
+`manage.py login_throttle_stats`. Counters live in the cache, so that (and
+locking across workers) needs a shared backend such as Redis or Memcached;
+LocMemCache keeps a separate copy per process.
+"""
+
+import logging
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from rest_framework.exceptions import Throttled
+from rest_framework.throttling import BaseThrottle
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    "USERNAME_LIMIT": 5,  # failures per tenant + username per window
+    "IP_LIMIT": 200,  # failures per client IP per window (shared NAT); 0 disables
+    "WINDOW_SECONDS": 300,
+    "LOCKOUT_SECONDS": 900,
+}
+
+METRIC_SCOPES = ("username", "ip")
+
+
+def get_config():
+    return {**DEFAULTS, **getattr(settings, "LOGIN_THROTTLE", {})}
+
+
+def _metric_key(scope):
+    return f"accounts:login_throttle:rejected:{scope}"
+
+
+def get_rejection_metrics():
+    """Rejected attempts per scope since the counters were last reset."""
+    values = cache.get_many([_metric_key(scope) for scope in METRIC_SCOPES])
+    return {scope: values.get(_metric_key(scope), 0) for scope in METRIC_SCOPES}
+
+
+def reset_rejection_metrics():
+    cache.delete_many([_metric_key(scope) for scope in METRIC_SCOPES])
+
+
+def _incr(key, timeout):
+    cache.add(key, 0, timeout=timeout)
+    try:
+        return cache.incr(key)
+    except ValueError:
+        # Expired between add() and incr()
+        cache.set(key, 1, timeout=timeout)
+        return 1
+
+
+class LoginThrottle:
+    """
+    Usage:
+        throttle = LoginThrottle(request, username)
+        throttle.check()            # raises Throttled (HTTP 429)
+        ... verify password ...
+        throttle.record_failure()   # or throttle.reset() on success
+    """
+
+    def __init__(self, request, username):
+        self.config = get_config()
+        ident = BaseThrottle().get_ident(request)
+        username = (username or "").strip().lower()
+        self.keys = {
+            "username": f"accounts:login_throttle:{connection.schema_name}:{username}",
+        }
+        self.limits = {"username": self.config["USERNAME_LIMIT"]}
+        if self.config["IP_LIMIT"]:
+            self.keys["ip"] = f"accounts:login_throttle:ip:{ident}"
+            self.limits["ip"] = self.config["IP_LIMIT"]
+
+    def _buckets(self, key, now):
+        window = self.config["WINDOW_SECONDS"]
+        current = int(now // window)
+        return f"{key}:{current}", f"{key}:{current - 1}", (now % window) / window
+
+    def _failures(self, key, now):
+        """Sliding-window estimate: the previous bucket weighted by overlap."""
+        current_key, previous_key, elapsed = self._buckets(key, now)
+        counts = cache.get_many([current_key, previous_key])
+        return counts.get(previous_key, 0) * (1 - elapsed) + counts.get(current_key, 0)
+
+    def _reject(self, scope, wait):
+        _incr(_metric_key(scope), timeout=None)
+        logger.warning(
+            "Login attempt rejected by %s throttle (schema=%s, key=%s, retry_after=%ss)",
+            scope,
+            connection.schema_name,
+            self.keys[scope],
+            wait,
+        )
+        raise Throttled(
+            wait=wait,
+            detail=f"Too many failed login attempts. Try again in {wait} seconds.",
+        )
+
+    def check(self):
+        """Raises Throttled before the password is verified."""
+        now = time.time()
+        window = self.config["WINDOW_SECONDS"]
+
+        key = self.keys["username"]
+        locked_until = cache.get(f"{key}:lock")
+        if locked_until is not None or self._failures(key, now) >= self.limits["username"]:
+            self._reject("username", max(1, int((locked_until or now + window) - now)))
+
+        # No lockout for the IP: it frees up as old failures leave the window
+        if "ip" in self.keys and self._failures(self.keys["ip"], now) >= self.limits["ip"]:
+            self._reject("ip", max(1, int(window - now % window)))
+
+    def record_failure(self):
+        now = time.time()
+        window = self.config["WINDOW_SECONDS"]
+        for key in self.keys.values():
+            current_key, _, _ = self._buckets(key, now)
+            _incr(current_key, timeout=window * 2)
+
+        key = self.keys["username"]
+        if self._failures(key, now) >= self.limits["username"]:
+            lockout = self.config["LOCKOUT_SECONDS"]
+            cache.set(f"{key}:lock", now + lockout, timeout=lockout)
+
+    def reset(self):
+        """A successful login clears the username counter (not the IP one)."""
+        key = self.keys["username"]
+        now = time.time()
+        current_key, previous_key, _ = self._buckets(key, now)
+        cache.delete_many([current_key, previous_key, f"{key}:lock"])
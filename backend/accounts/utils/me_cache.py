@@ -0,0 +1,62 @@
+"""
+Versioned cache for the MeView bootstrap payload.
+
+The ETag is derived only from the access-token claims and two version
+counters (see core.versioning), so a conditional request can be answered
+with 304 without touching the database:
+  - "<schema>:rbac"  bumped when roles or their permissions change
+  - "me:<user_id>"   bumped when the user's roles, profile or account change
+"""
+
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+
+from core.versioning import bump_version, get_versions, tenant_scope
+
+
+def _user_scope(user_id):
+    return f"me:{user_id}"
+
+
+def invalidate_me_for_user(user_id):
+    if user_id:
+        bump_version(_user_scope(user_id))
+
+
+def invalidate_me_for_tenant(schema_name=None):
+    bump_version(tenant_scope("rbac", schema_name))
+
+
+def get_me_etag(user, requested_role):
+    rbac_scope = tenant_scope("rbac")
+    user_scope = _user_scope(user.id)
+    versions = get_versions(rbac_scope, user_scope)
+
+    parts = [
+        user.id,
+        connection.schema_name,
+        requested_role or "",
+        user.username,
+        user.email,
+        user.is_active,
+        user.needs_password_change,
+        versions[rbac_scope],
+        versions[user_scope],
+    ]
+    digest = hashlib.sha1(":".join(str(p) for p in parts).encode()).hexdigest()
+    return f'"me-{digest}"'
+
+
+def _payload_key(etag):
+    return f"accounts:me:{etag.strip(chr(34))}"
+
+
+def get_cached_me(etag):
+    return cache.get(_payload_key(etag))
+
+
+def cache_me(etag, data):
+    cache.set(_payload_key(etag), data, timeout=getattr(settings, "ME_CACHE_TTL", 300))
@@ -0,0 +1,138 @@
+"""
+Server-side session index for refresh tokens.
+
+Each login creates a UserSession row and stamps its id into the tokens as
+the `sid` claim. Refreshing rotates the row's jti, so an older refresh
+token for the same session is rejected; only for a few seconds after
+rotation does the previous token get the same replacement again, so
+parallel refreshes (several tabs) do not log the user out. Revoking a session marks the row
+and publishes the sid to the cache, which lets JWTCookieAuthentication
+reject the session's access tokens with a single cache lookup.
+"""
+
+from datetime import datetime, timezone as dt_timezone
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.utils import timezone
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from .jwt_cookies import add_user_claims
+
+
+def _revoked_key(session_id):
+    return f"accounts:session_revoked:{session_id}"
+
+
+def _rotated_key(jti):
+    return f"accounts:session_rotated:{jti}"
+
+
+def _expires_at(refresh):
+    return datetime.fromtimestamp(refresh["exp"], tz=dt_timezone.utc)
+
+
+def start_session(user, refresh, request=None):
+    """Registers a freshly minted refresh token and adds the sid claim to it."""
+    from accounts.models import UserSession
+
+    # Keep the index compact: expired sessions are never needed again
+    UserSession.objects.filter(user=user, expires_at__lt=timezone.now()).delete()
+
+    meta = request.META if request is not None else {}
+    session = UserSession.objects.create(
+        user=user,
+        schema_name=connection.schema_name,
+        jti=refresh["jti"],
+        expires_at=_expires_at(refresh),
+        user_agent=meta.get("HTTP_USER_AGENT", "")[:255],
+        ip_address=meta.get("REMOTE_ADDR") or None,
+    )
+    refresh["sid"] = str(session.id)
+    return session
+
+
+def rotate_session(refresh, user):
+    """
+    Swaps a valid refresh token for a new one on the same session.
+    Raises InvalidToken if the session is revoked, unknown, belongs to
+    another tenant, or the token was rotated more than
+    REFRESH_ROTATION_GRACE_SECONDS ago.
+    """
+    from accounts.models import UserSession
+
+    sid = refresh.get("sid")
+    if not sid or is_session_revoked(sid):
+        raise InvalidToken("Session has been revoked")
+
+    with transaction.atomic():
+        session = (
+            UserSession.objects.select_for_update()
+            .filter(
+                id=sid,
+                user=user,
+                schema_name=connection.schema_name,
+                revoked_at__isnull=True,
+            )
+            .first()
+        )
+        if session is None:
+            raise InvalidToken("Session has been revoked")
+
+        if session.jti != refresh["jti"]:
+            # Spent token: within the grace window it gets the replacement
+            # already issued for it, as long as that one is still current
+            replacement = cache.get(_rotated_key(refresh["jti"]))
+            if replacement is None:
+                raise InvalidToken("Session has been revoked")
+            replacement = RefreshToken(replacement)
+            if replacement["jti"] != session.jti:
+                raise InvalidToken("Session has been revoked")
+            return replacement
+
+        new_refresh = add_user_claims(RefreshToken.for_user(user), user)
+        new_refresh["sid"] = str(session.id)
+
+        session.jti = new_refresh["jti"]
+        session.expires_at = _expires_at(new_refresh)
+        session.save(update_fields=["jti", "expires_at", "last_used_at"])
+
+        # Published before the row lock is released, so a parallel refresh
+        # waiting on it finds the replacement
+        grace = getattr(settings, "REFRESH_ROTATION_GRACE_SECONDS", 0)
+        if grace:
+            cache.set(_rotated_key(refresh["jti"]), str(new_refresh), timeout=grace)
+
+    return new_refresh
+
+
+def revoke_sessions(queryset):
+    """Revokes every active session in the queryset. Returns the count."""
+    session_ids = list(
+        queryset.filter(revoked_at__isnull=True).values_list("id", flat=True)
+    )
+    if not session_ids:
+        return 0
+
+    queryset.model.objects.filter(id__in=session_ids).update(revoked_at=timezone.now())
+
+    # Access tokens outlive the row update, so publish the sids until the
+    # longest-lived token for them would have expired
+    timeout = int(settings.SIMPLE_JWT["REFRESH_TOKEN_LIFETIME"].total_seconds())
+    cache.set_many({_revoked_key(sid): True for sid in session_ids}, timeout=timeout)
+    return len(session_ids)
+
+
+def revoke_user_sessions(user, exclude=None):
+    from accounts.models import UserSession
+
+    sessions = UserSession.objects.filter(user=user)
+    if exclude:
+        sessions = sessions.exclude(id=exclude)
+    return revoke_sessions(sessions)
+
+
+def is_session_revoked(session_id):
+    return session_id is not None and cache.get(_revoked_key(session_id)) is not None
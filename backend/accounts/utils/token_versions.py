@@ -0,0 +1,21 @@
+from django.conf import settings
+from django.core.cache import cache
+
+
+def _cache_key(user_id):
+    return f"accounts:token_version:{user_id}"
+
+
+def revoke_user_tokens(user):
+    """
+    Publishes the user's new token_version to the revocation set.
+    Tokens carrying an older version are rejected until they would have
+    expired anyway, so the entry only needs to outlive the refresh token.
+    """
+    timeout = int(settings.SIMPLE_JWT["REFRESH_TOKEN_LIFETIME"].total_seconds())
+    cache.set(_cache_key(user.id), user.token_version, timeout=timeout)
+
+
+def is_token_revoked(user_id, token_version):
+    current = cache.get(_cache_key(user_id))
+    return current is not None and token_version < current
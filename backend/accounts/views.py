@@ -5,9 +5,16 @@ from rest_framework import status
 from django.conf import settings
 
 from .serializers import LoginSerializer, OrganizationRegisterSerializer, UserSerializer
-from .utils.jwt_cookies import set_jwt_cookies, clear_jwt_cookies, set_access_cookie
+from .utils.jwt_cookies import (
+    set_jwt_cookies,
+    clear_jwt_cookies,
+    set_refresh_cookies,
+)
+from .utils.sessions import rotate_session, revoke_sessions, revoke_user_sessions
 from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework_simplejwt.exceptions import TokenError, InvalidToken
+from rest_framework.exceptions import AuthenticationFailed
+from .utils.login_throttle import LoginThrottle
 
 
 class RegisterOrganizationView(APIView):
@@ -32,12 +39,21 @@ class LoginView(APIView):
     permission_classes = [AllowAny]
 
     def post(self, request):
-        serializer = LoginSerializer(data=request.data)
-        serializer.is_valid(raise_exception=True)
+        # Reject throttled clients before the serializer hashes anything
+        throttle = LoginThrottle(request, request.data.get("username"))
+        throttle.check()
+
+        serializer = LoginSerializer(data=request.data, context={"request": request})
+        try:
+            serializer.is_valid(raise_exception=True)
+        except AuthenticationFailed:
+            throttle.record_failure()
+            raise
+        throttle.reset()
         user = serializer.validated_data["user"]
 
         response = Response({"message": "Login successful"}, status=status.HTTP_200_OK)
-        set_jwt_cookies(response, user)
+        set_jwt_cookies(response, user, request)
         return response
 
 
@@ -45,6 +61,14 @@ class LogoutView(APIView):
     permission_classes = [IsAuthenticated]
 
     def post(self, request):
+        from accounts.models import UserSession
+
+        session_id = request.auth.get("sid") if request.auth else None
+        if session_id:
+            revoke_sessions(
+                UserSession.objects.filter(id=session_id, user_id=request.user.id)
+            )
+
         response = Response({"message": "Logout successful"}, status=status.HTTP_200_OK)
         clear_jwt_cookies(response)
         return response
@@ -64,12 +88,22 @@ class TokenRefreshView(APIView):
 
         try:
             refresh = RefreshToken(refresh_token)
-            access_token = str(refresh.access_token)
+
+            # Refresh is infrequent, so check the live account here and mint
+            # the new tokens from fresh claims rather than copied ones
+            from accounts.models import User
+
+            user = User.objects.filter(id=refresh["user_id"], is_active=True).first()
+            if not user or user.token_version != refresh.get("token_version", 0):
+                raise InvalidToken("Token has been revoked")
+
+            # Rotation: the presented refresh token is spent after this
+            new_refresh = rotate_session(refresh, user)
 
             response = Response(
                 {"message": "Token refreshed"}, status=status.HTTP_200_OK
             )
-            set_access_cookie(response, access_token)
+            set_refresh_cookies(response, new_refresh)
             return response
         except (TokenError, InvalidToken):
             return Response(
@@ -81,10 +115,31 @@ class MeView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
+        from django.utils.cache import patch_cache_control
+        from django.utils.http import parse_etags
+        from .utils.me_cache import get_me_etag, get_cached_me, cache_me
+
         user = request.user
         tenant = getattr(request, "tenant", None)
         requested_role = request.query_params.get("active_role")
 
+        # 1. Unchanged since the client's copy: answer without any query
+        etag = get_me_etag(user, requested_role)
+        if etag in parse_etags(request.headers.get("If-None-Match", "")):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            # 2. Same version already built by another request
+            data = get_cached_me(etag)
+            if data is None:
+                data = self.build_payload(user, tenant, requested_role)
+                cache_me(etag, data)
+            response = Response(data)
+
+        response["ETag"] = etag
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+    def build_payload(self, user, tenant, requested_role):
         data = {
             "id": user.id,
             "username": user.username,
@@ -99,7 +154,9 @@ class MeView(APIView):
         if tenant and tenant.schema_name != "public":
             from roles.models import UserRole
 
-            role_objects = UserRole.objects.filter(user=user).select_related("role")
+            role_objects = UserRole.objects.filter(user_id=user.id).select_related(
+                "role"
+            )
 
             role_slugs = [ur.role.slug for ur in role_objects]
             data["roles"] = role_slugs
@@ -138,9 +195,11 @@ class MeView(APIView):
 
             profile = Profile.objects.filter(user_id=user.id).first()
             if profile:
+                # username/email come from the request user, not another query
+                profile._user_cache = user
                 data["profile"] = ProfileSerializer(profile).data
 
-        return Response(data)
+        return data
 
 
 class VerifyAccountView(APIView):
@@ -174,7 +233,14 @@ class VerifyAccountView(APIView):
             results["email_exists"] = True
             results["exists"] = True
             if password:
+                # Password probing goes through the same throttle as login
+                throttle = LoginThrottle(request, email)
+                throttle.check()
                 results["valid_password"] = user_by_email.check_password(password)
+                if results["valid_password"]:
+                    throttle.reset()
+                else:
+                    throttle.record_failure()
 
         if user_by_username:
             results["username_exists"] = True
@@ -201,10 +267,18 @@ class ChangePasswordView(APIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        user = request.user
+        from accounts.models import User
+
+        # request.user may be a token-backed user, so load the real row to write
+        user = User.objects.get(id=request.user.id)
         user.set_password(new_password)
         user.needs_password_change = False
         user.initial_password_display = None
         user.save()
 
-        return Response({"message": "Password updated successfully."})
+        # Sign out every other device, then re-issue this one's cookies
+        # (saving also bumped token_version)
+        revoke_user_sessions(user)
+        response = Response({"message": "Password updated successfully."})
+        set_jwt_cookies(response, user, request)
+        return response
@@ -1,3 +1,11 @@
 from django.contrib import admin
+from students.admin import TenantOnlyAdmin
+from .models import AttendanceSheet
 
-# Register your models here.
+
+@admin.register(AttendanceSheet)
+class AttendanceSheetAdmin(TenantOnlyAdmin):
+    list_display = ("section", "date", "academic_year", "updated_at")
+    list_filter = ("date", "academic_year")
+    date_hierarchy = "date"
+    readonly_fields = ("created_at", "updated_at")
@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django_tenants.utils import tenant_context
+
+from organizations.models import Organization
+from attendance.rollups import rebuild_rollups
+
+
+class Command(BaseCommand):
+    help = (
+        "Recomputes the daily section and monthly student attendance rollups "
+        "from the raw attendance sheets."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--schema",
+            action="append",
+            dest="schemas",
+            help="Only rebuild this schema (can be passed multiple times)",
+        )
+
+    def handle(self, *args, **options):
+        tenants = Organization.objects.exclude(schema_name="public")
+        if options["schemas"]:
+            tenants = tenants.filter(schema_name__in=options["schemas"])
+
+        for tenant in tenants:
+            with tenant_context(tenant), transaction.atomic():
+                daily, monthly = rebuild_rollups()
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"{tenant.schema_name}: {daily} section-days, {monthly} student-months"
+                )
+            )
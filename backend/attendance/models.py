@@ -0,0 +1,105 @@
+from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex
+from django.db import models
+import uuid
+
+
+class AttendanceSheet(models.Model):
+    """
+    One row per section per day. A whole section's marks are stored as
+    arrays of student ids per status, so marking a class is a single
+    upsert and a student's history is found through the GIN index.
+    """
+
+    PRESENT = "present"
+    ABSENT = "absent"
+    LATE = "late"
+    EXCUSED = "excused"
+    STATUSES = (PRESENT, ABSENT, LATE, EXCUSED)
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    section = models.ForeignKey(
+        "academics.Section", on_delete=models.CASCADE, related_name="attendance_sheets"
+    )
+    date = models.DateField()
+    academic_year = models.CharField(max_length=20)
+
+    present = ArrayField(models.UUIDField(), default=list, blank=True)
+    absent = ArrayField(models.UUIDField(), default=list, blank=True)
+    late = ArrayField(models.UUIDField(), default=list, blank=True)
+    excused = ArrayField(models.UUIDField(), default=list, blank=True)
+
+    # SOFT LINK: global User who last marked the sheet
+    marked_by = models.UUIDField(null=True, blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ["section", "date"]
+        ordering = ["-date"]
+        indexes = [
+            GinIndex(
+                fields=["present", "absent", "late", "excused"],
+                name="attendance_student_gin_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.section} - {self.date}"
+
+    def status_of(self, student_id):
+        for status in self.STATUSES:
+            if student_id in getattr(self, status):
+                return status
+        return None
+
+
+class SectionDailyAttendance(models.Model):
+    """
+    Rollup: a section's counts for one day, kept in step with its sheet.
+    """
+
+    section = models.ForeignKey(
+        "academics.Section", on_delete=models.CASCADE, related_name="daily_attendance"
+    )
+    date = models.DateField()
+    academic_year = models.CharField(max_length=20)
+
+    present = models.PositiveIntegerField(default=0)
+    absent = models.PositiveIntegerField(default=0)
+    late = models.PositiveIntegerField(default=0)
+    excused = models.PositiveIntegerField(default=0)
+    total = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        unique_together = ["section", "date"]
+        ordering = ["-date"]
+
+    def __str__(self):
+        return f"{self.section} - {self.date}: {self.present}/{self.total}"
+
+
+class StudentMonthlyAttendance(models.Model):
+    """
+    Rollup: a student's counts for one calendar month (`month` is the 1st),
+    adjusted incrementally whenever one of their sheets is marked.
+    """
+
+    student = models.ForeignKey(
+        "students.Student", on_delete=models.CASCADE, related_name="monthly_attendance"
+    )
+    month = models.DateField()
+    academic_year = models.CharField(max_length=20)
+
+    present = models.IntegerField(default=0)
+    absent = models.IntegerField(default=0)
+    late = models.IntegerField(default=0)
+    excused = models.IntegerField(default=0)
+
+    class Meta:
+        unique_together = ["student", "month"]
+        indexes = [models.Index(fields=["month"], name="attendance_month_idx")]
+
+    def __str__(self):
+        return f"{self.student_id} - {self.month:%Y-%m}"
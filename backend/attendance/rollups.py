@@ -0,0 +1,198 @@
+"""
+Incremental attendance rollups.
+
+Every mark operation passes the sheet's marks before and after the change;
+only the difference is applied, so dashboards read pre-aggregated rows and
+never scan raw sheets. rebuild_rollups() recomputes everything from the
+sheets (used by the rebuild_attendance_rollups command).
+"""
+
+from collections import defaultdict
+
+from django.db.models import F, Q, Sum
+
+from .models import AttendanceSheet, SectionDailyAttendance, StudentMonthlyAttendance
+
+STATUSES = AttendanceSheet.STATUSES
+
+
+def sheet_marks(sheet):
+    """{student_id: status} for a sheet (empty for None)."""
+    if sheet is None:
+        return {}
+    return {
+        student_id: status
+        for status in STATUSES
+        for student_id in getattr(sheet, status)
+    }
+
+
+def update_section_daily(sheet):
+    counts = {status: len(getattr(sheet, status)) for status in STATUSES}
+    SectionDailyAttendance.objects.update_or_create(
+        section_id=sheet.section_id,
+        date=sheet.date,
+        defaults={
+            "academic_year": sheet.academic_year,
+            "total": sum(counts.values()),
+            **counts,
+        },
+    )
+
+
+def apply_student_deltas(date, academic_year, old_marks, new_marks):
+    """
+    Moves each changed student's count from the old status to the new one
+    in their monthly row: one insert for missing rows, one locked read and
+    one bulk update, whatever the number of students.
+    """
+    deltas = defaultdict(lambda: dict.fromkeys(STATUSES, 0))
+    for student_id in old_marks.keys() | new_marks.keys():
+        old, new = old_marks.get(student_id), new_marks.get(student_id)
+        if old == new:
+            continue
+        if old:
+            deltas[student_id][old] -= 1
+        if new:
+            deltas[student_id][new] += 1
+    if not deltas:
+        return 0
+
+    month = date.replace(day=1)
+    StudentMonthlyAttendance.objects.bulk_create(
+        [
+            StudentMonthlyAttendance(
+                student_id=student_id, month=month, academic_year=academic_year
+            )
+            for student_id in deltas
+        ],
+        ignore_conflicts=True,
+    )
+
+    rows = list(
+        StudentMonthlyAttendance.objects.select_for_update().filter(
+            student_id__in=deltas, month=month
+        )
+    )
+    for row in rows:
+        for status, delta in deltas[row.student_id].items():
+            setattr(row, status, getattr(row, status) + delta)
+    StudentMonthlyAttendance.objects.bulk_update(rows, STATUSES, batch_size=1000)
+    return len(rows)
+
+
+def delete_sheet_rollups(sheet):
+    apply_student_deltas(sheet.date, sheet.academic_year, sheet_marks(sheet), {})
+    SectionDailyAttendance.objects.filter(
+        section_id=sheet.section_id, date=sheet.date
+    ).delete()
+
+
+def rebuild_rollups():
+    """Recomputes both rollup tables from the sheets of the current schema."""
+    SectionDailyAttendance.objects.all().delete()
+    StudentMonthlyAttendance.objects.all().delete()
+
+    daily, monthly = [], {}
+    for sheet in AttendanceSheet.objects.iterator(chunk_size=500):
+        counts = {status: len(getattr(sheet, status)) for status in STATUSES}
+        daily.append(
+            SectionDailyAttendance(
+                section_id=sheet.section_id,
+                date=sheet.date,
+                academic_year=sheet.academic_year,
+                total=sum(counts.values()),
+                **counts,
+            )
+        )
+        month = sheet.date.replace(day=1)
+        for student_id, status in sheet_marks(sheet).items():
+            row = monthly.get((student_id, month))
+            if row is None:
+                row = monthly[(student_id, month)] = StudentMonthlyAttendance(
+                    student_id=student_id, month=month, academic_year=sheet.academic_year
+                )
+            setattr(row, status, getattr(row, status) + 1)
+
+    SectionDailyAttendance.objects.bulk_create(daily, batch_size=1000)
+    StudentMonthlyAttendance.objects.bulk_create(monthly.values(), batch_size=1000)
+    return len(daily), len(monthly)
+
+
+def at_risk_students(threshold, start=None, end=None, section_id=None, level_id=None):
+    """
+    Students whose attended share (present + late) over the months in
+    range is below `threshold` percent. One grouped query over the rollup.
+    """
+    rows = StudentMonthlyAttendance.objects.all()
+    if start:
+        rows = rows.filter(month__gte=start.replace(day=1))
+    if end:
+        rows = rows.filter(month__lte=end)
+    placement = Q(student__enrollments__is_current=True)
+    if section_id:
+        rows = rows.filter(placement & Q(student__enrollments__section_id=section_id))
+    if level_id:
+        rows = rows.filter(placement & Q(student__enrollments__level_id=level_id))
+
+    totals = (
+        rows.values(
+            "student_id",
+            "student__enrollment_id",
+            "student__profile__first_name",
+            "student__profile__last_name",
+        )
+        .annotate(
+            present_days=Sum("present"),
+            absent_days=Sum("absent"),
+            late_days=Sum("late"),
+            excused_days=Sum("excused"),
+        )
+        .annotate(
+            attended=F("present_days") + F("late_days"),
+            days=F("present_days")
+            + F("absent_days")
+            + F("late_days")
+            + F("excused_days"),
+        )
+        .filter(days__gt=0, attended__lt=F("days") * threshold / 100.0)
+        .order_by("student__profile__first_name")
+    )
+
+    return [
+        {
+            "student_id": row["student_id"],
+            "enrollment_id": row["student__enrollment_id"],
+            "name": f"{row['student__profile__first_name']} {row['student__profile__last_name']}",
+            "present": row["present_days"],
+            "absent": row["absent_days"],
+            "late": row["late_days"],
+            "excused": row["excused_days"],
+            "days": row["days"],
+            "percentage": round(row["attended"] * 100.0 / row["days"], 2),
+        }
+        for row in totals
+    ]
+
+
+def section_summary(section_id, start=None, end=None):
+    """Term totals and per-day counts for a section from the daily rollup."""
+    days = SectionDailyAttendance.objects.filter(section_id=section_id)
+    if start:
+        days = days.filter(date__gte=start)
+    if end:
+        days = days.filter(date__lte=end)
+
+    totals = days.aggregate(
+        **{status: Sum(status) for status in STATUSES}, marks=Sum("total")
+    )
+    totals = {k: v or 0 for k, v in totals.items()}
+    attended = totals["present"] + totals["late"]
+    totals["percentage"] = (
+        round(attended * 100.0 / totals["marks"], 2) if totals["marks"] else 0.0
+    )
+
+    return {
+        "totals": totals,
+        "days": list(days.values("date", *STATUSES, "total").order_by("date")),
+    }
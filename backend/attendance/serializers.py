@@ -0,0 +1,36 @@
+from rest_framework import serializers
+from .models import AttendanceSheet
+
+
+class AttendanceSheetSerializer(serializers.ModelSerializer):
+    section_name = serializers.CharField(source="section.name", read_only=True)
+    level_name = serializers.CharField(source="section.level.name", read_only=True)
+
+    class Meta:
+        model = AttendanceSheet
+        fields = [
+            "id",
+            "section",
+            "section_name",
+            "level_name",
+            "date",
+            "academic_year",
+            "present",
+            "absent",
+            "late",
+            "excused",
+            "marked_by",
+            "updated_at",
+        ]
+        read_only_fields = fields
+
+
+class MarkSectionSerializer(serializers.Serializer):
+    date = serializers.DateField()
+    default_status = serializers.ChoiceField(
+        choices=AttendanceSheet.STATUSES, required=False, allow_null=True
+    )
+    marks = serializers.DictField(
+        child=serializers.ChoiceField(choices=AttendanceSheet.STATUSES),
+        required=False,
+    )
@@ -0,0 +1,151 @@
+"""
+Attendance writes and SQL-side reporting over AttendanceSheet arrays.
+"""
+
+import uuid
+from collections import Counter
+
+from django.db import transaction
+from django.db.models import Count, ExpressionWrapper, F, FloatField, Q, Value
+from django.db.models.functions import Cast, Coalesce, NullIf, TruncMonth
+
+from students.models import StudentLevel
+from .models import AttendanceSheet
+from .rollups import apply_student_deltas, sheet_marks, update_section_daily
+
+STATUSES = AttendanceSheet.STATUSES
+
+# Late students were in class, so they count as attended
+ATTENDED = (AttendanceSheet.PRESENT, AttendanceSheet.LATE)
+
+
+class AttendanceError(ValueError):
+    pass
+
+
+def _student_filter(student_id, status):
+    return Q(**{f"{status}__contains": [student_id]})
+
+
+@transaction.atomic
+def mark_section(section, date, marks=None, default_status=None, marked_by=None):
+    """
+    Stores the whole section's attendance for a day in one row and
+    updates the rollups incrementally.
+
+    marks: {student_id: status}. With default_status, every current student
+    of the section not listed in marks gets that status, so a teacher only
+    sends the exceptions. Returns (sheet, created, counts).
+    """
+    if default_status and default_status not in STATUSES:
+        raise AttendanceError(f"Unknown status '{default_status}'")
+
+    try:
+        marks = {uuid.UUID(str(k)): v for k, v in (marks or {}).items()}
+    except (TypeError, ValueError, AttributeError):
+        raise AttendanceError("marks must map student UUIDs to a status")
+    invalid = {v for v in marks.values() if v not in STATUSES}
+    if invalid:
+        raise AttendanceError(f"Unknown status(es): {', '.join(sorted(map(str, invalid)))}")
+
+    # 1. The section's current roster (one query)
+    roster = dict(
+        StudentLevel.objects.filter(section=section, is_current=True).values_list(
+            "student_id", "academic_year"
+        )
+    )
+    outsiders = set(marks) - set(roster)
+    if outsiders:
+        raise AttendanceError(
+            "Students not currently in this section: "
+            + ", ".join(sorted(map(str, outsiders)))
+        )
+
+    if default_status:
+        marks = {student_id: default_status for student_id in roster} | marks
+    if not marks:
+        raise AttendanceError("Provide marks or a default_status")
+
+    statuses = {status: [] for status in STATUSES}
+    for student_id, status in marks.items():
+        statuses[status].append(student_id)
+
+    years = Counter(roster[student_id] for student_id in marks)
+
+    # 2. Make sure the row exists, then lock it so the rollup diff is exact.
+    #    A concurrent first mark waits on the insert and then reads this
+    #    sheet's marks instead of also diffing against "no sheet"
+    placeholder = AttendanceSheet(
+        section=section, date=date, academic_year=years.most_common(1)[0][0]
+    )
+    AttendanceSheet.objects.bulk_create([placeholder], ignore_conflicts=True)
+    sheet = AttendanceSheet.objects.select_for_update().get(section=section, date=date)
+    created = sheet.pk == placeholder.pk
+    previous = sheet_marks(sheet)
+
+    # 3. One row for the whole section
+    sheet.academic_year = placeholder.academic_year
+    sheet.marked_by = marked_by
+    for status, ids in statuses.items():
+        setattr(sheet, status, ids)
+    sheet.save()
+
+    # 4. Rollups: section/day counts and each changed student's month
+    update_section_daily(sheet)
+    apply_student_deltas(date, sheet.academic_year, previous, marks)
+
+    return sheet, created, {status: len(ids) for status, ids in statuses.items()}
+
+
+def _status_counts(student_id):
+    # "<status>_days", since the bare names clash with the array fields
+    counts = {
+        f"{status}_days": Count("id", filter=_student_filter(student_id, status))
+        for status in STATUSES
+    }
+    total = sum((F(f"{status}_days") for status in STATUSES), Value(0))
+    attended = sum((F(f"{status}_days") for status in ATTENDED), Value(0))
+    percentage = ExpressionWrapper(
+        Coalesce(
+            Cast(attended, FloatField()) * 100.0 / NullIf(total, 0),
+            Value(0.0),
+        ),
+        output_field=FloatField(),
+    )
+    return counts, percentage
+
+
+def student_sheets(student_id, start=None, end=None):
+    any_status = Q()
+    for status in STATUSES:
+        any_status |= _student_filter(student_id, status)
+
+    sheets = AttendanceSheet.objects.filter(any_status)
+    if start:
+        sheets = sheets.filter(date__gte=start)
+    if end:
+        sheets = sheets.filter(date__lte=end)
+    return sheets
+
+
+def student_monthly_attendance(student_id, start=None, end=None):
+    """Per-month counts and percentage for a student, grouped in SQL."""
+    counts, percentage = _status_counts(student_id)
+    return list(
+        student_sheets(student_id, start, end)
+        .annotate(month=TruncMonth("date"))
+        .values("month")
+        .annotate(**counts)
+        .annotate(percentage=percentage)
+        .order_by("month")
+    )
+
+
+def student_attendance_summary(student_id, start=None, end=None):
+    counts, _ = _status_counts(student_id)
+    totals = student_sheets(student_id, start, end).aggregate(**counts)
+    total = sum(totals.values())
+    attended = sum(totals[f"{status}_days"] for status in ATTENDED)
+    totals["days"] = total
+    totals["percentage"] = round(attended * 100.0 / total, 2) if total else 0.0
+    return totals
@@ -0,0 +1,10 @@
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from .models import AttendanceSheet
+from .rollups import delete_sheet_rollups
+
+
+@receiver(post_delete, sender=AttendanceSheet)
+def remove_sheet_from_rollups(sender, instance, **kwargs):
+    delete_sheet_rollups(instance)
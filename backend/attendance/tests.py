@@ -1,3 +1,127 @@
-from django.test import TestCase
+from datetime import date
 
-# Create your tests here.
+from django_tenants.test.cases import TenantTestCase
+
+from academics.models import AcademicLevel, Program, Section
+from profiles.models import Profile
+from students.models import Student, StudentLevel
+from .models import AttendanceSheet, SectionDailyAttendance, StudentMonthlyAttendance
+from .rollups import apply_student_deltas, at_risk_students, rebuild_rollups
+from .services import AttendanceError, mark_section, student_monthly_attendance
+
+
+def enroll(section, enrollment_id, first_name):
+    student = Student.objects.create(
+        profile=Profile.objects.create(first_name=first_name, last_name="Test"),
+        enrollment_id=enrollment_id,
+    )
+    StudentLevel.objects.create(
+        student=student, level=section.level, section=section, academic_year="2026"
+    )
+    return student
+
+
+class SectionFixture:
+    def setUp(self):
+        program = Program.objects.create(name="High School", code="HS")
+        level = AcademicLevel.objects.create(program=program, name="Grade 10")
+        self.section = Section.objects.create(level=level, name="A")
+        self.other_section = Section.objects.create(level=level, name="B")
+        self.asha = enroll(self.section, "S-1", "Asha")
+        self.bikash = enroll(self.section, "S-2", "Bikash")
+        self.day = date(2026, 3, 2)
+
+
+class MarkSectionTest(SectionFixture, TenantTestCase):
+    def test_remark_moves_student_between_statuses(self):
+        mark_section(self.section, self.day, default_status="present")
+        sheet, created, counts = mark_section(
+            self.section, self.day, marks={self.asha.id: "absent"}, default_status="present"
+        )
+
+        self.assertFalse(created)
+        self.assertEqual(sheet.status_of(self.asha.id), "absent")
+        self.assertEqual(sheet.present, [self.bikash.id])
+        self.assertEqual(counts, {"present": 1, "absent": 1, "late": 0, "excused": 0})
+        self.assertEqual(AttendanceSheet.objects.count(), 1)
+
+    def test_students_outside_the_section_are_rejected(self):
+        outsider = enroll(self.other_section, "S-3", "Chandra")
+
+        with self.assertRaises(AttendanceError):
+            mark_section(self.section, self.day, marks={outsider.id: "present"})
+        self.assertFalse(AttendanceSheet.objects.exists())
+
+    def test_monthly_attendance_is_grouped_per_month(self):
+        mark_section(self.section, date(2026, 3, 2), marks={self.asha.id: "present"})
+        mark_section(self.section, date(2026, 3, 3), marks={self.asha.id: "late"})
+        mark_section(self.section, date(2026, 3, 4), marks={self.asha.id: "absent"})
+        mark_section(self.section, date(2026, 4, 1), marks={self.asha.id: "absent"})
+
+        march, april = student_monthly_attendance(self.asha.id)
+
+        self.assertEqual(march["month"], date(2026, 3, 1))
+        self.assertEqual(
+            (march["present_days"], march["late_days"], march["absent_days"]), (1, 1, 1)
+        )
+        self.assertAlmostEqual(march["percentage"], 200 / 3)
+        self.assertEqual(april["percentage"], 0.0)
+
+
+class RollupTest(SectionFixture, TenantTestCase):
+    def monthly(self, student):
+        row = StudentMonthlyAttendance.objects.get(student=student, month=date(2026, 3, 1))
+        return tuple(getattr(row, status) for status in AttendanceSheet.STATUSES)
+
+    def snapshot(self):
+        daily = SectionDailyAttendance.objects.values_list(
+            "section_id", "date", *AttendanceSheet.STATUSES, "total"
+        )
+        monthly = StudentMonthlyAttendance.objects.values_list(
+            "student_id", "month", *AttendanceSheet.STATUSES
+        )
+        return sorted(daily), sorted(monthly)
+
+    def test_remark_applies_only_the_difference(self):
+        mark_section(self.section, self.day, default_status="present")
+        mark_section(self.section, date(2026, 3, 3), default_status="present")
+        mark_section(
+            self.section, self.day, marks={self.asha.id: "late"}, default_status="present"
+        )
+
+        # (present, absent, late, excused) for March
+        self.assertEqual(self.monthly(self.asha), (1, 0, 1, 0))
+        self.assertEqual(self.monthly(self.bikash), (2, 0, 0, 0))
+        daily = SectionDailyAttendance.objects.get(section=self.section, date=self.day)
+        self.assertEqual((daily.present, daily.late, daily.total), (1, 1, 2))
+
+        # Unchanged marks touch no rows
+        same = {self.asha.id: "late", self.bikash.id: "present"}
+        self.assertEqual(apply_student_deltas(self.day, "2026", same, same), 0)
+
+    def test_rebuild_reproduces_incremental_totals(self):
+        mark_section(self.section, self.day, default_status="present")
+        mark_section(
+            self.section, self.day, marks={self.bikash.id: "absent"}, default_status="late"
+        )
+        mark_section(self.section, date(2026, 4, 1), marks={self.asha.id: "excused"})
+        incremental = self.snapshot()
+
+        rebuild_rollups()
+
+        self.assertEqual(self.snapshot(), incremental)
+
+    def test_at_risk_students_below_threshold(self):
+        for day in (2, 3, 4, 5):
+            mark_section(
+                self.section,
+                date(2026, 3, day),
+                marks={self.asha.id: "absent" if day > 2 else "present"},
+                default_status="present",
+            )
+
+        at_risk = at_risk_students(75)
+
+        self.assertEqual([row["student_id"] for row in at_risk], [self.asha.id])
+        self.assertEqual((at_risk[0]["days"], at_risk[0]["percentage"]), (4, 25.0))
+        self.assertEqual(at_risk_students(75, section_id=self.other_section.id), [])
@@ -0,0 +1,26 @@
+from django.urls import path
+from .views import (
+    SectionAttendanceView,
+    SectionAttendanceSummaryView,
+    StudentAttendanceView,
+    AtRiskStudentsView,
+)
+
+urlpatterns = [
+    path(
+        "sections/<uuid:section_id>/",
+        SectionAttendanceView.as_view(),
+        name="section-attendance",
+    ),
+    path(
+        "sections/<uuid:section_id>/summary/",
+        SectionAttendanceSummaryView.as_view(),
+        name="section-attendance-summary",
+    ),
+    path("at-risk/", AtRiskStudentsView.as_view(), name="attendance-at-risk"),
+    path(
+        "students/<uuid:student_id>/",
+        StudentAttendanceView.as_view(),
+        name="student-attendance",
+    ),
+]
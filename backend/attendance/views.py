@@ -1,3 +1,155 @@
-from django.shortcuts import render
+from django.shortcuts import get_object_or_404
+from django.utils.dateparse import parse_date
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
 
-# Create your views here.
+from academics.models import Section
+from roles.permissions import HasPermission
+from students.models import Student
+from .models import AttendanceSheet
+from .serializers import AttendanceSheetSerializer, MarkSectionSerializer
+from .services import (
+    AttendanceError,
+    mark_section,
+    student_attendance_summary,
+    student_monthly_attendance,
+)
+
+
+class SectionAttendanceView(APIView):
+    """
+    GET  ?date=YYYY-MM-DD       -> the section's sheet for that day
+    GET  ?from=...&to=...       -> the section's sheets in a range
+    POST {date, default_status, marks: {student_id: status}}
+         -> marks the whole section in one request
+    """
+
+    def get_permissions(self):
+        if self.request.method == "POST":
+            return [IsAuthenticated(), HasPermission("mark_attendance")]
+        return [IsAuthenticated(), HasPermission("view_attendance")]
+
+    def get(self, request, section_id):
+        sheets = AttendanceSheet.objects.filter(section_id=section_id).select_related(
+            "section__level"
+        )
+
+        day = parse_date(request.query_params.get("date") or "")
+        if day:
+            sheet = sheets.filter(date=day).first()
+            if not sheet:
+                return Response(
+                    {"error": "Attendance not taken for this date"},
+                    status=status.HTTP_404_NOT_FOUND,
+                )
+            return Response(AttendanceSheetSerializer(sheet).data)
+
+        start = parse_date(request.query_params.get("from") or "")
+        end = parse_date(request.query_params.get("to") or "")
+        if start:
+            sheets = sheets.filter(date__gte=start)
+        if end:
+            sheets = sheets.filter(date__lte=end)
+        return Response(AttendanceSheetSerializer(sheets, many=True).data)
+
+    def post(self, request, section_id):
+        section = get_object_or_404(Section, id=section_id)
+        serializer = MarkSectionSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        try:
+            sheet, created, counts = mark_section(
+                section,
+                serializer.validated_data["date"],
+                marks=serializer.validated_data.get("marks"),
+                default_status=serializer.validated_data.get("default_status"),
+                marked_by=request.user.id,
+            )
+        except AttendanceError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response(
+            {"id": sheet.id, "date": sheet.date, "counts": counts},
+            status=status.HTTP_201_CREATED if created else status.HTTP_200_OK,
+        )
+
+
+class StudentAttendanceView(APIView):
+    """
+    Monthly and overall attendance percentage for one student,
+    computed in SQL. Students may always read their own.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, student_id):
+        student = get_object_or_404(Student.objects.select_related("profile"), id=student_id)
+
+        is_self = student.profile.user_id == request.user.id
+        if not is_self and not HasPermission("view_attendance").has_permission(
+            request, self
+        ):
+            return Response(
+                {"error": "You do not have permission to view this attendance."},
+                status=status.HTTP_403_FORBIDDEN,
+            )
+
+        start = parse_date(request.query_params.get("from") or "")
+        end = parse_date(request.query_params.get("to") or "")
+
+        return Response(
+            {
+                "student_id": student.id,
+                "summary": student_attendance_summary(student.id, start, end),
+                "monthly": student_monthly_attendance(student.id, start, end),
+            }
+        )
+
+
+class SectionAttendanceSummaryView(APIView):
+    """Term totals and per-day counts for a section, from the daily rollup."""
+
+    permission_classes = [IsAuthenticated, HasPermission("view_attendance")]
+
+    def get(self, request, section_id):
+        from .rollups import section_summary
+
+        start = parse_date(request.query_params.get("from") or "")
+        end = parse_date(request.query_params.get("to") or "")
+        return Response(section_summary(section_id, start, end))
+
+
+class AtRiskStudentsView(APIView):
+    """
+    Students below an attendance threshold (percent, default 75) over the
+    months in range, optionally limited to a section or level.
+    """
+
+    permission_classes = [IsAuthenticated, HasPermission("view_attendance")]
+
+    def get(self, request):
+        from django.conf import settings
+        from .rollups import at_risk_students
+
+        try:
+            threshold = float(
+                request.query_params.get(
+                    "threshold", getattr(settings, "ATTENDANCE_AT_RISK_THRESHOLD", 75)
+                )
+            )
+        except ValueError:
+            return Response(
+                {"error": "threshold must be a number"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        students = at_risk_students(
+            threshold,
+            start=parse_date(request.query_params.get("from") or ""),
+            end=parse_date(request.query_params.get("to") or ""),
+            section_id=request.query_params.get("section") or None,
+            level_id=request.query_params.get("level") or None,
+        )
+        return Response({"threshold": threshold, "count": len(students), "students": students})
@@ -40,6 +40,8 @@ TENANT_APPS = (
     "families",
     "academics",
     "course_content",
+    "attendance",
+    "uploads",
 )
 
 INSTALLED_APPS = list(SHARED_APPS) + [
@@ -51,7 +53,7 @@ TENANT_DOMAIN_MODEL = "organizations.Domain"
 
 MIDDLEWARE = [
     "corsheaders.middleware.CorsMiddleware",
-    "django_tenants.middleware.main.TenantMainMiddleware",
+    "organizations.middleware.CachedTenantMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -104,6 +106,14 @@ DATABASES = {
 
 DATABASE_ROUTERS = ("django_tenants.routers.TenantSyncRouter",)
 
+# Seconds a hostname -> tenant resolution is cached in-process
+TENANT_CACHE_TTL = config("TENANT_CACHE_TTL", cast=int, default=60)
+# Seconds an unused subdomain is remembered by the check-domain endpoint
+DOMAIN_CHECK_NEGATIVE_TTL = config("DOMAIN_CHECK_NEGATIVE_TTL", cast=int, default=10)
+
+# Concurrent schemas for `manage.py migrate_tenants` during deploys
+TENANT_MIGRATION_WORKERS = config("TENANT_MIGRATION_WORKERS", cast=int, default=4)
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -127,9 +137,10 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 AUTH_USER_MODEL = "accounts.User"
 
+# TenantUsernameBackend extends ModelBackend and already covers global
+# usernames/emails; a second backend would hash failed passwords again.
 AUTHENTICATION_BACKENDS = [
     "accounts.backends.TenantUsernameBackend",
-    "django.contrib.auth.backends.ModelBackend",
 ]
 
 # DRF
@@ -138,6 +149,7 @@ REST_FRAMEWORK = {
         "accounts.authentication.JWTCookieAuthentication",
     ),
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
+    "EXCEPTION_HANDLER": "core.exceptions.api_exception_handler",
 }
 
 SPECTACULAR_SETTINGS = {
@@ -160,6 +172,56 @@ SIMPLE_JWT = {
     ),
 }
 
+# Cache (must be shared between workers in production, e.g. Redis or Memcached)
+CACHES = {
+    "default": {
+        "BACKEND": config(
+            "CACHE_BACKEND", default="django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": config("CACHE_LOCATION", default="edusekai"),
+    }
+}
+
+# Build request.user from access-token claims instead of a User query per
+# request. Password changes and deactivation still revoke tokens via
+# User.token_version and the revocation set kept in the default cache, so
+# it is only on by default with a shared cache: a per-process LocMemCache
+# would let other workers keep accepting revoked tokens.
+JWT_STATELESS_AUTH = config(
+    "JWT_STATELESS_AUTH",
+    cast=bool,
+    default="locmem" not in CACHES["default"]["BACKEND"].lower(),
+)
+
+# After a refresh token is rotated, the spent one still returns the same
+# new token for this long, so parallel refreshes from several tabs all
+# succeed instead of logging the user out (seconds; 0 disables)
+REFRESH_ROTATION_GRACE_SECONDS = config(
+    "REFRESH_ROTATION_GRACE_SECONDS", cast=int, default=10
+)
+
+# How long a built /api/auth/me/ payload is kept for its version (seconds)
+ME_CACHE_TTL = config("ME_CACHE_TTL", cast=int, default=300)
+
+# Upper bound for a cached /api/academics/tree/ (it is also keyed by version)
+ACADEMIC_TREE_CACHE_TTL = config("ACADEMIC_TREE_CACHE_TTL", cast=int, default=3600)
+
+# How long a gradebook students x assignments matrix is cached (seconds)
+GRADEBOOK_MATRIX_CACHE_TTL = config("GRADEBOOK_MATRIX_CACHE_TTL", cast=int, default=600)
+
+# Attendance percentage below which /api/attendance/at-risk/ lists a student
+ATTENDANCE_AT_RISK_THRESHOLD = config("ATTENDANCE_AT_RISK_THRESHOLD", cast=float, default=75)
+
+# Failed-login throttling (see accounts/utils/login_throttle.py). Counters
+# live in CACHES, which must be shared (Redis/Memcached) across workers.
+# IP_LIMIT is high so a school behind one NAT address is not blocked.
+LOGIN_THROTTLE = {
+    "USERNAME_LIMIT": config("LOGIN_THROTTLE_USERNAME_LIMIT", cast=int, default=5),
+    "IP_LIMIT": config("LOGIN_THROTTLE_IP_LIMIT", cast=int, default=200),
+    "WINDOW_SECONDS": config("LOGIN_THROTTLE_WINDOW_SECONDS", cast=int, default=300),
+    "LOCKOUT_SECONDS": config("LOGIN_THROTTLE_LOCKOUT_SECONDS", cast=int, default=900),
+}
+
 # CORS
 CORS_ALLOW_ALL_ORIGINS = False
 CORS_ALLOWED_ORIGIN_REGEXES = [
@@ -229,3 +291,27 @@ JAZZMIN_UI_TWEAKS = {
 # Media Files (User Uploads)
 MEDIA_URL = "/media/"
 MEDIA_ROOT = BASE_DIR / "media"
+
+# Uploads (see uploads/services.py). MAX_SIZE also caps plain multipart
+# uploads while they stream, through core.upload_handlers.
+UPLOADS = {
+    "MAX_SIZE": config("UPLOAD_MAX_SIZE", cast=int, default=10 * 1024 * 1024),
+    "CHUNK_SIZE": config("UPLOAD_CHUNK_SIZE", cast=int, default=2 * 1024 * 1024),
+    "EXPIRY_HOURS": config("UPLOAD_EXPIRY_HOURS", cast=int, default=24),
+    "TEMP_DIR": config("UPLOAD_TEMP_DIR", default=str(BASE_DIR / "tmp" / "uploads")),
+}
+
+# Authorized downloads (see core/sendfile.py). BACKEND "nginx" sends
+# X-Accel-Redirect to INTERNAL_PREFIX, "apache" sends X-Sendfile and
+# "django" streams from the worker (development only).
+PROTECTED_MEDIA = {
+    "BACKEND": config("PROTECTED_MEDIA_BACKEND", default="django"),
+    "INTERNAL_PREFIX": config("PROTECTED_MEDIA_PREFIX", default="/protected-media/"),
+    "CACHE_SECONDS": config("PROTECTED_MEDIA_CACHE_SECONDS", cast=int, default=31536000),
+}
+
+FILE_UPLOAD_HANDLERS = [
+    "core.upload_handlers.MaxSizeUploadHandler",
+    "django.core.files.uploadhandler.MemoryFileUploadHandler",
+    "django.core.files.uploadhandler.TemporaryFileUploadHandler",
+]
@@ -15,6 +15,8 @@ urlpatterns = [
     path("api/families/", include("families.urls")),
     path("api/academics/", include("academics.urls")),
     path("api/course-content/", include("course_content.urls")),
+    path("api/attendance/", include("attendance.urls")),
+    path("api/uploads/", include("uploads.urls")),
 ]
 
 # Serve media files in development
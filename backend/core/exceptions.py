@@ -0,0 +1,21 @@
+"""
+DRF exception handler that answers oversize request bodies with 413.
+
+Django turns RequestDataTooBig (raised by MaxSizeUploadHandler and by
+DATA_UPLOAD_MAX_MEMORY_SIZE) into a 400; API clients get the same 413
+that the chunked upload endpoints return for oversize files instead.
+"""
+
+from django.core.exceptions import RequestDataTooBig
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.views import exception_handler
+
+
+def api_exception_handler(exc, context):
+    if isinstance(exc, RequestDataTooBig):
+        return Response(
+            {"error": str(exc) or "Request body is too large"},
+            status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        )
+    return exception_handler(exc, context)
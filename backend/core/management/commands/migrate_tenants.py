@@ -0,0 +1,175 @@
+"""
+Management command to migrate every tenant schema in parallel.
+Replaces the serial `migrate_schemas --tenant` run during deploys.
+Schemas that are already up to date are skipped, so a failed deploy can
+simply be re-run and it resumes where it stopped.
+"""
+
+import multiprocessing
+import time
+from io import StringIO
+
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+from django.db.migrations.loader import MigrationLoader
+from django.db.migrations.recorder import MigrationRecorder
+from django_tenants.utils import get_public_schema_name, schema_exists
+
+from organizations.models import Organization
+
+
+def _migrate_schema(job):
+    """
+    Worker: runs `migrate_schemas` for a single schema in its own process.
+    Never raises, so one broken tenant cannot take down the whole pool.
+    """
+    schema_name, verbosity = job
+    output = StringIO()
+    started = time.monotonic()
+    try:
+        call_command(
+            "migrate_schemas",
+            schema_name=schema_name,
+            interactive=False,
+            verbosity=verbosity,
+            stdout=output,
+            stderr=output,
+        )
+        error = None
+    except Exception as e:
+        error = f"{e.__class__.__name__}: {e}"
+    finally:
+        connections.close_all()
+
+    return schema_name, error, time.monotonic() - started, output.getvalue()
+
+
+class Command(BaseCommand):
+    help = (
+        "Migrate all tenant schemas in parallel with per-schema progress and "
+        "timing. Up-to-date schemas are skipped, so the command is safe to re-run."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=getattr(settings, "TENANT_MIGRATION_WORKERS", 4),
+            help="Number of schemas to migrate concurrently",
+        )
+        parser.add_argument(
+            "--schema",
+            action="append",
+            dest="schemas",
+            help="Only migrate this schema (can be passed multiple times)",
+        )
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Run migrate_schemas even for schemas with no pending migrations",
+        )
+
+    def handle(self, *args, **options):
+        workers = max(1, options["workers"])
+        verbosity = options["verbosity"]
+
+        tenants = Organization.objects.exclude(
+            schema_name=get_public_schema_name()
+        ).values_list("schema_name", flat=True)
+        if options["schemas"]:
+            tenants = tenants.filter(schema_name__in=options["schemas"])
+        tenants = list(tenants.order_by("created_at"))
+
+        if not tenants:
+            self.stdout.write(self.style.WARNING("No tenant schemas found."))
+            return
+
+        # 1. Half-provisioned tenants (row without schema) would make
+        #    migrate_schemas raise; leave them out instead of failing the boot
+        missing = [schema for schema in tenants if not schema_exists(schema)]
+        for schema in missing:
+            self.stdout.write(
+                self.style.WARNING(
+                    f"Skipping {schema}: schema does not exist (re-provision the tenant)."
+                )
+            )
+        tenants = [schema for schema in tenants if schema not in missing]
+
+        # 2. Resume: only dispatch schemas that are missing migrations
+        if options["all"]:
+            pending = tenants
+        else:
+            pending = self._schemas_with_pending_migrations(tenants)
+            skipped = len(tenants) - len(pending)
+            if skipped:
+                self.stdout.write(f"Skipping {skipped} up-to-date schema(s).")
+
+        if not pending:
+            self.stdout.write(self.style.SUCCESS("All tenant schemas are up to date."))
+            return
+
+        self.stdout.write(
+            self.style.MIGRATE_HEADING(
+                f"Migrating {len(pending)} schema(s) with {workers} worker(s)..."
+            )
+        )
+
+        # 3. Forked workers must not share the parent's socket
+        connection.close()
+
+        started = time.monotonic()
+        failures = []
+        total = len(pending)
+        worker_verbosity = max(0, verbosity - 1)
+
+        with multiprocessing.Pool(processes=min(workers, total)) as pool:
+            # imap_unordered reports each schema as soon as it finishes
+            results = pool.imap_unordered(
+                _migrate_schema, [(schema, worker_verbosity) for schema in pending]
+            )
+            for idx, (schema, error, elapsed, output) in enumerate(results, 1):
+                prefix = f"[{idx}/{total}] {schema}"
+                if error:
+                    failures.append((schema, error))
+                    self.stdout.write(
+                        self.style.ERROR(f"{prefix} FAILED in {elapsed:.2f}s: {error}")
+                    )
+                else:
+                    self.stdout.write(
+                        self.style.SUCCESS(f"{prefix} OK in {elapsed:.2f}s")
+                    )
+                if output and (error or verbosity > 1):
+                    self.stdout.write(output)
+
+        elapsed = time.monotonic() - started
+        self.stdout.write(
+            f"\nMigrated {total - len(failures)}/{total} schema(s) in {elapsed:.2f}s."
+        )
+
+        if failures:
+            failed = " ".join(f"--schema={schema}" for schema, _ in failures)
+            raise CommandError(
+                f"{len(failures)} schema(s) failed to migrate. "
+                f"Fix and re-run, e.g.: python manage.py migrate_tenants {failed}"
+            )
+
+    def _schemas_with_pending_migrations(self, schemas):
+        """
+        Compares the migration graph on disk against each schema's
+        django_migrations table (one query per schema).
+        """
+        expected = set(MigrationLoader(None, ignore_no_migrations=True).graph.nodes)
+
+        pending = []
+        for schema in schemas:
+            connection.set_schema(schema, include_public=False)
+            recorder = MigrationRecorder(connection)
+            if not recorder.has_table() or expected - set(
+                recorder.applied_migrations()
+            ):
+                pending.append(schema)
+
+        connection.set_schema_to_public()
+        return pending
@@ -0,0 +1,79 @@
+"""
+Conditional GET support for read-heavy, rarely-changing endpoints.
+"""
+
+import hashlib
+
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+from rest_framework import status
+from rest_framework.response import Response
+
+from .versioning import get_version_info, model_scope, track_model_versions
+
+
+class NotModified(Exception):
+    pass
+
+
+class ConditionalGetMixin:
+    """
+    Adds ETag / Last-Modified to GET responses of an APIView or ViewSet.
+
+    The validators come from per-table version counters for the models in
+    `version_models` (every table the response is built from), so a
+    matching If-None-Match / If-Modified-Since is answered with 304 after
+    the permission checks but before the queryset is evaluated.
+
+    Writes that bypass model signals (bulk_create, QuerySet.update) must
+    call core.versioning.bump_model_version themselves.
+    """
+
+    version_models = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        track_model_versions(*cls.version_models)
+
+    def get_version_validators(self, request):
+        versions, last_modified = get_version_info(
+            *(model_scope(model) for model in self.version_models)
+        )
+        parts = [
+            request.path,
+            request.query_params.urlencode(),
+            request.accepted_renderer.format,
+            *(f"{scope}={version}" for scope, version in sorted(versions.items())),
+        ]
+        digest = hashlib.sha1("|".join(parts).encode()).hexdigest()
+        return f'"{digest}"', last_modified
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+
+        self._etag = self._last_modified = None
+        if request.method not in ("GET", "HEAD") or not self.version_models:
+            return
+
+        self._etag, self._last_modified = self.get_version_validators(request)
+        conditional = get_conditional_response(
+            request._request, etag=self._etag, last_modified=self._last_modified
+        )
+        if conditional is not None and conditional.status_code == 304:
+            raise NotModified()
+
+    def handle_exception(self, exc):
+        if isinstance(exc, NotModified):
+            return Response(status=status.HTTP_304_NOT_MODIFIED)
+        return super().handle_exception(exc)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+
+        etag = getattr(self, "_etag", None)
+        if etag and response.status_code in (200, 304):
+            response["ETag"] = etag
+            if self._last_modified:
+                response["Last-Modified"] = http_date(self._last_modified)
+            patch_cache_control(response, private=True, no_cache=True)
+        return response
@@ -0,0 +1,118 @@
+"""
+Authorized file downloads handed off to the front web server.
+
+Views check access, then return protected_file_response(). With
+PROTECTED_MEDIA["BACKEND"] = "nginx" the response is empty and carries
+X-Accel-Redirect to an `internal` location; "apache" uses X-Sendfile.
+Either way the web server streams the bytes (and serves Range requests)
+while the worker moves on. The "django" backend streams the file itself
+with single-range support, for development.
+
+Content-addressed blobs never change, so they get a long private cache
+lifetime and their SHA-256 as ETag.
+"""
+
+import mimetypes
+import os
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.http import FileResponse, HttpResponse, HttpResponseNotModified
+from django.utils.http import content_disposition_header, http_date
+
+RANGE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def _cache_headers(field_file, modified):
+    from uploads.storage import BLOB_PREFIX
+
+    headers = {"Last-Modified": http_date(modified)}
+    if field_file.name.startswith(BLOB_PREFIX):
+        # The name is the content hash: the bytes behind it can never change
+        headers["ETag"] = f'"{os.path.splitext(os.path.basename(field_file.name))[0]}"'
+        headers["Cache-Control"] = (
+            f"private, max-age={settings.PROTECTED_MEDIA['CACHE_SECONDS']}, immutable"
+        )
+    else:
+        headers["Cache-Control"] = "private, no-cache"
+    return headers
+
+
+def _parse_range(header, size):
+    """
+    (start, end) of a single byte range, None when there is no usable
+    Range header, False when the range cannot be satisfied (416).
+    """
+    match = RANGE.match(header or "")
+    if not match or not any(match.groups()):
+        return None
+    start, end = match.groups()
+    if start:
+        start, end = int(start), min(int(end) if end else size - 1, size - 1)
+    else:
+        start, end = max(size - int(end), 0), size - 1
+    return (start, end) if start <= end < size else False
+
+
+def _read_range(path, start, end, block_size=64 * 1024):
+    with open(path, "rb") as f:
+        f.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            data = f.read(min(block_size, remaining))
+            if not data:
+                break
+            remaining -= len(data)
+            yield data
+
+
+def protected_file_response(request, field_file, filename=None):
+    """`filename` is what the browser saves as; blob names are only hashes."""
+    path = field_file.path
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return HttpResponse(status=404)
+
+    filename = filename or os.path.basename(field_file.name)
+    content_type = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+
+    # 1. Revalidation never touches the file
+    cache_headers = _cache_headers(field_file, stat.st_mtime)
+    if request.META.get("HTTP_IF_NONE_MATCH") == cache_headers.get("ETag", ""):
+        return HttpResponseNotModified(headers=cache_headers)
+
+    backend = settings.PROTECTED_MEDIA["BACKEND"]
+    if backend in ("nginx", "apache"):
+        response = HttpResponse(content_type=content_type)
+        if backend == "nginx":
+            response["X-Accel-Redirect"] = quote(
+                settings.PROTECTED_MEDIA["INTERNAL_PREFIX"] + field_file.name
+            )
+        else:
+            response["X-Sendfile"] = path
+    else:
+        # 2. Development fallback: stream from the worker, one range at most
+        byte_range = _parse_range(request.META.get("HTTP_RANGE"), stat.st_size)
+        if byte_range is False:
+            response = HttpResponse(status=416)
+            response["Content-Range"] = f"bytes */{stat.st_size}"
+            return response
+        if byte_range:
+            start, end = byte_range
+            response = FileResponse(
+                _read_range(path, start, end), status=206, content_type=content_type
+            )
+            response["Content-Range"] = f"bytes {start}-{end}/{stat.st_size}"
+            response["Content-Length"] = str(end - start + 1)
+        else:
+            response = FileResponse(open(path, "rb"), content_type=content_type)
+        response["Accept-Ranges"] = "bytes"
+
+    response["Content-Disposition"] = content_disposition_header(
+        request.GET.get("inline") != "true", filename
+    )
+    for header, value in cache_headers.items():
+        response[header] = value
+    return response
@@ -0,0 +1,73 @@
+import os
+import tempfile
+from io import StringIO
+from unittest.mock import Mock
+
+from django.core.files.storage import FileSystemStorage
+from django.core.management import call_command
+from django.db import connection
+from django.db.models.fields.files import FieldFile
+from django.test import RequestFactory, SimpleTestCase, override_settings
+from django_tenants.test.cases import TenantTestCase
+from django_tenants.utils import schema_exists
+
+from organizations.models import Organization
+
+from .sendfile import _parse_range, protected_file_response
+
+MEDIA = {"BACKEND": "django", "INTERNAL_PREFIX": "/protected-media/", "CACHE_SECONDS": 60}
+
+
+@override_settings(PROTECTED_MEDIA=MEDIA)
+class ProtectedFileResponseTest(SimpleTestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.name = "blobs/school/ab/cd/" + "ab" * 32 + ".txt"
+        os.makedirs(os.path.join(self.root, os.path.dirname(self.name)))
+        with open(os.path.join(self.root, self.name), "wb") as f:
+            f.write(b"0123456789")
+        storage = FileSystemStorage(location=self.root)
+        self.file = FieldFile(None, Mock(storage=storage), self.name)
+        self.factory = RequestFactory()
+
+    def test_parse_range(self):
+        self.assertEqual(_parse_range("bytes=2-5", 10), (2, 5))
+        self.assertEqual(_parse_range("bytes=7-", 10), (7, 9))
+        self.assertEqual(_parse_range("bytes=-3", 10), (7, 9))
+        self.assertIsNone(_parse_range("items=1-2", 10))
+        self.assertFalse(_parse_range("bytes=20-", 10))
+
+    def test_range_request_streams_partial_content(self):
+        request = self.factory.get("/", HTTP_RANGE="bytes=2-5")
+        response = protected_file_response(request, self.file, "notes.txt")
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(b"".join(response.streaming_content), b"2345")
+        self.assertEqual(response["Content-Range"], "bytes 2-5/10")
+        self.assertIn("immutable", response["Cache-Control"])
+
+    def test_blob_etag_revalidates_without_body(self):
+        etag = f'"{"ab" * 32}"'
+        request = self.factory.get("/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(protected_file_response(request, self.file).status_code, 304)
+
+    @override_settings(PROTECTED_MEDIA={**MEDIA, "BACKEND": "nginx"})
+    def test_nginx_backend_hands_off_transfer(self):
+        response = protected_file_response(self.factory.get("/"), self.file, "notes.txt")
+        self.assertEqual(response["X-Accel-Redirect"], "/protected-media/" + self.name)
+        self.assertEqual(response.content, b"")
+        self.assertIn('attachment; filename="notes.txt"', response["Content-Disposition"])
+
+
+class MigrateTenantsTest(TenantTestCase):
+    def test_tenant_without_schema_is_skipped(self):
+        connection.set_schema_to_public()
+        self.addCleanup(connection.set_tenant, self.tenant)
+        tenant = Organization(schema_name="half_made", name="Half Made")
+        tenant.auto_create_schema = False
+        tenant.save()
+        out = StringIO()
+
+        call_command("migrate_tenants", schemas=["half_made"], stdout=out)
+
+        self.assertIn("Skipping half_made: schema does not exist", out.getvalue())
+        self.assertFalse(schema_exists("half_made"))
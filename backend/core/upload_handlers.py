@@ -0,0 +1,33 @@
+"""
+Upload handler that refuses oversize multipart uploads while they stream,
+instead of after Django has received and spooled the whole body.
+"""
+
+from django.conf import settings
+from django.core.exceptions import RequestDataTooBig
+from django.core.files.uploadhandler import FileUploadHandler
+
+# Allowance for form fields and multipart boundaries around the file
+MULTIPART_OVERHEAD = 64 * 1024
+
+
+class MaxSizeUploadHandler(FileUploadHandler):
+    """
+    Sits first in FILE_UPLOAD_HANDLERS and passes data through unchanged.
+    Rejects the request from its Content-Length when that is already too
+    big, otherwise as soon as one file grows past UPLOADS["MAX_SIZE"].
+    """
+
+    def handle_raw_input(self, input_data, META, content_length, boundary, encoding=None):
+        self.max_size = settings.UPLOADS["MAX_SIZE"]
+        if content_length and content_length > self.max_size + MULTIPART_OVERHEAD:
+            raise RequestDataTooBig("Upload exceeds the maximum file size.")
+
+    def receive_data_chunk(self, raw_data, start):
+        if start + len(raw_data) > self.max_size:
+            raise RequestDataTooBig("Upload exceeds the maximum file size.")
+        return raw_data
+
+    def file_complete(self, file_size):
+        # Let the next handler build the UploadedFile
+        return None
@@ -0,0 +1,137 @@
+"""
+Cache-backed version counters used to build cheap ETags.
+
+A counter is bumped whenever the data it covers changes, so anything
+derived from it (an ETag, a cached payload key) can be checked with a
+single cache round trip instead of a query. Counters that are missing
+(e.g. after a cache flush) are seeded from the clock, so a restarted
+cache never reissues a version a client may still hold.
+"""
+
+import hashlib
+import math
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.db.models.signals import m2m_changed, post_delete, post_save
+
+
+def _key(scope):
+    return f"core:version:{scope}"
+
+
+def _changed_at_key(scope):
+    return f"core:version_at:{scope}"
+
+
+def _seed():
+    return time.time_ns() // 1000
+
+
+def tenant_scope(name, schema_name=None):
+    """Scopes a counter to the current (or given) tenant schema."""
+    return f"{schema_name or connection.schema_name}:{name}"
+
+
+def get_version_info(*scopes):
+    """
+    Returns ({scope: version}, last_modified) in one cache round trip.
+    last_modified is the newest change time (epoch seconds) across scopes.
+    """
+    keys = {_key(scope): scope for scope in scopes}
+    at_keys = [_changed_at_key(scope) for scope in scopes]
+    found = cache.get_many(list(keys) + at_keys)
+
+    versions = {}
+    for key, scope in keys.items():
+        if key not in found:
+            now = time.time()
+            cache.add(key, _seed(), timeout=None)
+            cache.add(_changed_at_key(scope), now, timeout=None)
+            found[key] = cache.get(key)
+            found[_changed_at_key(scope)] = now
+        versions[scope] = found[key]
+
+    changed = [found[k] for k in at_keys if found.get(k) is not None]
+    return versions, (math.ceil(max(changed)) if changed else None)
+
+
+def get_versions(*scopes):
+    """Returns {scope: version} for all scopes in one cache round trip."""
+    return get_version_info(*scopes)[0]
+
+
+def bump_version(*scopes):
+    now = time.time()
+    for scope in scopes:
+        key = _key(scope)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, _seed(), timeout=None)
+        cache.set(_changed_at_key(scope), now, timeout=None)
+
+
+# Per-table counters
+
+_tracked_models = set()
+
+
+def _is_shared_model(model):
+    app = model._meta.app_config.name
+    return app in settings.SHARED_APPS and app not in settings.TENANT_APPS
+
+
+def model_scope(model):
+    """
+    Counter for a whole table. Tenant tables are counted per schema;
+    shared (public) tables have a single counter.
+    """
+    schema_name = "public" if _is_shared_model(model) else None
+    return tenant_scope(f"table:{model._meta.label_lower}", schema_name)
+
+
+def get_versioned_key(prefix, *models):
+    """Cache key that changes whenever any of the models' tables change."""
+    versions = get_versions(*(model_scope(model) for model in models))
+    stamp = "|".join(f"{scope}={v}" for scope, v in sorted(versions.items()))
+    return f"{prefix}:{hashlib.sha1(stamp.encode()).hexdigest()}"
+
+
+def bump_model_version(*models):
+    """For writes that skip model signals (bulk_create, update(), raw SQL)."""
+    bump_version(*(model_scope(model) for model in models))
+
+
+def _model_receiver(model):
+    def receiver(sender, **kwargs):
+        if kwargs.get("action", "").startswith("pre_"):
+            return
+        bump_model_version(model)
+
+    return receiver
+
+
+def track_model_versions(*models):
+    """
+    Bumps each model's table counter on save, delete and changes to its
+    many-to-many fields. Safe to call repeatedly for the same model.
+    """
+    for model in models:
+        if model in _tracked_models:
+            continue
+        _tracked_models.add(model)
+
+        receiver = _model_receiver(model)
+        uid = f"core.versioning:{model._meta.label_lower}"
+        post_save.connect(receiver, sender=model, weak=False, dispatch_uid=uid)
+        post_delete.connect(receiver, sender=model, weak=False, dispatch_uid=uid)
+        for field in model._meta.many_to_many:
+            m2m_changed.connect(
+                receiver,
+                sender=field.remote_field.through,
+                weak=False,
+                dispatch_uid=f"{uid}:{field.name}",
+            )
@@ -41,4 +41,10 @@ class AssignmentSubmissionAdmin(admin.ModelAdmin):
     list_display = ["assignment", "student", "status", "score", "submitted_at"]
     list_filter = ["status", "submitted_at", "graded_at"]
     search_fields = ["student__profile__first_name", "student__profile__last_name"]
-    readonly_fields = ["created_at", "updated_at", "is_late"]
+    readonly_fields = [
+        "created_at",
+        "updated_at",
+        "is_late",
+        "days_late",
+        "effective_score",
+    ]
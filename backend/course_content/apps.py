@@ -3,3 +3,18 @@ from django.apps import AppConfig
 
 class CourseContentConfig(AppConfig):
     name = 'course_content'
+
+    def ready(self):
+        from core.versioning import track_model_versions
+        from .models import Assignment, AssignmentSubmission, CourseContent
+
+        # Version counters for the cached gradebook matrix
+        track_model_versions(Assignment, AssignmentSubmission)
+
+        import course_content.signals
+
+        # Deduplicated files: keep blob reference counts in step
+        from uploads.blobs import track_blob_references
+
+        track_blob_references(CourseContent, "file")
+        track_blob_references(AssignmentSubmission, "submission_file")
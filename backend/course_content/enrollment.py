@@ -0,0 +1,163 @@
+"""
+Set-based SubjectEnrollment writes.
+
+Callers pass any number of subjects and students. The existing pairs are
+read with one query and only the missing ones are inserted with a single
+bulk_create, so enrolling a whole level costs a fixed handful of queries
+instead of two per student.
+"""
+
+import uuid
+from collections import defaultdict
+
+from academics.models import Subject
+from students.models import Student, StudentLevel
+from .models import SubjectEnrollment
+
+
+class EnrollmentError(ValueError):
+    pass
+
+
+def _parse_ids(values, label):
+    if isinstance(values, (str, uuid.UUID)):
+        values = [values]
+    try:
+        return {uuid.UUID(str(value)) for value in values or []}
+    except (TypeError, ValueError, AttributeError):
+        raise EnrollmentError(f"{label} must be a list of UUIDs")
+
+
+def resolve_students(student_ids=None, section_id=None, level_id=None):
+    """
+    Returns (existing student ids, unknown ids). Explicit ids are checked
+    against Student; section/level expand to their current enrollments.
+    """
+    requested = _parse_ids(student_ids, "student_ids")
+    found = set()
+    if requested:
+        found = set(
+            Student.objects.filter(id__in=requested).values_list("id", flat=True)
+        )
+
+    if section_id or level_id:
+        placements = StudentLevel.objects.filter(is_current=True)
+        if section_id:
+            placements = placements.filter(section_id=section_id)
+        if level_id:
+            placements = placements.filter(level_id=level_id)
+        found |= set(placements.values_list("student_id", flat=True))
+
+    return found, requested - found
+
+
+def enroll_students(subject_ids, student_ids, academic_year):
+    """
+    Enrolls every student in every subject for the year. Returns counts.
+    Pairs that already exist (or are inserted concurrently) are skipped.
+    """
+    subject_ids = set(subject_ids)
+    student_ids = set(student_ids)
+    if not subject_ids or not student_ids:
+        return {"requested": 0, "already_enrolled": 0, "newly_enrolled": 0}
+
+    wanted = {
+        (student_id, subject_id, academic_year)
+        for student_id in student_ids
+        for subject_id in subject_ids
+    }
+    created = _insert_missing(wanted)
+
+    return {
+        "requested": len(wanted),
+        "already_enrolled": len(wanted) - created,
+        "newly_enrolled": created,
+    }
+
+
+def _insert_missing(wanted):
+    """
+    wanted: set of (student_id, subject_id, academic_year). Reads the
+    existing rows with one query and bulk-inserts the rest.
+    """
+    if not wanted:
+        return 0
+
+    students, subjects, years = (set(column) for column in zip(*wanted))
+    existing = set(
+        SubjectEnrollment.objects.filter(
+            student_id__in=students,
+            subject_id__in=subjects,
+            academic_year__in=years,
+        ).values_list("student_id", "subject_id", "academic_year")
+    )
+
+    missing = [
+        SubjectEnrollment(student_id=student, subject_id=subject, academic_year=year)
+        for student, subject, year in wanted - existing
+    ]
+    SubjectEnrollment.objects.bulk_create(
+        missing, batch_size=1000, ignore_conflicts=True
+    )
+    return len(missing)
+
+
+def enroll_compulsory_subjects(placements):
+    """
+    Enrolls placed students into every non-elective subject of their level
+    (for levels with auto_enroll_compulsory). Takes any batch of
+    StudentLevel rows and costs two queries plus the insert, however many
+    students or levels are involved. Returns the number of new enrollments.
+    """
+    students_by_level = defaultdict(set)
+    for placement in placements:
+        if placement.level_id and placement.is_current:
+            students_by_level[placement.level_id].add(
+                (placement.student_id, placement.academic_year)
+            )
+    if not students_by_level:
+        return 0
+
+    compulsory = Subject.objects.filter(
+        level_id__in=students_by_level,
+        is_elective=False,
+        level__auto_enroll_compulsory=True,
+    ).values_list("level_id", "id")
+
+    wanted = {
+        (student_id, subject_id, academic_year)
+        for level_id, subject_id in compulsory
+        for student_id, academic_year in students_by_level[level_id]
+    }
+    return _insert_missing(wanted)
+
+
+def bulk_enroll(
+    academic_year,
+    subject_ids,
+    student_ids=None,
+    section_id=None,
+    level_id=None,
+):
+    """Validates the request payload's ids, then enrolls. Raises EnrollmentError."""
+    if not academic_year:
+        raise EnrollmentError("academic_year is required")
+
+    requested_subjects = _parse_ids(subject_ids, "subject_ids")
+    if not requested_subjects:
+        raise EnrollmentError("At least one subject is required")
+    subjects = set(
+        Subject.objects.filter(id__in=requested_subjects).values_list("id", flat=True)
+    )
+
+    section_id = next(iter(_parse_ids(section_id, "section_id")), None)
+    level_id = next(iter(_parse_ids(level_id, "level_id")), None)
+
+    students, unknown_students = resolve_students(student_ids, section_id, level_id)
+    if not students and not unknown_students:
+        raise EnrollmentError("Provide student_ids, section_id or level_id")
+
+    result = enroll_students(subjects, students, academic_year)
+    result["unknown_subject_ids"] = sorted(map(str, requested_subjects - subjects))
+    result["unknown_student_ids"] = sorted(map(str, unknown_students))
+    return result
@@ -0,0 +1,186 @@
+"""
+Gradebook aggregation over AssignmentSubmission.
+
+Everything is computed in the database from the late-penalty-adjusted
+effective_score that AssignmentSubmission stores at submit/grade time:
+per-student totals are one GROUP BY with a PERCENT_RANK() window over the
+result, and per-assignment distributions use PERCENTILE_CONT. The optional
+students x assignments matrix for the grading UI is cached under the
+version counters of the tables it reads.
+"""
+
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import (
+    Aggregate,
+    Avg,
+    Count,
+    DecimalField,
+    ExpressionWrapper,
+    F,
+    FloatField,
+    Max,
+    Min,
+    Q,
+    Sum,
+    Value,
+    Window,
+)
+from django.db.models.functions import Cast, Coalesce, NullIf
+from django.db.models.functions import PercentRank
+
+from core.versioning import get_versioned_key
+from students.models import StudentLevel
+from .models import Assignment, AssignmentSubmission
+
+GRADEBOOK_MODELS = (Assignment, AssignmentSubmission, StudentLevel)
+
+
+class PercentileCont(Aggregate):
+    function = "PERCENTILE_CONT"
+    template = "%(function)s(%(percentile)s) WITHIN GROUP (ORDER BY %(expressions)s)"
+    output_field = FloatField()
+
+    def __init__(self, expression, percentile, **extra):
+        super().__init__(expression, percentile=percentile, **extra)
+
+
+def with_effective_points(submissions):
+    """Annotates the stored late-penalty-adjusted score as a float for aggregation."""
+    return submissions.annotate(effective_points=Cast("effective_score", FloatField()))
+
+
+def scope_submissions(subject_id=None, section_id=None, assignment_ids=None):
+    submissions = AssignmentSubmission.objects.all()
+    if subject_id:
+        submissions = submissions.filter(
+            assignment__content__target_subjects__id=subject_id
+        )
+    if section_id:
+        submissions = submissions.filter(
+            student__enrollments__is_current=True,
+            student__enrollments__section_id=section_id,
+        )
+    if assignment_ids:
+        submissions = submissions.filter(assignment_id__in=assignment_ids)
+    return with_effective_points(submissions)
+
+
+def student_totals(submissions):
+    """One row per student: totals, average percentage and percentile rank."""
+    graded = Q(status="graded")
+    percentage = ExpressionWrapper(
+        Coalesce(
+            Sum("effective_points", filter=graded)
+            * 100.0
+            / NullIf(Cast(Sum("assignment__total_points", filter=graded), FloatField()), 0),
+            Value(0.0),
+        ),
+        output_field=FloatField(),
+    )
+    rows = (
+        submissions.values(
+            "student_id",
+            "student__enrollment_id",
+            "student__profile__first_name",
+            "student__profile__last_name",
+        )
+        .annotate(
+            assignments=Count("id"),
+            graded=Count("id", filter=graded),
+            late=Count("id", filter=Q(is_late=True)),
+            raw_total=Coalesce(Sum("score", filter=graded), Value(0), output_field=DecimalField()),
+            effective_total=Coalesce(Sum("effective_points", filter=graded), Value(0.0)),
+            possible=Coalesce(
+                Sum("assignment__total_points", filter=graded),
+                Value(0),
+                output_field=DecimalField(),
+            ),
+            percentage=percentage,
+        )
+        .annotate(percentile=Window(PercentRank(), order_by=F("percentage").asc()))
+        .order_by("-percentage")
+    )
+    return [
+        {
+            "student_id": row["student_id"],
+            "enrollment_id": row["student__enrollment_id"],
+            "name": f"{row['student__profile__first_name']} {row['student__profile__last_name']}",
+            "assignments": row["assignments"],
+            "graded": row["graded"],
+            "late": row["late"],
+            "raw_total": float(row["raw_total"]),
+            "effective_total": round(row["effective_total"], 2),
+            "possible": float(row["possible"]),
+            "percentage": round(row["percentage"], 2),
+            "percentile": round(row["percentile"] * 100, 1),
+        }
+        for row in rows
+    ]
+
+
+def assignment_distribution(submissions):
+    """Per-assignment mean/min/max and quartiles of effective scores."""
+    graded = submissions.filter(status="graded")
+    return list(
+        graded.values("assignment_id", "assignment__content__title", "assignment__total_points")
+        .annotate(
+            graded=Count("id"),
+            mean=Avg("effective_points"),
+            min=Min("effective_points"),
+            max=Max("effective_points"),
+            p25=PercentileCont("effective_points", 0.25),
+            median=PercentileCont("effective_points", 0.5),
+            p75=PercentileCont("effective_points", 0.75),
+        )
+        .order_by("assignment__content__title")
+    )
+
+
+def score_matrix(submissions, scope):
+    """{student_id: {assignment_id: effective score or status}}, cached per scope."""
+    scope_hash = hashlib.sha1(repr(scope).encode()).hexdigest()
+    key = get_versioned_key(
+        f"course_content:gradebook:{scope_hash}", *GRADEBOOK_MODELS
+    )
+    matrix = cache.get(key)
+    if matrix is None:
+        matrix = {}
+        for row in submissions.values(
+            "student_id", "assignment_id", "status", "effective_points"
+        ):
+            cell = (
+                round(row["effective_points"], 2)
+                if row["status"] == "graded" and row["effective_points"] is not None
+                else row["status"]
+            )
+            matrix.setdefault(str(row["student_id"]), {})[str(row["assignment_id"])] = cell
+        cache.set(
+            key, matrix, timeout=getattr(settings, "GRADEBOOK_MATRIX_CACHE_TTL", 600)
+        )
+    return matrix
+
+
+def build_gradebook(subject_id=None, section_id=None, assignment_ids=None, matrix=False):
+    submissions = scope_submissions(subject_id, section_id, assignment_ids)
+    students = student_totals(submissions)
+
+    percentages = [s["percentage"] for s in students]
+    data = {
+        "students": students,
+        "assignments": assignment_distribution(submissions),
+        "summary": {
+            "students": len(students),
+            "average_percentage": (
+                round(sum(percentages) / len(percentages), 2) if percentages else 0.0
+            ),
+            "highest": max(percentages, default=0.0),
+            "lowest": min(percentages, default=0.0),
+        },
+    }
+    if matrix:
+        scope = (subject_id, section_id, sorted(map(str, assignment_ids or [])))
+        data["matrix"] = score_matrix(submissions, scope)
+    return data
@@ -0,0 +1,153 @@
+"""
+Set-based grading for AssignmentSubmission.
+
+A whole stack of papers is validated in one pass (one query for the
+submissions and their assignments) and written with a single bulk_update,
+instead of one request, one Profile lookup and one UPDATE per paper.
+"""
+
+import uuid
+from decimal import Decimal, InvalidOperation
+
+from django.utils import timezone
+
+from core.versioning import bump_model_version
+from .models import AssignmentSubmission
+
+GRADED_FIELDS = [
+    "score",
+    "feedback",
+    "graded_by",
+    "graded_at",
+    "status",
+    "is_late",
+    "days_late",
+    "effective_score",
+    "updated_at",
+]
+LATENESS_FIELDS = ["is_late", "days_late", "effective_score", "updated_at"]
+
+
+class GradingError(ValueError):
+    def __init__(self, message, errors=None):
+        super().__init__(message)
+        self.errors = errors or []
+
+
+def clean_score(value, total_points):
+    """Returns the score as a Decimal within 0..total_points, or raises."""
+    try:
+        score = Decimal(str(value))
+    except (InvalidOperation, TypeError, ValueError):
+        raise GradingError("Score must be a number")
+    if not score.is_finite() or score < 0 or score > total_points:
+        raise GradingError(f"Score must be between 0 and {total_points}")
+    return score
+
+
+def _parse_entries(entries):
+    """[{id, score, feedback}, ...] -> {uuid: (raw score, feedback)} plus row errors."""
+    if not isinstance(entries, list) or not entries:
+        raise GradingError("grades must be a non-empty list")
+
+    parsed, errors = {}, []
+    for index, entry in enumerate(entries):
+        if not isinstance(entry, dict):
+            errors.append({"index": index, "error": "Expected an object"})
+            continue
+        try:
+            submission_id = uuid.UUID(str(entry.get("id")))
+        except (TypeError, ValueError):
+            errors.append({"index": index, "error": "id must be a UUID"})
+            continue
+        if submission_id in parsed:
+            errors.append({"index": index, "id": str(submission_id), "error": "Duplicate id"})
+            continue
+        if entry.get("score") is None:
+            errors.append({"index": index, "id": str(submission_id), "error": "Score is required"})
+            continue
+        parsed[submission_id] = (entry["score"], entry.get("feedback", "") or "")
+    return parsed, errors
+
+
+def bulk_grade(queryset, entries, graded_by):
+    """
+    Grades every submission in `entries` or none of them.
+
+    `queryset` limits which submissions the caller may touch. Every row is
+    checked against its assignment's total_points before anything is
+    written; any error raises GradingError with per-row details.
+    Returns the ids of the graded submissions.
+    """
+    parsed, errors = _parse_entries(entries)
+
+    # 1. One query for the submissions and their total_points
+    submissions = {
+        s.id: s
+        for s in queryset.filter(id__in=parsed.keys()).select_related("assignment")
+    }
+
+    # 2. Validate every row before writing anything
+    now = timezone.now()
+    to_update = []
+    for submission_id, (raw_score, feedback) in parsed.items():
+        submission = submissions.get(submission_id)
+        if submission is None:
+            errors.append({"id": str(submission_id), "error": "Submission not found"})
+            continue
+        try:
+            submission.score = clean_score(raw_score, submission.assignment.total_points)
+        except GradingError as e:
+            errors.append({"id": str(submission_id), "error": str(e)})
+            continue
+        submission.apply_late_penalty()
+        submission.feedback = feedback
+        submission.graded_by = graded_by
+        submission.graded_at = now
+        submission.status = "graded"
+        submission.updated_at = now
+        to_update.append(submission)
+
+    if errors:
+        raise GradingError("Some grades are invalid; nothing was saved", errors)
+
+    # 3. Single UPDATE ... CASE statement; bulk writes skip signals
+    AssignmentSubmission.objects.bulk_update(to_update, GRADED_FIELDS)
+    bump_model_version(AssignmentSubmission)
+
+    return [submission.id for submission in to_update]
+
+
+def recompute_late_penalties(assignments, batch_size=500, missing_only=False):
+    """
+    Re-derives the materialized lateness columns for every submission of
+    `assignments` (after a due date or late_penalty_percent change).
+    `missing_only` limits it to graded rows that never got an
+    effective_score (the one-off backfill of rows older than the columns).
+    Only rows whose values actually change are written. Returns that count.
+    """
+    now = timezone.now()
+    changed = 0
+    for assignment in assignments:
+        batch = []
+        submissions = AssignmentSubmission.objects.filter(assignment=assignment)
+        if missing_only:
+            submissions = submissions.filter(
+                score__isnull=False, effective_score__isnull=True
+            )
+        submissions = submissions.only(
+            "id", "assignment_id", "submitted_at", "score",
+            "is_late", "days_late", "effective_score",
+        )
+        for submission in submissions.iterator(chunk_size=batch_size):
+            before = (submission.is_late, submission.days_late, submission.effective_score)
+            submission.apply_late_penalty(assignment)
+            if before != (submission.is_late, submission.days_late, submission.effective_score):
+                submission.updated_at = now
+                batch.append(submission)
+        AssignmentSubmission.objects.bulk_update(batch, LATENESS_FIELDS, batch_size=batch_size)
+        changed += len(batch)
+
+    if changed:
+        bump_model_version(AssignmentSubmission)
+    return changed
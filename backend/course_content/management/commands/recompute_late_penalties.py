@@ -0,0 +1,66 @@
+from django.core.management.base import BaseCommand
+from django_tenants.utils import tenant_context
+
+from organizations.models import Organization
+from course_content.grading import recompute_late_penalties
+from course_content.models import Assignment
+
+
+class Command(BaseCommand):
+    help = (
+        "Re-derives is_late, days_late and effective_score on assignment "
+        "submissions. Run after bulk due-date changes, or once with "
+        "--missing-only to backfill rows graded before these columns existed."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--assignment",
+            action="append",
+            dest="assignments",
+            help="Only recompute this assignment id (can be passed multiple times)",
+        )
+        parser.add_argument(
+            "--missing-only",
+            action="store_true",
+            help="Only graded submissions without an effective_score (one-off backfill).",
+        )
+        parser.add_argument(
+            "--schema",
+            action="append",
+            dest="schemas",
+            help="Only recompute this schema (can be passed multiple times)",
+        )
+
+    def handle(self, *args, **options):
+        tenants = Organization.objects.exclude(schema_name="public")
+        if options["schemas"]:
+            tenants = tenants.filter(schema_name__in=options["schemas"])
+
+        total = 0
+        self.stdout.write(self.style.MIGRATE_HEADING("--- Late Penalty Recompute ---"))
+
+        for tenant in tenants:
+            with tenant_context(tenant):
+                assignments = Assignment.objects.only(
+                    "id", "due_date", "late_penalty_percent"
+                )
+                if options["assignments"]:
+                    assignments = assignments.filter(id__in=options["assignments"])
+                if options["missing_only"]:
+                    assignments = assignments.filter(
+                        submissions__score__isnull=False,
+                        submissions__effective_score__isnull=True,
+                    ).distinct()
+
+                changed = recompute_late_penalties(
+                    assignments.iterator(), missing_only=options["missing_only"]
+                )
+                if changed:
+                    total += changed
+                    self.stdout.write(
+                        f"Tenant: {tenant.name} ({tenant.schema_name}) - "
+                        f"{changed} submission(s) updated"
+                    )
+
+        self.stdout.write(self.style.SUCCESS(f"Done. {total} submission(s) updated."))
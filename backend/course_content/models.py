@@ -1,6 +1,11 @@
 from django.db import models
+from datetime import timedelta
+from decimal import Decimal
+import math
 import uuid
 
+from uploads.storage import get_blob_storage
+
 
 class ContentType(models.TextChoices):
     NOTE = "note", "Study Note"
@@ -24,7 +29,13 @@ class CourseContent(models.Model):
     content_type = models.CharField(max_length=20, choices=ContentType.choices)
 
     # File/URL storage
-    file = models.FileField(upload_to="course_content/%Y/%m/", null=True, blank=True)
+    file = models.FileField(
+        upload_to="course_content/%Y/%m/",
+        storage=get_blob_storage,
+        max_length=255,
+        null=True,
+        blank=True,
+    )
     external_url = models.URLField(null=True, blank=True)
 
     # Author (any staff member can create content)
@@ -139,7 +150,11 @@ class AssignmentSubmission(models.Model):
     # Submission data
     submitted_at = models.DateTimeField(null=True, blank=True)
     submission_file = models.FileField(
-        upload_to="submissions/%Y/%m/", null=True, blank=True
+        upload_to="submissions/%Y/%m/",
+        storage=get_blob_storage,
+        max_length=255,
+        null=True,
+        blank=True,
     )
     submission_text = models.TextField(blank=True)
     submission_url = models.URLField(blank=True)
@@ -164,6 +179,13 @@ class AssignmentSubmission(models.Model):
     )
     graded_at = models.DateTimeField(null=True, blank=True)
 
+    # Late penalty, materialized on save (see apply_late_penalty)
+    is_late = models.BooleanField(default=False)
+    days_late = models.PositiveIntegerField(default=0)
+    effective_score = models.DecimalField(
+        max_digits=5, decimal_places=2, null=True, blank=True
+    )
+
     # Metadata
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -171,13 +193,49 @@ class AssignmentSubmission(models.Model):
     class Meta:
         unique_together = ["assignment", "student"]
         ordering = ["-submitted_at"]
+        indexes = [
+            models.Index(
+                fields=["assignment", "-effective_score"], name="submission_assign_score_idx"
+            ),
+            models.Index(
+                fields=["student", "is_late"], name="submission_student_late_idx"
+            ),
+        ]
 
     def __str__(self):
         return f"{self.student.profile.full_name} - {self.assignment.content.title}"
 
-    @property
-    def is_late(self):
-        """Check if submission was late"""
-        if self.submitted_at and self.assignment.due_date:
-            return self.submitted_at > self.assignment.due_date
-        return False
+    def save(self, *args, **kwargs):
+        self.apply_late_penalty()
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None:
+            kwargs["update_fields"] = {
+                *update_fields, "is_late", "days_late", "effective_score"
+            }
+        super().save(*args, **kwargs)
+
+    def apply_late_penalty(self, assignment=None):
+        """
+        Sets is_late, days_late (whole days past due, rounded up) and
+        effective_score (score minus late_penalty_percent per late day,
+        never below zero). Pass `assignment` to avoid a lookup.
+        """
+        assignment = assignment or self.assignment
+        overdue = (
+            self.submitted_at - assignment.due_date
+            if self.submitted_at and assignment.due_date
+            else None
+        )
+        self.is_late = bool(overdue and overdue > timedelta(0))
+        self.days_late = (
+            math.ceil(overdue.total_seconds() / 86400) if self.is_late else 0
+        )
+
+        if self.score is None:
+            self.effective_score = None
+            return
+        factor = max(
+            Decimal(1) - Decimal(assignment.late_penalty_percent * self.days_late) / 100,
+            Decimal(0),
+        )
+        self.effective_score = (Decimal(self.score) * factor).quantize(Decimal("0.01"))
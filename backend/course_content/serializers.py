@@ -1,6 +1,30 @@
+from django.conf import settings
+from django.db import transaction
+from django.urls import reverse
 from rest_framework import serializers
 from .models import CourseContent, SubjectEnrollment, Assignment, AssignmentSubmission
 from django.utils import timezone
+from uploads.models import UploadSession
+from uploads.serializers import CompletedUploadField
+
+
+def download_url(serializer, field_file, url_name, pk):
+    """Authorized download endpoint for a file field (media is not public)."""
+    if not field_file:
+        return None
+    url = reverse(url_name, kwargs={"pk": pk})
+    request = serializer.context.get("request")
+    return request.build_absolute_uri(url) if request else url
+
+
+def validate_upload_size(value):
+    """Reject files over UPLOADS["MAX_SIZE"] (10MB by default)"""
+    max_size = settings.UPLOADS["MAX_SIZE"]
+    if value and value.size > max_size:
+        raise serializers.ValidationError(
+            f"File size must not exceed {max_size // (1024 * 1024)}MB"
+        )
+    return value
 
 
 class CourseContentSerializer(serializers.ModelSerializer):
@@ -11,6 +35,9 @@ class CourseContentSerializer(serializers.ModelSerializer):
         source="get_content_type_display", read_only=True
     )
     file_size = serializers.SerializerMethodField()
+    download_url = serializers.SerializerMethodField()
+    # Finished chunked upload to use as `file` (see /api/uploads/)
+    upload_id = CompletedUploadField(UploadSession.Purpose.COURSE_CONTENT)
 
     # Target details for display
     target_programs_details = serializers.SerializerMethodField()
@@ -28,6 +55,8 @@ class CourseContentSerializer(serializers.ModelSerializer):
             "content_type_display",
             "file",
             "file_size",
+            "download_url",
+            "upload_id",
             "external_url",
             "created_by",
             "created_by_name",
@@ -57,6 +86,9 @@ class CourseContentSerializer(serializers.ModelSerializer):
                 return None
         return None
 
+    def get_download_url(self, obj):
+        return download_url(self, obj.file, "content-download", obj.pk)
+
     def get_target_programs_details(self, obj):
         return [{"id": p.id, "name": p.name} for p in obj.target_programs.all()]
 
@@ -79,15 +111,13 @@ class CourseContentSerializer(serializers.ModelSerializer):
         ]
 
     def validate_file(self, value):
-        """Validate file size (max 10MB)"""
-        if value and value.size > 10 * 1024 * 1024:  # 10MB
-            raise serializers.ValidationError("File size must not exceed 10MB")
-        return value
+        """Validate file size (max UPLOADS["MAX_SIZE"])"""
+        return validate_upload_size(value)
 
     def validate(self, data):
         """Ensure either file or external_url is provided for non-assignment content"""
         content_type = data.get("content_type")
-        file = data.get("file")
+        file = data.get("file") or data.get("upload_id")
         external_url = data.get("external_url")
 
         if content_type == "link" and not external_url:
@@ -104,6 +134,26 @@ class CourseContentSerializer(serializers.ModelSerializer):
 
         return data
 
+    @transaction.atomic
+    def create(self, validated_data):
+        from uploads.services import attach_upload
+
+        upload = validated_data.pop("upload_id", None)
+        content = super().create(validated_data)
+        if upload:
+            attach_upload(upload, content.file)
+        return content
+
+    @transaction.atomic
+    def update(self, instance, validated_data):
+        from uploads.services import attach_upload
+
+        upload = validated_data.pop("upload_id", None)
+        content = super().update(instance, validated_data)
+        if upload:
+            attach_upload(upload, content.file)
+        return content
+
 
 class SubjectEnrollmentSerializer(serializers.ModelSerializer):
     student_name = serializers.CharField(
@@ -185,7 +235,7 @@ class AssignmentSubmissionSerializer(serializers.ModelSerializer):
         source="graded_by.profile.full_name", read_only=True
     )
     status_display = serializers.CharField(source="get_status_display", read_only=True)
-    is_late = serializers.BooleanField(read_only=True)
+    download_url = serializers.SerializerMethodField()
 
     class Meta:
         model = AssignmentSubmission
@@ -198,6 +248,7 @@ class AssignmentSubmissionSerializer(serializers.ModelSerializer):
             "student_enrollment_id",
             "submitted_at",
             "submission_file",
+            "download_url",
             "submission_text",
             "submission_url",
             "status",
@@ -208,6 +259,8 @@ class AssignmentSubmissionSerializer(serializers.ModelSerializer):
             "graded_by_name",
             "graded_at",
             "is_late",
+            "days_late",
+            "effective_score",
             "created_at",
             "updated_at",
         ]
@@ -218,13 +271,16 @@ class AssignmentSubmissionSerializer(serializers.ModelSerializer):
             "graded_by",
             "graded_at",
             "is_late",
+            "days_late",
+            "effective_score",
         ]
 
+    def get_download_url(self, obj):
+        return download_url(self, obj.submission_file, "submission-download", obj.pk)
+
     def validate_submission_file(self, value):
-        """Validate file size (max 10MB)"""
-        if value and value.size > 10 * 1024 * 1024:  # 10MB
-            raise serializers.ValidationError("File size must not exceed 10MB")
-        return value
+        """Validate file size (max UPLOADS["MAX_SIZE"])"""
+        return validate_upload_size(value)
 
 
 class CreateAssignmentSerializer(serializers.Serializer):
@@ -236,6 +292,7 @@ class CreateAssignmentSerializer(serializers.Serializer):
     title = serializers.CharField(max_length=200)
     description = serializers.CharField()
     file = serializers.FileField(required=False, allow_null=True)
+    upload_id = CompletedUploadField(UploadSession.Purpose.COURSE_CONTENT)
     external_url = serializers.URLField(required=False, allow_blank=True)
 
     # Targeting
@@ -269,7 +326,5 @@ class CreateAssignmentSerializer(serializers.Serializer):
     instructions = serializers.CharField()
 
     def validate_file(self, value):
-        """Validate file size (max 10MB)"""
-        if value and value.size > 10 * 1024 * 1024:  # 10MB
-            raise serializers.ValidationError("File size must not exceed 10MB")
-        return value
+        """Validate file size (max UPLOADS["MAX_SIZE"])"""
+        return validate_upload_size(value)
@@ -0,0 +1,27 @@
+from django.db.models.signals import post_save, pre_save
+from django.dispatch import receiver
+
+from .models import Assignment
+from .grading import recompute_late_penalties
+
+LATENESS_INPUTS = ("due_date", "late_penalty_percent")
+
+
+@receiver(pre_save, sender=Assignment)
+def remember_lateness_inputs(sender, instance, **kwargs):
+    if instance._state.adding:
+        instance._lateness_changed = False
+        return
+    previous = (
+        Assignment.objects.filter(pk=instance.pk).values(*LATENESS_INPUTS).first()
+    )
+    instance._lateness_changed = previous is not None and any(
+        previous[field] != getattr(instance, field) for field in LATENESS_INPUTS
+    )
+
+
+@receiver(post_save, sender=Assignment)
+def recompute_lateness_on_change(sender, instance, created, **kwargs):
+    """A moved due date or new penalty re-derives every submission's lateness."""
+    if getattr(instance, "_lateness_changed", False):
+        recompute_late_penalties([instance])
@@ -1,3 +1,239 @@
-from django.test import TestCase
+from datetime import timedelta
+from decimal import Decimal
 
-# Create your tests here.
+from django.test import SimpleTestCase
+from django.utils import timezone
+from django_tenants.test.cases import TenantTestCase
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from academics.models import AcademicLevel, Program, Subject
+from academics.views import SubjectViewSet
+from accounts.models import User
+from profiles.models import Profile
+from staff.models import StaffMember
+from students.models import Student, StudentLevel
+from students.serializers import StudentEnrollmentSerializer
+from .enrollment import _insert_missing, enroll_students
+from .gradebook import build_gradebook
+from .grading import GradingError, _parse_entries, clean_score, recompute_late_penalties
+from .models import Assignment, AssignmentSubmission, CourseContent, SubjectEnrollment
+from .views import GradebookView
+
+
+class BulkGradeValidationTest(SimpleTestCase):
+    def test_clean_score_bounds(self):
+        self.assertEqual(clean_score("18.5", Decimal("20")), Decimal("18.5"))
+        self.assertEqual(clean_score(20, Decimal("20")), Decimal("20"))
+        for bad in (-1, "20.01", "abc", "NaN", None):
+            with self.assertRaises(GradingError):
+                clean_score(bad, Decimal("20"))
+
+    def test_parse_entries_collects_row_errors(self):
+        good = "6f1c1f0e-8a7e-4a43-9a43-0b5f3c1a2b11"
+        parsed, errors = _parse_entries(
+            [
+                {"id": good, "score": 10, "feedback": "ok"},
+                {"id": good, "score": 12},
+                {"id": "nope", "score": 5},
+                {"id": "1d7a4f35-8f4c-4c2b-b4a3-65f4c9f0a7de"},
+            ]
+        )
+        self.assertEqual(len(parsed), 1)
+        self.assertEqual([e["error"] for e in errors], [
+            "Duplicate id", "id must be a UUID", "Score is required",
+        ])
+
+    def test_parse_entries_rejects_empty_payload(self):
+        with self.assertRaises(GradingError):
+            _parse_entries([])
+
+
+class LatePenaltyTest(SimpleTestCase):
+    def setUp(self):
+        self.due = timezone.now()
+        self.assignment = Assignment(due_date=self.due, late_penalty_percent=10)
+
+    def submission(self, delay, score="80"):
+        return AssignmentSubmission(submitted_at=self.due + delay, score=Decimal(score))
+
+    def test_on_time_keeps_full_score(self):
+        submission = self.submission(-timedelta(hours=1))
+        submission.apply_late_penalty(self.assignment)
+        self.assertFalse(submission.is_late)
+        self.assertEqual(submission.days_late, 0)
+        self.assertEqual(submission.effective_score, Decimal("80.00"))
+
+    def test_partial_days_round_up(self):
+        submission = self.submission(timedelta(days=1, minutes=1))
+        submission.apply_late_penalty(self.assignment)
+        self.assertTrue(submission.is_late)
+        self.assertEqual(submission.days_late, 2)
+        self.assertEqual(submission.effective_score, Decimal("64.00"))
+
+    def test_penalty_never_goes_negative(self):
+        submission = self.submission(timedelta(days=30))
+        submission.apply_late_penalty(self.assignment)
+        self.assertEqual(submission.effective_score, Decimal("0.00"))
+
+    def test_ungraded_has_no_effective_score(self):
+        submission = AssignmentSubmission(submitted_at=self.due + timedelta(days=1))
+        submission.apply_late_penalty(self.assignment)
+        self.assertTrue(submission.is_late)
+        self.assertIsNone(submission.effective_score)
+
+
+class GradebookTest(TenantTestCase):
+    def setUp(self):
+        staff = StaffMember.objects.create(
+            profile=Profile.objects.create(first_name="Ada", last_name="Teacher"),
+            employee_id="T-1",
+            designation="Teacher",
+        )
+        content = CourseContent.objects.create(
+            title="Essay", description="", content_type="assignment", created_by=staff
+        )
+        due = timezone.now()
+        self.assignment = Assignment.objects.create(
+            content=content,
+            due_date=due,
+            total_points=20,
+            late_penalty_percent=10,
+            instructions="",
+        )
+        # 10/20 and 15/20 on time; 20/20 one day late -> 18 after the penalty
+        for name, score, delay in (("A", 10, -1), ("B", 15, -1), ("C", 20, 23)):
+            student = Student.objects.create(
+                profile=Profile.objects.create(first_name=name, last_name="Student"),
+                enrollment_id=f"S-{name}",
+            )
+            AssignmentSubmission.objects.create(
+                assignment=self.assignment,
+                student=student,
+                status="graded",
+                score=score,
+                submitted_at=due + timedelta(hours=delay),
+            )
+
+    def test_totals_rank_and_distribution(self):
+        data = build_gradebook(assignment_ids=[self.assignment.id])
+
+        students = [
+            (s["name"], s["effective_total"], s["percentage"], s["percentile"], s["late"])
+            for s in data["students"]
+        ]
+        self.assertEqual(students, [
+            ("C Student", 18.0, 90.0, 100.0, 1),
+            ("B Student", 15.0, 75.0, 50.0, 0),
+            ("A Student", 10.0, 50.0, 0.0, 0),
+        ])
+        (distribution,) = data["assignments"]
+        self.assertEqual(
+            (distribution["p25"], distribution["median"], distribution["p75"]),
+            (12.5, 15.0, 16.5),
+        )
+        self.assertEqual(data["summary"]["average_percentage"], 71.67)
+
+    def test_backfill_only_touches_graded_rows_missing_effective_score(self):
+        submissions = AssignmentSubmission.objects.filter(assignment=self.assignment)
+        submissions.filter(student__enrollment_id="S-A").update(effective_score=None)
+
+        changed = recompute_late_penalties([self.assignment], missing_only=True)
+
+        self.assertEqual(changed, 1)
+        self.assertFalse(submissions.filter(effective_score__isnull=True).exists())
+
+    def test_view_requires_a_scope_and_returns_the_matrix(self):
+        view = GradebookView.as_view()
+        factory = APIRequestFactory()
+        user = User(username="owner", is_superuser=True)
+
+        request = factory.get("/api/course-content/gradebook/")
+        force_authenticate(request, user=user)
+        self.assertEqual(view(request).status_code, 400)
+
+        request = factory.get(
+            "/api/course-content/gradebook/",
+            {"assignment": str(self.assignment.id), "matrix": "true"},
+        )
+        force_authenticate(request, user=user)
+        response = view(request)
+        self.assertEqual(response.status_code, 200)
+        cells = [row[str(self.assignment.id)] for row in response.data["matrix"].values()]
+        self.assertEqual(sorted(cells), [10.0, 15.0, 18.0])
+
+
+class EnrollmentTest(TenantTestCase):
+    def setUp(self):
+        program = Program.objects.create(name="High School", code="HS")
+        self.level = AcademicLevel.objects.create(program=program, name="Grade 10")
+        self.subjects = [
+            Subject.objects.create(level=self.level, name=name, code=name[:3].upper())
+            for name in ("Maths", "Science")
+        ]
+        self.students = [
+            Student.objects.create(
+                profile=Profile.objects.create(first_name=name, last_name="Student"),
+                enrollment_id=f"S-{name}",
+            )
+            for name in ("A", "B")
+        ]
+
+    def test_insert_missing_is_idempotent(self):
+        wanted = {
+            (student.id, subject.id, "2026")
+            for student in self.students
+            for subject in self.subjects
+        }
+        self.assertEqual(_insert_missing(wanted), 4)
+        self.assertEqual(_insert_missing(wanted), 0)
+        self.assertEqual(SubjectEnrollment.objects.count(), 4)
+
+    def test_enroll_students_skips_existing_pairs(self):
+        enroll_students([self.subjects[0].id], [self.students[0].id], "2026")
+
+        result = enroll_students(
+            [s.id for s in self.subjects], [s.id for s in self.students], "2026"
+        )
+
+        self.assertEqual(
+            result, {"requested": 4, "already_enrolled": 1, "newly_enrolled": 3}
+        )
+        self.assertEqual(SubjectEnrollment.objects.count(), 4)
+
+    def enrolled_subjects(self, student):
+        rows = SubjectEnrollment.objects.filter(student=student)
+        return set(rows.values_list("subject__name", flat=True))
+
+    def test_admission_enrolls_compulsory_subjects(self):
+        Subject.objects.create(level=self.level, name="Art", code="ART", is_elective=True)
+        serializer = StudentEnrollmentSerializer(
+            data={
+                "first_name": "New",
+                "last_name": "Student",
+                "gender": "other",
+                "date_of_birth": "2012-01-01",
+                "level_id": str(self.level.id),
+                "academic_year": "2026",
+            }
+        )
+        serializer.is_valid(raise_exception=True)
+        student = serializer.save()
+
+        self.assertEqual(self.enrolled_subjects(student), {"Maths", "Science"})
+
+    def test_new_compulsory_subject_enrolls_current_students(self):
+        StudentLevel.objects.create(
+            student=self.students[0], level=self.level, academic_year="2026"
+        )
+        request = APIRequestFactory().post(
+            "/api/academics/subjects/",
+            {"level": str(self.level.id), "name": "History", "code": "HIS"},
+            format="json",
+        )
+        force_authenticate(request, user=User(username="owner", is_superuser=True))
+
+        response = SubjectViewSet.as_view({"post": "create"})(request)
+
+        self.assertEqual(response.status_code, 201)
+        self.assertIn("History", self.enrolled_subjects(self.students[0]))
+        self.assertEqual(self.enrolled_subjects(self.students[1]), set())
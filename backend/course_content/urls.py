@@ -5,6 +5,7 @@ from .views import (
     SubjectEnrollmentViewSet,
     AssignmentViewSet,
     AssignmentSubmissionViewSet,
+    GradebookView,
 )
 
 router = DefaultRouter()
@@ -16,5 +17,6 @@ router.register(r"assignments", AssignmentViewSet, basename="assignment")
 router.register(r"submissions", AssignmentSubmissionViewSet, basename="submission")
 
 urlpatterns = [
+    path("gradebook/", GradebookView.as_view(), name="gradebook"),
     path("", include(router.urls)),
 ]
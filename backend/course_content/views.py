@@ -1,8 +1,15 @@
+import os
+
 from rest_framework import viewsets, status, permissions
+from rest_framework.views import APIView
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from django.db import transaction
 from django.db.models import Q
+from django.http import Http404
+from django.shortcuts import get_object_or_404
 from django.utils import timezone
+from django.utils.text import slugify
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import SearchFilter, OrderingFilter
 
@@ -18,6 +25,11 @@ from students.models import Student
 from roles.permissions import HasPermission
 
 
+def download_filename(label, field_file):
+    """Readable name for a stored file (blob names are content hashes)."""
+    return f"{slugify(label) or 'file'}{os.path.splitext(field_file.name)[1]}"
+
+
 def can_student_access_content(student, content):
     """
     Check if a student can access specific content based on targeting
@@ -62,7 +74,7 @@ class CourseContentViewSet(viewsets.ModelViewSet):
     ordering = ["-is_pinned", "-created_at"]
 
     def get_permissions(self):
-        if self.action in ["list", "retrieve"]:
+        if self.action in ["list", "retrieve", "download"]:
             return [permissions.IsAuthenticated(), HasPermission("view_course_content")]
         return [permissions.IsAuthenticated(), HasPermission("manage_course_content")]
 
@@ -115,6 +127,31 @@ class CourseContentViewSet(viewsets.ModelViewSet):
             ),
         )
 
+    @action(detail=True, methods=["get"])
+    def download(self, request, pk=None):
+        """
+        Download the content's file. Access follows the same rules as the
+        content list, checked for this one item only; the transfer itself
+        is handed to the web server (see core.sendfile).
+        """
+        from core.sendfile import protected_file_response
+        from profiles.models import Profile
+
+        content = get_object_or_404(CourseContent, pk=pk)
+
+        profile = Profile.objects.filter(user_id=request.user.id).first()
+        if profile and hasattr(profile, "student_record"):
+            if not content.is_published or not can_student_access_content(
+                profile.student_record, content
+            ):
+                raise Http404
+        if not content.file:
+            raise Http404
+
+        return protected_file_response(
+            request, content.file, download_filename(content.title, content.file)
+        )
+
     @action(detail=False, methods=["get"])
     def my_content(self, request):
         """Get content created by the current staff member (excluding assignments)"""
@@ -161,38 +198,34 @@ class SubjectEnrollmentViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=["post"])
     def bulk_enroll(self, request):
         """
-        Enroll multiple students in a subject
+        Enroll students in one or more subjects
         Payload: {
-            "subject_id": "uuid",
-            "student_ids": ["uuid1", "uuid2"],
+            "subject_id": "uuid",  or  "subject_ids": ["uuid", ...],
+            "student_ids": ["uuid1", "uuid2"],  and/or
+            "section_id": "uuid",  / "level_id": "uuid",  (current students)
             "academic_year": "2081"
         }
         """
-        subject_id = request.data.get("subject_id")
-        student_ids = request.data.get("student_ids", [])
-        academic_year = request.data.get("academic_year")
+        from .enrollment import EnrollmentError, bulk_enroll
 
-        if not all([subject_id, student_ids, academic_year]):
-            return Response(
-                {"error": "subject_id, student_ids, and academic_year are required"},
-                status=status.HTTP_400_BAD_REQUEST,
-            )
+        subject_ids = request.data.get("subject_ids") or request.data.get("subject_id")
 
-        created_count = 0
-        for student_id in student_ids:
-            _, created = SubjectEnrollment.objects.get_or_create(
-                student_id=student_id,
-                subject_id=subject_id,
-                academic_year=academic_year,
+        try:
+            result = bulk_enroll(
+                academic_year=request.data.get("academic_year"),
+                subject_ids=subject_ids,
+                student_ids=request.data.get("student_ids"),
+                section_id=request.data.get("section_id"),
+                level_id=request.data.get("level_id"),
             )
-            if created:
-                created_count += 1
+        except EnrollmentError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
         return Response(
             {
-                "message": f"Enrolled {created_count} students",
-                "total_requested": len(student_ids),
-                "newly_enrolled": created_count,
+                "message": f"Enrolled {result['newly_enrolled']} new subject enrollments",
+                "total_requested": result["requested"],
+                **result,
             }
         )
 
@@ -233,11 +266,14 @@ class AssignmentViewSet(viewsets.ModelViewSet):
 
         return queryset
 
+    @transaction.atomic
     def create(self, request, *args, **kwargs):
         """
         Create assignment with content and auto-create pending submissions
         """
-        serializer = CreateAssignmentSerializer(data=request.data)
+        serializer = CreateAssignmentSerializer(
+            data=request.data, context=self.get_serializer_context()
+        )
         serializer.is_valid(raise_exception=True)
 
         from profiles.models import Profile
@@ -266,6 +302,10 @@ class AssignmentViewSet(viewsets.ModelViewSet):
                 else None
             ),
         )
+        if serializer.validated_data.get("upload_id"):
+            from uploads.services import attach_upload
+
+            attach_upload(serializer.validated_data["upload_id"], content.file)
 
         # Set targets
         if serializer.validated_data.get("target_programs"):
@@ -350,8 +390,8 @@ class AssignmentSubmissionViewSet(viewsets.ModelViewSet):
     )
     serializer_class = AssignmentSubmissionSerializer
     filter_backends = [DjangoFilterBackend, OrderingFilter]
-    filterset_fields = ["assignment", "student", "status"]
-    ordering_fields = ["submitted_at", "score"]
+    filterset_fields = ["assignment", "student", "status", "is_late"]
+    ordering_fields = ["submitted_at", "score", "effective_score", "days_late"]
     ordering = ["-submitted_at"]
 
     def get_permissions(self):
@@ -376,6 +416,7 @@ class AssignmentSubmissionViewSet(viewsets.ModelViewSet):
         return queryset
 
     @action(detail=True, methods=["post"])
+    @transaction.atomic
     def submit(self, request, pk=None):
         """
         Submit an assignment
@@ -389,8 +430,23 @@ class AssignmentSubmissionViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_403_FORBIDDEN,
             )
 
-        # Update submission
-        submission.submission_file = request.data.get("submission_file")
+        # Update submission (a finished chunked upload replaces the multipart file)
+        upload_id = request.data.get("upload_id")
+        if upload_id:
+            from uploads.models import UploadSession
+            from uploads.services import attach_upload, get_completed_upload
+
+            upload = get_completed_upload(
+                upload_id, request.user.id, UploadSession.Purpose.SUBMISSION
+            )
+            if not upload:
+                return Response(
+                    {"error": "Upload not found or not complete"},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            attach_upload(upload, submission.submission_file, save=False)
+        else:
+            submission.submission_file = request.data.get("submission_file")
         submission.submission_text = request.data.get("submission_text", "")
         submission.submission_url = request.data.get("submission_url", "")
         submission.submitted_at = timezone.now()
@@ -424,6 +480,13 @@ class AssignmentSubmissionViewSet(viewsets.ModelViewSet):
                 {"error": "Score is required"}, status=status.HTTP_400_BAD_REQUEST
             )
 
+        from .grading import GradingError, clean_score
+
+        try:
+            score = clean_score(score, submission.assignment.total_points)
+        except GradingError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
         submission.score = score
         submission.feedback = feedback
         submission.graded_by = staff_member
@@ -433,3 +496,99 @@ class AssignmentSubmissionViewSet(viewsets.ModelViewSet):
 
         serializer = self.get_serializer(submission)
         return Response(serializer.data)
+
+    @action(detail=True, methods=["get"])
+    def download(self, request, pk=None):
+        """Download the submitted file (students only reach their own)."""
+        from core.sendfile import protected_file_response
+
+        submission = self.get_object()
+        if not submission.submission_file:
+            raise Http404
+
+        return protected_file_response(
+            request,
+            submission.submission_file,
+            download_filename(
+                f"{submission.student.enrollment_id} {submission.assignment.content.title}",
+                submission.submission_file,
+            ),
+        )
+
+    @action(detail=False, methods=["post"])
+    def bulk_grade(self, request):
+        """
+        Grade many submissions at once (all or nothing)
+        Payload: {
+            "grades": [
+                {"id": "submission uuid", "score": 18.5, "feedback": "..."},
+                ...
+            ]
+        }
+        """
+        from profiles.models import Profile
+        from .grading import GradingError, bulk_grade
+
+        # 1. Resolve the grader once for the whole batch
+        profile = (
+            Profile.objects.filter(user_id=request.user.id)
+            .select_related("staff_record")
+            .first()
+        )
+        if not profile or not hasattr(profile, "staff_record"):
+            return Response(
+                {"error": "Staff profile not found"},
+                status=status.HTTP_403_FORBIDDEN,
+            )
+
+        # 2. Validate and write every row in one pass
+        try:
+            graded_ids = bulk_grade(
+                self.get_queryset(), request.data.get("grades"), profile.staff_record
+            )
+        except GradingError as e:
+            return Response(
+                {"error": str(e), "errors": e.errors},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        # 3. Return the updated rows with a single read
+        submissions = self.get_queryset().filter(id__in=graded_ids)
+        serializer = self.get_serializer(submissions, many=True)
+        return Response({"graded": len(graded_ids), "results": serializer.data})
+
+
+class GradebookView(APIView):
+    """
+    Gradebook for a subject and/or section (or explicit assignments):
+    per-student totals, percentages and percentile rank, per-assignment
+    distributions with late penalties applied, and optionally the cached
+    students x assignments matrix (?matrix=true).
+    """
+
+    permission_classes = [permissions.IsAuthenticated, HasPermission("grade_assignment")]
+
+    def get(self, request):
+        from django.core.exceptions import ValidationError
+        from .gradebook import build_gradebook
+
+        subject_id = request.query_params.get("subject")
+        section_id = request.query_params.get("section")
+        assignment_ids = request.query_params.getlist("assignment")
+
+        if not any([subject_id, section_id, assignment_ids]):
+            return Response(
+                {"error": "Provide subject, section or assignment to scope the gradebook"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        try:
+            data = build_gradebook(
+                subject_id=subject_id,
+                section_id=section_id,
+                assignment_ids=assignment_ids,
+                matrix=request.query_params.get("matrix") == "true",
+            )
+        except ValidationError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(data)
@@ -26,8 +26,11 @@ python manage.py migrate_schemas --shared --noinput
 echo "Seeding public tenant..."
 python seed_public.py
 
-echo "Syncing TENANT apps (All Schemas)..."
-python manage.py migrate_schemas --tenant --noinput
+echo "Repairing duplicate current student placements..."
+python manage.py repair_current_levels --fix
+
+echo "Syncing TENANT apps (All Schemas, in parallel)..."
+python manage.py migrate_tenants --workers "${TENANT_MIGRATION_WORKERS:-4}"
 
 # Note: Test data population should be run manually for specific tenants
 # Example: python manage.py populate_test_data --schema=your_tenant_name
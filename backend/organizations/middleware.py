@@ -0,0 +1,13 @@
+from django_tenants.middleware.main import TenantMainMiddleware
+
+from .tenant_cache import resolve_tenant
+
+
+class CachedTenantMiddleware(TenantMainMiddleware):
+    """
+    TenantMainMiddleware that resolves hostname -> tenant through the
+    in-process tenant cache, saving a public-schema query on most requests.
+    """
+
+    def get_tenant(self, domain_model, hostname):
+        return resolve_tenant(hostname)
@@ -1,4 +1,5 @@
 from django.db import models
+from django.db.models.functions import Lower
 from django_tenants.models import TenantMixin, DomainMixin
 import uuid
 
@@ -27,4 +28,8 @@ class Organization(TenantMixin):
 
 
 class Domain(DomainMixin):
-    pass
+    class Meta:
+        indexes = [
+            # Serves case-insensitive lookups via Lower("domain")
+            models.Index(Lower("domain"), name="domain_domain_lower_idx"),
+        ]
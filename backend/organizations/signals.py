@@ -0,0 +1,17 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .models import Organization, Domain
+from .tenant_cache import invalidate_tenant_cache
+from core.versioning import track_model_versions
+
+# InstitutionProfileView also renders the organization's name/phone/email
+track_model_versions(Organization)
+
+
+@receiver(post_save, sender=Organization)
+@receiver(post_delete, sender=Organization)
+@receiver(post_save, sender=Domain)
+@receiver(post_delete, sender=Domain)
+def clear_tenant_cache(sender, **kwargs):
+    invalidate_tenant_cache()
@@ -0,0 +1,83 @@
+"""
+In-process cache for hostname -> tenant resolution.
+
+Every request used to hit the public schema for the Domain/Organization
+lookup before any view code ran. Tenants and domains change rarely, so we
+keep the resolved Organization per hostname for a short TTL and drop the
+cache whenever a Domain or Organization is saved or deleted (see signals.py).
+Hostnames known not to exist are remembered for an even shorter TTL so the
+signup form's availability check does not query on every keystroke.
+"""
+
+import copy
+import threading
+import time
+
+from django.conf import settings
+
+_lock = threading.Lock()
+_entries = {}  # hostname -> (expires_at, tenant)
+_missing = {}  # hostname -> expires_at, for subdomain availability checks
+
+
+def _ttl():
+    return getattr(settings, "TENANT_CACHE_TTL", 60)
+
+
+def _missing_ttl():
+    return getattr(settings, "DOMAIN_CHECK_NEGATIVE_TTL", 10)
+
+
+def get_cached_tenant(hostname):
+    """Returns a copy of the cached tenant for hostname, or None on a miss."""
+    entry = _entries.get(hostname)
+    if entry is None:
+        return None
+
+    expires_at, tenant = entry
+    if expires_at < time.monotonic():
+        with _lock:
+            _entries.pop(hostname, None)
+        return None
+
+    # Callers mutate the tenant (e.g. domain_url), so never hand out the shared one
+    return copy.copy(tenant)
+
+
+def cache_tenant(hostname, tenant):
+    with _lock:
+        _entries[hostname] = (time.monotonic() + _ttl(), copy.copy(tenant))
+
+
+def resolve_tenant(hostname):
+    """
+    Returns the Organization for hostname, using the cache when possible.
+    Raises Domain.DoesNotExist like a plain lookup would.
+    """
+    tenant = get_cached_tenant(hostname)
+    if tenant is not None:
+        return tenant
+
+    from .models import Domain
+
+    domain = Domain.objects.select_related("tenant").get(domain=hostname)
+    cache_tenant(hostname, domain.tenant)
+    return domain.tenant
+
+
+def is_known_missing(hostname):
+    """True if hostname was recently looked up and did not exist."""
+    expires_at = _missing.get(hostname)
+    return expires_at is not None and expires_at >= time.monotonic()
+
+
+def mark_missing(hostname):
+    with _lock:
+        _missing[hostname] = time.monotonic() + _missing_ttl()
+
+
+def invalidate_tenant_cache():
+    """Drops every cached hostname. Domain/Organization writes are rare."""
+    with _lock:
+        _entries.clear()
+        _missing.clear()
@@ -1,3 +1,51 @@
-from django.test import TestCase
+from unittest import mock
 
-# Create your tests here.
+from django.test import SimpleTestCase, override_settings
+
+from organizations import tenant_cache
+from organizations.models import Organization
+
+
+@override_settings(TENANT_CACHE_TTL=60)
+class TenantCacheTest(SimpleTestCase):
+    def setUp(self):
+        tenant_cache.invalidate_tenant_cache()
+        self.tenant = Organization(schema_name="school_a", name="St. Marys Academy")
+
+    def tearDown(self):
+        tenant_cache.invalidate_tenant_cache()
+
+    def test_hit_returns_copy(self):
+        tenant_cache.cache_tenant("marys.localhost", self.tenant)
+
+        cached = tenant_cache.get_cached_tenant("marys.localhost")
+        self.assertEqual(cached.schema_name, "school_a")
+
+        cached.name = "Mutated"
+        self.assertEqual(
+            tenant_cache.get_cached_tenant("marys.localhost").name, "St. Marys Academy"
+        )
+
+    def test_expired_entry_is_a_miss(self):
+        with mock.patch("organizations.tenant_cache.time.monotonic", return_value=0):
+            tenant_cache.cache_tenant("marys.localhost", self.tenant)
+
+        with mock.patch("organizations.tenant_cache.time.monotonic", return_value=61):
+            self.assertIsNone(tenant_cache.get_cached_tenant("marys.localhost"))
+
+    def test_invalidate_clears_entries(self):
+        tenant_cache.cache_tenant("marys.localhost", self.tenant)
+        tenant_cache.mark_missing("oxford.localhost")
+        tenant_cache.invalidate_tenant_cache()
+
+        self.assertIsNone(tenant_cache.get_cached_tenant("marys.localhost"))
+        self.assertFalse(tenant_cache.is_known_missing("oxford.localhost"))
+
+    @override_settings(DOMAIN_CHECK_NEGATIVE_TTL=10)
+    def test_missing_hostname_expires(self):
+        with mock.patch("organizations.tenant_cache.time.monotonic", return_value=0):
+            tenant_cache.mark_missing("oxford.localhost")
+            self.assertTrue(tenant_cache.is_known_missing("oxford.localhost"))
+
+        with mock.patch("organizations.tenant_cache.time.monotonic", return_value=11):
+            self.assertFalse(tenant_cache.is_known_missing("oxford.localhost"))
@@ -2,8 +2,9 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.permissions import AllowAny
-from django.db import models
+from django.db.models.functions import Lower
 from .models import Domain
+from .tenant_cache import get_cached_tenant, cache_tenant, is_known_missing, mark_missing
 
 
 class CheckDomainView(APIView):
@@ -11,6 +12,7 @@ class CheckDomainView(APIView):
 
     def get(self, request):
         domain_name = request.query_params.get("domain")
+
         if not domain_name:
             return Response(
                 {"error": "Domain parameter is required"},
@@ -18,9 +20,26 @@ class CheckDomainView(APIView):
             )
 
         # Check for subdomain.localhost or full domain
-        exists = Domain.objects.filter(
-            models.Q(domain__iexact=domain_name)
-            | models.Q(domain__iexact=f"{domain_name}.localhost")
-        ).exists()
+        candidates = [domain_name.lower(), f"{domain_name}.localhost".lower()]
+
+        # 1. Answer from the tenant cache when possible
+        if any(get_cached_tenant(c) is not None for c in candidates):
+            return Response({"exists": True})
+        if all(is_known_missing(c) for c in candidates):
+            return Response({"exists": False})
+
+        # 2. One lookup for both candidates, served by domain_domain_lower_idx
+        domain = (
+            Domain.objects.annotate(domain_lower=Lower("domain"))
+            .filter(domain_lower__in=candidates)
+            .select_related("tenant")
+            .first()
+        )
+
+        if domain:
+            cache_tenant(domain.domain_lower, domain.tenant)
+        else:
+            for candidate in candidates:
+                mark_missing(candidate)
 
-        return Response({"exists": exists})
+        return Response({"exists": domain is not None})
@@ -0,0 +1,181 @@
+"""
+Fixed-size derivatives for profile photos and institution branding.
+
+Each size is rendered once, when the image is uploaded, as WebP plus a
+JPEG fallback and stored next to the original:
+
+    profiles/photos/jane.png -> profiles/photos/jane.png__thumb.webp
+                                profiles/photos/jane.png__thumb.jpg ...
+
+Names are derived from the full original name (jane.png and jane.jpg
+share a directory), so serializers build every URL without touching the
+database. Rosters and headers then download a few KB instead of the full
+upload; a derivative that was never written (failed render, image older
+than the backfill) is served as the original instead.
+"""
+
+import logging
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from django.db.models.fields.files import FieldFile
+from django.db.models.signals import post_delete, post_init, post_save
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+logger = logging.getLogger(__name__)
+
+# field name -> {size name: (width, height, crop)}; crop=False fits inside the box
+IMAGE_SIZES = {
+    "profile_image": {"thumb": (64, 64, True), "small": (160, 160, True)},
+    "logo": {"thumb": (64, 64, False), "small": (200, 200, False)},
+    "banner": {"small": (640, 200, True), "large": (1600, 500, True)},
+}
+
+# extension -> (Pillow format, save options)
+FORMATS = {
+    "webp": ("WEBP", {"quality": 80, "method": 4}),
+    "jpg": ("JPEG", {"quality": 82, "optimize": True, "progressive": True}),
+}
+
+# Unreadable, truncated or oversized (decompression bomb) uploads
+IMAGE_ERRORS = (UnidentifiedImageError, Image.DecompressionBombError, OSError)
+
+
+def derivative_name(name, size, ext):
+    return f"{name}__{size}.{ext}"
+
+
+def derivative_names(name, field_name):
+    return [
+        derivative_name(name, size, ext)
+        for size in IMAGE_SIZES[field_name]
+        for ext in FORMATS
+    ]
+
+
+def derivative_urls(field_file, field_name, request=None):
+    """
+    {size: {"webp": url, "jpg": url}} for a stored image, or None.
+    Derivatives missing from storage point at the original image.
+    """
+    if not field_file:
+        return None
+    storage = field_file.storage
+    urls = {}
+    for size in IMAGE_SIZES[field_name]:
+        urls[size] = {}
+        for ext in FORMATS:
+            name = derivative_name(field_file.name, size, ext)
+            url = storage.url(name if storage.exists(name) else field_file.name)
+            urls[size][ext] = request.build_absolute_uri(url) if request else url
+    return urls
+
+
+def _render(image, width, height, crop):
+    if crop:
+        return ImageOps.fit(image, (width, height), Image.LANCZOS)
+    resized = image.copy()
+    resized.thumbnail((width, height), Image.LANCZOS)
+    return resized
+
+
+def generate_derivatives(field_file, field_name, force=False):
+    """
+    Writes every size/format for the image. Existing files are kept
+    unless `force`. Returns the number of files written.
+    """
+    storage = field_file.storage
+    targets = {
+        (size, ext): derivative_name(field_file.name, size, ext)
+        for size in IMAGE_SIZES[field_name]
+        for ext in FORMATS
+    }
+    if not force:
+        targets = {key: name for key, name in targets.items() if not storage.exists(name)}
+    if not targets:
+        return 0
+
+    # 1. Decode once (JPEGs straight at reduced scale); honour camera rotation
+    largest = max(max(w, h) for w, h, _ in IMAGE_SIZES[field_name].values())
+    with storage.open(field_file.name, "rb") as source:
+        image = Image.open(source)
+        image.draft("RGB", (largest * 2, largest * 2))
+        image = ImageOps.exif_transpose(image)
+        image.load()
+    has_alpha = image.mode in ("RGBA", "LA") or "transparency" in image.info
+    image = image.convert("RGBA" if has_alpha else "RGB")
+
+    # 2. Render each size once, encode it in every missing format
+    written = 0
+    for size, (width, height, crop) in IMAGE_SIZES[field_name].items():
+        pending = {ext: targets[(size, ext)] for ext in FORMATS if (size, ext) in targets}
+        if not pending:
+            continue
+        rendered = _render(image, width, height, crop)
+        for ext, name in pending.items():
+            pil_format, options = FORMATS[ext]
+            frame = rendered
+            if pil_format == "JPEG" and frame.mode != "RGB":
+                # JPEG has no alpha: flatten onto white
+                background = Image.new("RGB", frame.size, (255, 255, 255))
+                background.paste(frame, mask=frame.getchannel("A"))
+                frame = background
+            buffer = BytesIO()
+            frame.save(buffer, pil_format, **options)
+            if storage.exists(name):
+                storage.delete(name)
+            storage.save(name, ContentFile(buffer.getvalue()))
+            written += 1
+    return written
+
+
+def delete_derivatives(storage, name, field_name):
+    for derivative in derivative_names(name, field_name):
+        storage.delete(derivative)
+
+
+def _image_names(instance, field_names):
+    """Stored name per field; "" for empty fields and not yet saved uploads."""
+    names = {}
+    for field in field_names:
+        value = instance.__dict__.get(field)
+        if isinstance(value, FieldFile):
+            value = value.name if value._committed else ""
+        names[field] = value if isinstance(value, str) else ""
+    return names
+
+
+def track_image_derivatives(model, *field_names):
+    """Generates derivatives on upload and removes them with the original."""
+    uid = f"images:{model._meta.label}"
+
+    def remember(sender, instance, **kwargs):
+        instance._image_names = _image_names(instance, field_names)
+
+    def on_save(sender, instance, **kwargs):
+        before = getattr(instance, "_image_names", {})
+        after = _image_names(instance, field_names)
+        for field in field_names:
+            if after[field] == before.get(field, ""):
+                continue
+            field_file = getattr(instance, field)
+            if before.get(field):
+                delete_derivatives(field_file.storage, before[field], field)
+            if after[field]:
+                try:
+                    generate_derivatives(field_file, field, force=True)
+                except IMAGE_ERRORS:
+                    logger.exception(
+                        "Could not build derivatives for %s.%s %s",
+                        model.__name__, field, instance.pk,
+                    )
+        instance._image_names = after
+
+    def on_delete(sender, instance, **kwargs):
+        for field, name in _image_names(instance, field_names).items():
+            if name:
+                delete_derivatives(getattr(instance, field).storage, name, field)
+
+    post_init.connect(remember, sender=model, weak=False, dispatch_uid=uid)
+    post_save.connect(on_save, sender=model, weak=False, dispatch_uid=uid)
+    post_delete.connect(on_delete, sender=model, weak=False, dispatch_uid=uid)
@@ -0,0 +1,74 @@
+from django.core.management.base import BaseCommand
+from django_tenants.utils import tenant_context
+
+from organizations.models import Organization
+from profiles.images import IMAGE_ERRORS, generate_derivatives
+from profiles.models import InstitutionProfile, Profile
+
+IMAGE_FIELDS = (
+    (Profile, "profile_image"),
+    (InstitutionProfile, "logo"),
+    (InstitutionProfile, "banner"),
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Backfills thumbnail derivatives for profile photos and institution "
+        "logos/banners. Images that already have every size are skipped."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Re-render derivatives that already exist (e.g. after changing sizes).",
+        )
+        parser.add_argument(
+            "--schema",
+            action="append",
+            dest="schemas",
+            help="Only process this schema (can be passed multiple times)",
+        )
+
+    def handle(self, *args, **options):
+        tenants = Organization.objects.exclude(schema_name="public")
+        if options["schemas"]:
+            tenants = tenants.filter(schema_name__in=options["schemas"])
+
+        written = failed = 0
+        self.stdout.write(self.style.MIGRATE_HEADING("--- Thumbnail Backfill ---"))
+
+        for tenant in tenants:
+            tenant_written = 0
+            with tenant_context(tenant):
+                for model, field in IMAGE_FIELDS:
+                    rows = (
+                        model.objects.exclude(**{field: ""})
+                        .exclude(**{f"{field}__isnull": True})
+                        .only("pk", field)
+                    )
+                    for instance in rows.iterator():
+                        try:
+                            tenant_written += generate_derivatives(
+                                getattr(instance, field), field, force=options["force"]
+                            )
+                        except IMAGE_ERRORS as e:
+                            failed += 1
+                            self.stdout.write(
+                                self.style.WARNING(
+                                    f"  {tenant.schema_name}: {model.__name__} "
+                                    f"{instance.pk} {field}: {e}"
+                                )
+                            )
+
+            if tenant_written:
+                self.stdout.write(
+                    f"Tenant: {tenant.name} ({tenant.schema_name}) - "
+                    f"{tenant_written} file(s) written"
+                )
+            written += tenant_written
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Done. {written} file(s) written, {failed} failed.")
+        )
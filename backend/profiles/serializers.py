@@ -1,4 +1,5 @@
 from rest_framework import serializers
+from .images import derivative_urls
 from .models import Profile, InstitutionProfile
 from django.db import connection
 
@@ -6,6 +7,7 @@ from django.db import connection
 class ProfileSerializer(serializers.ModelSerializer):
     email = serializers.EmailField(source="user.email", read_only=True)
     username = serializers.CharField(source="user.username", read_only=True)
+    profile_image_sizes = serializers.SerializerMethodField()
 
     class Meta:
         model = Profile
@@ -25,17 +27,25 @@ class ProfileSerializer(serializers.ModelSerializer):
             "alt_phone",
             "address",
             "profile_image",
+            "profile_image_sizes",
             "created_at",
             "updated_at",
         )
         read_only_fields = ("id", "user_id", "email", "username")
 
+    def get_profile_image_sizes(self, obj):
+        return derivative_urls(
+            obj.profile_image, "profile_image", self.context.get("request")
+        )
+
 
 class InstitutionProfileSerializer(serializers.ModelSerializer):
     # These fields come from the Organization model in the public schema
     name = serializers.CharField(required=False)
     phone = serializers.CharField(required=False, allow_blank=True)
     email = serializers.EmailField(required=False, allow_blank=True)
+    logo_sizes = serializers.SerializerMethodField()
+    banner_sizes = serializers.SerializerMethodField()
 
     class Meta:
         model = InstitutionProfile
@@ -45,7 +55,9 @@ class InstitutionProfileSerializer(serializers.ModelSerializer):
             "phone",
             "email",
             "logo",
+            "logo_sizes",
             "banner",
+            "banner_sizes",
             "tagline",
             "mission",
             "vision",
@@ -59,6 +71,12 @@ class InstitutionProfileSerializer(serializers.ModelSerializer):
         )
         read_only_fields = ("id",)
 
+    def get_logo_sizes(self, obj):
+        return derivative_urls(obj.logo, "logo", self.context.get("request"))
+
+    def get_banner_sizes(self, obj):
+        return derivative_urls(obj.banner, "banner", self.context.get("request"))
+
     def to_representation(self, instance):
         """Add organization data to the output."""
         data = super().to_representation(instance)
@@ -1,9 +1,18 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 from django.db import connection
 from roles.models import UserRole
 from profiles.models import Profile, InstitutionProfile
 from django.apps import apps
+from core.versioning import track_model_versions
+from .images import track_image_derivatives
+
+# Version counters for InstitutionProfileView and the academic tree (names)
+track_model_versions(InstitutionProfile, Profile)
+
+# Thumbnails are rendered when an image is uploaded (see profiles/images.py)
+track_image_derivatives(Profile, "profile_image")
+track_image_derivatives(InstitutionProfile, "logo", "banner")
 
 
 @receiver(post_save, sender=UserRole)
@@ -53,3 +62,11 @@ def create_profile_for_role(sender, instance, created, **kwargs):
                 ),
             },
         )
+
+
+@receiver(post_save, sender=Profile)
+@receiver(post_delete, sender=Profile)
+def invalidate_me_payload(sender, instance, **kwargs):
+    from accounts.utils.me_cache import invalidate_me_for_user
+
+    invalidate_me_for_user(instance.user_id)
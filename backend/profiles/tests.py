@@ -1,3 +1,54 @@
-from django.test import TestCase
+import tempfile
+from io import BytesIO
+from unittest.mock import Mock
 
-# Create your tests here.
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+from django.db.models.fields.files import FieldFile
+from django.test import SimpleTestCase
+from PIL import Image
+
+from .images import derivative_name, derivative_urls, generate_derivatives
+
+
+class ImageDerivativeTest(SimpleTestCase):
+    def setUp(self):
+        self.storage = FileSystemStorage(
+            location=tempfile.mkdtemp(), base_url="/media/"
+        )
+        buffer = BytesIO()
+        Image.new("RGBA", (1200, 800), (200, 30, 30, 128)).save(buffer, "PNG")
+        name = self.storage.save("institution/logos/logo.png", ContentFile(buffer.getvalue()))
+        self.image = FieldFile(None, Mock(storage=self.storage), name)
+
+    def test_generates_every_size_and_format_once(self):
+        self.assertEqual(generate_derivatives(self.image, "logo"), 4)
+        self.assertEqual(generate_derivatives(self.image, "logo"), 0)
+
+        with self.storage.open(derivative_name(self.image.name, "small", "webp")) as f:
+            small = Image.open(f)
+            self.assertEqual(small.format, "WEBP")
+            self.assertEqual(small.size, (200, 133))  # fitted, aspect kept
+        with self.storage.open(derivative_name(self.image.name, "thumb", "jpg")) as f:
+            self.assertEqual(Image.open(f).mode, "RGB")  # alpha flattened
+
+    def test_urls_are_derived_from_the_original_name(self):
+        generate_derivatives(self.image, "logo")
+        urls = derivative_urls(self.image, "logo")
+        self.assertEqual(urls["thumb"]["webp"], "/media/institution/logos/logo.png__thumb.webp")
+        self.assertIsNone(derivative_urls(None, "logo"))
+
+    def test_missing_derivatives_fall_back_to_the_original(self):
+        generate_derivatives(self.image, "logo")
+        self.storage.delete(derivative_name(self.image.name, "small", "jpg"))
+
+        urls = derivative_urls(self.image, "logo")
+
+        self.assertEqual(urls["small"]["jpg"], "/media/institution/logos/logo.png")
+        self.assertEqual(urls["small"]["webp"], "/media/institution/logos/logo.png__small.webp")
+
+    def test_originals_differing_only_in_extension_do_not_collide(self):
+        self.assertNotEqual(
+            derivative_name("profiles/photos/jane.png", "thumb", "webp"),
+            derivative_name("profiles/photos/jane.jpg", "thumb", "webp"),
+        )
@@ -5,6 +5,8 @@ from rest_framework.permissions import IsAuthenticated
 from .models import Profile, InstitutionProfile
 from .serializers import ProfileSerializer, InstitutionProfileSerializer
 from django.db import connection
+from core.mixins import ConditionalGetMixin
+from organizations.models import Organization
 
 
 class MyProfileView(APIView):
@@ -24,8 +26,9 @@ class MyProfileView(APIView):
         profile, created = Profile.objects.get_or_create(
             user_id=request.user.id,
             defaults={
-                "first_name": getattr(request.user, "first_name", "New"),
-                "last_name": getattr(request.user, "last_name", "User"),
+                # Token-backed users return None for unknown attributes
+                "first_name": getattr(request.user, "first_name", None) or "New",
+                "last_name": getattr(request.user, "last_name", None) or "User",
             },
         )
 
@@ -48,7 +51,9 @@ class MyProfileView(APIView):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
-class InstitutionProfileView(APIView):
+class InstitutionProfileView(ConditionalGetMixin, APIView):
+    version_models = (InstitutionProfile, Organization)
+
     def get_permissions(self):
         from roles.permissions import HasPermission
 
@@ -286,4 +286,36 @@ SYSTEM_PERMISSIONS = [
         "module": "Course Content",
         "description": "Enroll students in subjects",
     },
+    # Attendance
+    {
+        "codename": "view_attendance",
+        "name": "View Attendance",
+        "module": "Attendance",
+        "description": "View section and student attendance",
+    },
+    {
+        "codename": "mark_attendance",
+        "name": "Mark Attendance",
+        "module": "Attendance",
+        "description": "Take or correct a section's daily attendance",
+    },
+]
+
+SYSTEM_ROLES = [
+    {
+        "slug": "owner",
+        "name": "Owner",
+        "description": "Instance owner and primary administrator",
+    },
+    {
+        "slug": "staff",
+        "name": "Staff",
+        "description": "Non-teaching administrative staff",
+    },
+    {
+        "slug": "instructor",
+        "name": "Instructor",
+        "description": "Teaching faculty and instructors",
+    },
+    {"slug": "student", "name": "Student", "description": "Enrolled students"},
 ]
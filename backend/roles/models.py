@@ -32,6 +32,20 @@ class Role(models.Model):
         return self.name
 
 
+class SeedState(models.Model):
+    """
+    Checksum of the definitions in roles.constants last seeded into this schema.
+    Lets post_migrate skip seeding entirely when nothing has changed.
+    """
+
+    key = models.CharField(max_length=50, unique=True)
+    checksum = models.CharField(max_length=64)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.key}: {self.checksum[:12]}"
+
+
 class UserRole(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
 
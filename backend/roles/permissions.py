@@ -44,7 +44,7 @@ class HasPermission(permissions.BasePermission):
         # Get all roles for this user in this tenant
         # UserRole is now in the tenant schema, so we don't need to filter by organization
         # The connection.tenant is already active
-        user_roles = UserRole.objects.filter(user=user).select_related("role")
+        user_roles = UserRole.objects.filter(user_id=user.id).select_related("role")
 
         if not user_roles.exists():
             return False
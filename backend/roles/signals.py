@@ -1,69 +1,149 @@
-from django.db.models.signals import post_migrate
+from django.db.models.signals import post_migrate, post_save, post_delete, m2m_changed
 from django.dispatch import receiver
+import hashlib
+import json
+import logging
+import time
+
+from core.versioning import bump_model_version, track_model_versions
+from .models import Role, Permission, UserRole
+
+logger = logging.getLogger(__name__)
+
+# ETag counters for RoleViewSet / PermissionListView
+track_model_versions(Role, Permission, UserRole)
+
+SEED_STATE_KEY = "system_roles"
+
+
+def get_constants_checksum():
+    """Stable hash of everything seed_roles writes, taken from roles.constants."""
+    from .constants import SYSTEM_PERMISSIONS, SYSTEM_ROLES
+
+    payload = json.dumps(
+        {"permissions": SYSTEM_PERMISSIONS, "roles": SYSTEM_ROLES}, sort_keys=True
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
 
 
 @receiver(post_migrate)
 def seed_roles(sender, **kwargs):
     if sender.name == "roles":
-        from django.db import connection
-        from .models import Role, Permission
-        from .constants import SYSTEM_PERMISSIONS
+        from django.db import connection, transaction
+        from .models import Role, Permission, SeedState
+        from .constants import SYSTEM_PERMISSIONS, SYSTEM_ROLES
 
         # IMPORTANT: Only seed roles in TENANT schemas, not in public schema
         # This prevents errors when roles app is in TENANT_APPS
         if connection.schema_name == "public":
-            print(
-                "[ROLES] Skipping role seeding in public schema (roles are tenant-specific)"
+            logger.debug(
+                "Skipping role seeding in public schema (roles are tenant-specific)"
             )
             return
 
-        print(
-            f"[ROLES] Seeding roles and permissions for schema: {connection.schema_name}"
-        )
+        started = time.monotonic()
+        checksum = get_constants_checksum()
 
-        # 1. Seed Permissions
-        created_permissions = []
-        for perm_data in SYSTEM_PERMISSIONS:
-            permission, _ = Permission.objects.update_or_create(
-                codename=perm_data["codename"],
-                defaults={
-                    "name": perm_data["name"],
-                    "module": perm_data["module"],
-                    "description": perm_data["description"],
-                },
-            )
-            created_permissions.append(permission)
-
-        # 2. Seed System Roles
-        roles = [
-            {
-                "slug": "owner",
-                "name": "Owner",
-                "description": "Instance owner and primary administrator",
-            },
-            {
-                "slug": "staff",
-                "name": "Staff",
-                "description": "Non-teaching administrative staff",
-            },
-            {
-                "slug": "instructor",
-                "name": "Instructor",
-                "description": "Teaching faculty and instructors",
-            },
-            {"slug": "student", "name": "Student", "description": "Enrolled students"},
-        ]
-
-        for role_data in roles:
-            role, created = Role.objects.update_or_create(
-                slug=role_data["slug"],
-                defaults={
-                    "name": role_data["name"],
-                    "description": role_data["description"],
-                    "is_system_role": True,
-                },
+        # 0. Nothing to do if this schema was seeded from the same constants
+        if SeedState.objects.filter(key=SEED_STATE_KEY, checksum=checksum).exists():
+            logger.debug(
+                "Roles already seeded for schema %s, skipping", connection.schema_name
             )
+            return
+
+        with transaction.atomic():
+            # 1. Seed Permissions (one read, then bulk writes for the diff)
+            perm_fields = ["name", "module", "description"]
+            existing = {
+                p.codename: p
+                for p in Permission.objects.filter(
+                    codename__in=[p["codename"] for p in SYSTEM_PERMISSIONS]
+                )
+            }
+            to_create, to_update, system_permissions = [], [], []
+            for perm_data in SYSTEM_PERMISSIONS:
+                permission = existing.get(perm_data["codename"])
+                if permission is None:
+                    permission = Permission(**perm_data)
+                    to_create.append(permission)
+                elif any(getattr(permission, f) != perm_data[f] for f in perm_fields):
+                    for f in perm_fields:
+                        setattr(permission, f, perm_data[f])
+                    to_update.append(permission)
+                system_permissions.append(permission)
+
+            Permission.objects.bulk_create(to_create)
+            Permission.objects.bulk_update(to_update, perm_fields)
+
+            # 2. Seed System Roles
+            role_fields = ["name", "description", "is_system_role"]
+            existing_roles = {
+                r.slug: r
+                for r in Role.objects.filter(slug__in=[r["slug"] for r in SYSTEM_ROLES])
+            }
+            roles_to_create, roles_to_update = [], []
+            for role_data in SYSTEM_ROLES:
+                role = existing_roles.get(role_data["slug"])
+                if role is None:
+                    role = Role(**role_data, is_system_role=True)
+                    roles_to_create.append(role)
+                    existing_roles[role.slug] = role
+                elif (
+                    role.name != role_data["name"]
+                    or role.description != role_data["description"]
+                    or not role.is_system_role
+                ):
+                    role.name = role_data["name"]
+                    role.description = role_data["description"]
+                    role.is_system_role = True
+                    roles_to_update.append(role)
+
+            Role.objects.bulk_create(roles_to_create)
+            Role.objects.bulk_update(roles_to_update, role_fields)
 
             # 3. Assign All Permissions to Owner
-            if role.slug == "owner":
-                role.permissions.set(created_permissions)
+            existing_roles["owner"].permissions.set(system_permissions)
+
+            SeedState.objects.update_or_create(
+                key=SEED_STATE_KEY, defaults={"checksum": checksum}
+            )
+
+        # Bulk writes skip model signals, so refresh cached /me payloads here
+        from accounts.utils.me_cache import invalidate_me_for_tenant
+
+        invalidate_me_for_tenant()
+        bump_model_version(Role, Permission)
+
+        logger.info(
+            "Seeded roles for schema %s in %.1fms "
+            "(permissions: %d created, %d updated; roles: %d created, %d updated)",
+            connection.schema_name,
+            (time.monotonic() - started) * 1000,
+            len(to_create),
+            len(to_update),
+            len(roles_to_create),
+            len(roles_to_update),
+        )
+
+
+@receiver(post_save, sender=Role)
+@receiver(post_delete, sender=Role)
+@receiver(post_save, sender=Permission)
+@receiver(post_delete, sender=Permission)
+@receiver(m2m_changed, sender=Role.permissions.through)
+def invalidate_rbac_payloads(sender, **kwargs):
+    """Role/permission edits can change any member's /me payload."""
+    if kwargs.get("action", "").startswith("pre_"):
+        return
+
+    from accounts.utils.me_cache import invalidate_me_for_tenant
+
+    invalidate_me_for_tenant()
+
+
+@receiver(post_save, sender=UserRole)
+@receiver(post_delete, sender=UserRole)
+def invalidate_user_role_payload(sender, instance, **kwargs):
+    from accounts.utils.me_cache import invalidate_me_for_user
+
+    invalidate_me_for_user(instance.user_id)
@@ -3,12 +3,14 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from django.db.models import Count, Q
 from django.utils.text import slugify
-from .models import Role, Permission
+from .models import Role, Permission, UserRole
 from .serializers import RoleSerializer, PermissionSerializer
 from .permissions import HasPermission
+from core.mixins import ConditionalGetMixin
 
 
-class RoleViewSet(viewsets.ModelViewSet):
+class RoleViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
+    version_models = (Role, Permission, UserRole)
     serializer_class = RoleSerializer
 
     def get_permissions(self):
@@ -67,7 +69,8 @@ class RoleViewSet(viewsets.ModelViewSet):
         role.delete()
 
 
-class PermissionListView(generics.ListAPIView):
+class PermissionListView(ConditionalGetMixin, generics.ListAPIView):
+    version_models = (Permission,)
     permission_classes = [IsAuthenticated, HasPermission("view_role")]
     serializer_class = PermissionSerializer
     queryset = Permission.objects.all().order_by("module", "name")
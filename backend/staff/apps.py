@@ -3,3 +3,10 @@ from django.apps import AppConfig
 
 class StaffConfig(AppConfig):
     name = 'staff'
+
+    def ready(self):
+        from core.versioning import track_model_versions
+        from .models import Instructor
+
+        # Instructors appear in the cached academic tree
+        track_model_versions(Instructor)
@@ -3,3 +3,10 @@ from django.apps import AppConfig
 
 class StudentsConfig(AppConfig):
     name = 'students'
+
+    def ready(self):
+        from core.versioning import track_model_versions
+        from .models import Student, StudentLevel
+
+        # Version counters for the cached section occupancy report
+        track_model_versions(Student, StudentLevel)
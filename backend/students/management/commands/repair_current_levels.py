@@ -0,0 +1,81 @@
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.db.models import F, Window
+from django.db.models.functions import RowNumber
+from django_tenants.utils import tenant_context
+
+from organizations.models import Organization
+from students.models import StudentLevel
+
+
+def find_duplicate_current_levels():
+    """
+    Ids of every current StudentLevel except the newest one per student
+    (latest academic_year, then highest id). One query.
+    """
+    ranked = StudentLevel.objects.filter(is_current=True).annotate(
+        rank=Window(
+            RowNumber(),
+            partition_by=[F("student_id")],
+            order_by=[F("academic_year").desc(), F("id").desc()],
+        )
+    )
+    return list(ranked.filter(rank__gt=1).values_list("id", flat=True))
+
+
+class Command(BaseCommand):
+    help = (
+        "Finds students with more than one current StudentLevel and keeps only "
+        "the newest. Must be clean before the one-current-placement index is migrated."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--fix",
+            action="store_true",
+            help="Mark the older duplicates as not current.",
+        )
+        parser.add_argument(
+            "--schema",
+            action="append",
+            dest="schemas",
+            help="Only check this schema (can be passed multiple times)",
+        )
+
+    def handle(self, *args, **options):
+        tenants = Organization.objects.exclude(schema_name="public")
+        if options["schemas"]:
+            tenants = tenants.filter(schema_name__in=options["schemas"])
+
+        total = 0
+        self.stdout.write(self.style.MIGRATE_HEADING("--- Current Placement Audit ---"))
+
+        for tenant in tenants:
+            with tenant_context(tenant):
+                # Fresh schemas are migrated later; nothing to repair yet
+                table = StudentLevel._meta.db_table
+                if table not in connection.introspection.table_names():
+                    continue
+
+                duplicate_ids = find_duplicate_current_levels()
+                if not duplicate_ids:
+                    continue
+
+                total += len(duplicate_ids)
+                self.stdout.write(
+                    self.style.WARNING(
+                        f"Tenant: {tenant.name} ({tenant.schema_name}) - "
+                        f"{len(duplicate_ids)} extra current placement(s)"
+                    )
+                )
+
+                if options["fix"]:
+                    fixed = StudentLevel.objects.filter(id__in=duplicate_ids).update(
+                        is_current=False
+                    )
+                    self.stdout.write(self.style.SUCCESS(f"  - Repaired {fixed} rows."))
+
+        if total == 0:
+            self.stdout.write(self.style.SUCCESS("Every student has at most one current placement."))
+        elif not options["fix"]:
+            self.stdout.write("Run again with --fix to repair.")
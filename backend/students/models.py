@@ -85,3 +85,20 @@ class StudentLevel(models.Model):
 
     class Meta:
         unique_together = ("student", "academic_year")
+        constraints = [
+            # Run `repair_current_levels --fix` before migrating existing data
+            models.UniqueConstraint(
+                fields=["student"],
+                condition=models.Q(is_current=True),
+                name="stdlevel_one_current_uniq",
+            ),
+        ]
+        indexes = [
+            # Rosters / occupancy: current students of a level or section
+            models.Index(
+                fields=["level", "section"],
+                condition=models.Q(is_current=True),
+                include=["student"],
+                name="stdlevel_current_roster_idx",
+            ),
+        ]
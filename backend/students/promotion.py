@@ -0,0 +1,165 @@
+"""
+Year-end promotion engine.
+
+Moves every current placement of `from_year` into `to_year`:
+  - promote:  next AcademicLevel of the same program (by `order`), keeping
+              the section with the same name when the next level has one
+  - retain:   same level and section again
+  - graduate: no new placement, Student.status -> "graduated"
+Students in the last level of their program graduate by default; any
+student can be overridden individually.
+
+build_promotion_plan() only reads (use it for a dry-run preview);
+execute_promotion() applies a plan with a handful of set-based statements
+regardless of how many students or levels are involved.
+"""
+
+from collections import Counter, defaultdict
+
+from django.db import transaction
+
+from academics.models import AcademicLevel, Section
+from core.versioning import bump_model_version
+from .models import Student, StudentLevel
+
+ACTIONS = ("promote", "retain", "graduate")
+
+
+class PromotionError(ValueError):
+    pass
+
+
+def get_successor_levels():
+    """{level_id: next level_id in the same program, or None for the last one}"""
+    successors, previous = {}, None
+    for level in AcademicLevel.objects.order_by("program_id", "order", "name"):
+        if previous is not None:
+            successors[previous.id] = (
+                level.id if level.program_id == previous.program_id else None
+            )
+        previous = level
+    if previous is not None:
+        successors[previous.id] = None
+    return successors
+
+
+def build_promotion_plan(
+    from_year, to_year, level_ids=None, section_ids=None, overrides=None
+):
+    if not from_year or not to_year or str(from_year) == str(to_year):
+        raise PromotionError("from_year and to_year are required and must differ")
+
+    overrides = {str(k): v for k, v in (overrides or {}).items()}
+    invalid = {v for v in overrides.values() if v not in ACTIONS}
+    if invalid:
+        raise PromotionError(f"Unknown override action(s): {', '.join(sorted(invalid))}")
+
+    # 1. Structure: successors and sections by (level, name)
+    successors = get_successor_levels()
+    sections_by_name = {
+        (s.level_id, s.name): s.id for s in Section.objects.only("id", "level_id", "name")
+    }
+    section_names = {sid: name for (_, name), sid in sections_by_name.items()}
+
+    # 2. Current placements to move
+    placements = StudentLevel.objects.filter(
+        is_current=True, academic_year=from_year, student__status="active"
+    )
+    if level_ids:
+        placements = placements.filter(level_id__in=level_ids)
+    if section_ids:
+        placements = placements.filter(section_id__in=section_ids)
+    placements = list(placements.values("id", "student_id", "level_id", "section_id"))
+
+    # 3. Students that already have a placement in the target year
+    already_placed = set(
+        StudentLevel.objects.filter(
+            academic_year=to_year,
+            student_id__in=[p["student_id"] for p in placements],
+        ).values_list("student_id", flat=True)
+    )
+
+    rows = []
+    for p in placements:
+        if p["student_id"] in already_placed:
+            action, level_id, section_id = "skip", None, None
+        else:
+            default = "promote" if successors.get(p["level_id"]) else "graduate"
+            action = overrides.get(str(p["student_id"]), default)
+            if action == "promote" and not successors.get(p["level_id"]):
+                action = "graduate"
+
+            level_id = section_id = None
+            if action == "promote":
+                level_id = successors[p["level_id"]]
+                section_id = sections_by_name.get(
+                    (level_id, section_names.get(p["section_id"]))
+                )
+            elif action == "retain":
+                level_id, section_id = p["level_id"], p["section_id"]
+
+        rows.append(
+            {
+                "placement_id": p["id"],
+                "student_id": p["student_id"],
+                "from_level_id": p["level_id"],
+                "from_section_id": p["section_id"],
+                "action": action,
+                "to_level_id": level_id,
+                "to_section_id": section_id,
+            }
+        )
+
+    per_level = defaultdict(Counter)
+    for row in rows:
+        per_level[str(row["from_level_id"])][row["action"]] += 1
+
+    return {
+        "from_year": str(from_year),
+        "to_year": str(to_year),
+        "summary": dict(Counter(row["action"] for row in rows)),
+        "levels": {level: dict(counts) for level, counts in per_level.items()},
+        "rows": rows,
+    }
+
+
+@transaction.atomic
+def execute_promotion(plan):
+    """Applies a plan from build_promotion_plan(). Returns the plan's summary."""
+    from course_content.enrollment import enroll_compulsory_subjects
+
+    rows = [row for row in plan["rows"] if row["action"] != "skip"]
+    if not rows:
+        return plan["summary"]
+
+    # 1. Close every moved placement in one statement
+    StudentLevel.objects.filter(
+        id__in=[row["placement_id"] for row in rows], is_current=True
+    ).update(is_current=False)
+
+    # 2. Next-year placements for promoted and retained students
+    new_placements = StudentLevel.objects.bulk_create(
+        [
+            StudentLevel(
+                student_id=row["student_id"],
+                level_id=row["to_level_id"],
+                section_id=row["to_section_id"],
+                academic_year=plan["to_year"],
+                is_current=True,
+            )
+            for row in rows
+            if row["action"] in ("promote", "retain")
+        ],
+        batch_size=1000,
+    )
+
+    # 3. Graduates
+    graduates = [row["student_id"] for row in rows if row["action"] == "graduate"]
+    if graduates:
+        Student.objects.filter(id__in=graduates).update(status="graduated")
+
+    # 4. Compulsory subjects of the new levels, then refresh cached reports
+    enroll_compulsory_subjects(new_placements)
+    bump_model_version(Student, StudentLevel)
+
+    return plan["summary"]
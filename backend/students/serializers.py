@@ -1,5 +1,6 @@
 from rest_framework import serializers
 from .models import Student, AcademicHistory, StudentLevel
+from .promotion import ACTIONS
 from profiles.models import Profile
 from families.models import Parent, StudentParentRelation
 from django.db import transaction
@@ -11,6 +12,7 @@ User = apps.get_model("accounts", "User")
 
 
 from academics.models import AcademicLevel, Section
+from course_content.enrollment import enroll_compulsory_subjects
 
 
 class StudentEnrollmentSerializer(serializers.Serializer):
@@ -97,13 +99,14 @@ class StudentEnrollmentSerializer(serializers.Serializer):
         level = AcademicLevel.objects.get(id=level_id)
         section = Section.objects.get(id=section_id) if section_id else None
 
-        StudentLevel.objects.create(
+        placement = StudentLevel.objects.create(
             student=student,
             level=level,
             section=section,
             academic_year=validated_data["academic_year"],
             is_current=True,
         )
+        enroll_compulsory_subjects([placement])
 
         # 6. Handle Parents
         for p_data in parents_data:
@@ -170,6 +173,7 @@ class StudentEnrollmentSerializer(serializers.Serializer):
                     "academic_year", current_level.academic_year
                 )
                 current_level.save()
+                enroll_compulsory_subjects([current_level])
             else:
                 # Fallback if no current level exists
                 level = (
@@ -180,13 +184,14 @@ class StudentEnrollmentSerializer(serializers.Serializer):
                 )
 
                 if level:
-                    StudentLevel.objects.create(
+                    placement = StudentLevel.objects.create(
                         student=instance,
                         level=level,
                         section=section,
                         academic_year=validated_data.get("academic_year", ""),
                         is_current=True,
                     )
+                    enroll_compulsory_subjects([placement])
 
         # 4. Handle Parents - TODO: Complex Nested Update
         # For now, we skip updating parents via this endpoint to avoid complexity
@@ -292,3 +297,20 @@ class BulkAccountCreationSerializer(serializers.Serializer):
         profile.save()
 
         return user
+
+
+class PromotionSerializer(serializers.Serializer):
+    from_year = serializers.CharField(max_length=20)
+    to_year = serializers.CharField(max_length=20)
+    level_ids = serializers.ListField(child=serializers.UUIDField(), required=False)
+    section_ids = serializers.ListField(child=serializers.UUIDField(), required=False)
+    overrides = serializers.DictField(
+        child=serializers.ChoiceField(choices=ACTIONS),
+        required=False,
+    )
+    dry_run = serializers.BooleanField(default=True)
+
+    def validate(self, data):
+        if data["from_year"] == data["to_year"]:
+            raise serializers.ValidationError("from_year and to_year must differ")
+        return data
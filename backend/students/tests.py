@@ -1,3 +1,91 @@
-from django.test import TestCase
+from django_tenants.test.cases import TenantTestCase
+from rest_framework.test import APIRequestFactory, force_authenticate
 
-# Create your tests here.
+from academics.models import AcademicLevel, Program, Section
+from accounts.models import User
+from profiles.models import Profile
+from .models import Student, StudentLevel
+from .promotion import build_promotion_plan, execute_promotion
+from .views import PromotionView
+
+
+class PromotionTest(TenantTestCase):
+    def setUp(self):
+        program = Program.objects.create(name="High School", code="HS")
+        self.grade9 = AcademicLevel.objects.create(program=program, name="Grade 9", order=1)
+        self.grade10 = AcademicLevel.objects.create(program=program, name="Grade 10", order=2)
+        self.section9 = Section.objects.create(level=self.grade9, name="A")
+        self.section10 = Section.objects.create(level=self.grade10, name="A")
+
+        self.asha = self.place("S-1", self.grade9, self.section9)
+        self.bikash = self.place("S-2", self.grade9, self.section9)
+        self.chandra = self.place("S-3", self.grade10, self.section10)
+
+    def place(self, enrollment_id, level, section):
+        student = Student.objects.create(
+            profile=Profile.objects.create(first_name=enrollment_id, last_name="Test"),
+            enrollment_id=enrollment_id,
+        )
+        StudentLevel.objects.create(
+            student=student, level=level, section=section, academic_year="2081"
+        )
+        return student
+
+    def placements(self):
+        return sorted(
+            StudentLevel.objects.values_list(
+                "student__enrollment_id", "academic_year", "level_id", "section_id", "is_current"
+            )
+        )
+
+    def test_dry_run_writes_nothing(self):
+        before = self.placements()
+        request = APIRequestFactory().post(
+            "/api/students/promotion/", {"from_year": "2081", "to_year": "2082"}, format="json"
+        )
+        force_authenticate(request, user=User(username="owner", is_superuser=True))
+
+        response = PromotionView.as_view()(request)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.data["dry_run"])
+        self.assertEqual(response.data["summary"], {"promote": 2, "graduate": 1})
+        self.assertEqual(self.placements(), before)
+        self.assertFalse(Student.objects.filter(status="graduated").exists())
+
+    def test_malformed_overrides_are_a_bad_request(self):
+        request = APIRequestFactory().post(
+            "/api/students/promotion/",
+            {"from_year": "2081", "to_year": "2082", "overrides": ["retain"]},
+            format="json",
+        )
+        force_authenticate(request, user=User(username="owner", is_superuser=True))
+
+        response = PromotionView.as_view()(request)
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("overrides", response.data)
+
+    def test_last_level_graduates_even_when_promotion_is_requested(self):
+        plan = build_promotion_plan(
+            "2081", "2082", overrides={self.chandra.id: "promote"}
+        )
+        execute_promotion(plan)
+
+        self.chandra.refresh_from_db()
+        self.assertEqual(self.chandra.status, "graduated")
+        self.assertFalse(self.chandra.enrollments.filter(is_current=True).exists())
+        promoted = StudentLevel.objects.get(student=self.asha, is_current=True)
+        self.assertEqual((promoted.level, promoted.section), (self.grade10, self.section10))
+
+    def test_retained_student_repeats_level_and_section(self):
+        execute_promotion(
+            build_promotion_plan("2081", "2082", overrides={self.bikash.id: "retain"})
+        )
+
+        current = StudentLevel.objects.get(student=self.bikash, is_current=True)
+        self.assertEqual(
+            (current.academic_year, current.level, current.section),
+            ("2082", self.grade9, self.section9),
+        )
+        self.assertEqual(self.bikash.enrollments.count(), 2)
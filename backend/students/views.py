@@ -298,3 +298,40 @@ class StudentDetailView(APIView):
                     pass
 
         return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class PromotionView(APIView):
+    """
+    Year-end promotion of current placements into the next academic year.
+    Payload: {
+        "from_year": "2081",
+        "to_year": "2082",
+        "level_ids": [...], "section_ids": [...],   (optional scope)
+        "overrides": {"<student_id>": "retain" | "graduate" | "promote"},
+        "dry_run": true   (default: preview only)
+    }
+    """
+
+    permission_classes = [IsAuthenticated, HasPermission("change_student")]
+
+    def post(self, request):
+        from django.core.exceptions import ValidationError
+        from .promotion import PromotionError, build_promotion_plan, execute_promotion
+        from .serializers import PromotionSerializer
+
+        serializer = PromotionSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        data = serializer.validated_data
+        dry_run = data.pop("dry_run")
+
+        try:
+            with transaction.atomic():
+                plan = build_promotion_plan(**data)
+                if not dry_run:
+                    execute_promotion(plan)
+        except (PromotionError, ValidationError) as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        plan["dry_run"] = dry_run
+        return Response(plan)
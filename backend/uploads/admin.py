@@ -0,0 +1,18 @@
+from django.contrib import admin
+from students.admin import TenantOnlyAdmin
+from .models import UploadSession
+
+
+@admin.register(UploadSession)
+class UploadSessionAdmin(TenantOnlyAdmin):
+    list_display = (
+        "filename",
+        "purpose",
+        "status",
+        "received_bytes",
+        "total_size",
+        "expires_at",
+    )
+    list_filter = ("purpose", "status")
+    search_fields = ("filename", "sha256")
+    readonly_fields = ("created_at", "updated_at")
@@ -0,0 +1,158 @@
+"""
+Reference counting and garbage collection for content-addressed blobs.
+
+Models register their FileFields with track_blob_references(); receivers
+then adjust Blob.ref_count as field values are set, replaced or deleted.
+Counts are a fast path only: collect_garbage() recounts the registered
+fields before deleting anything, so drift from bulk writes or crashes
+can never remove a file that is still referenced.
+"""
+
+import os
+from collections import Counter
+from datetime import timedelta
+
+from django.db import connection, transaction
+from django.db.models import Count, F
+from django.db.models.signals import post_delete, post_init, post_save
+from django.utils import timezone
+
+from .models import Blob
+from .storage import BLOB_PREFIX, blob_storage
+
+# (model, field name) pairs whose values point at blobs
+BLOB_FIELDS = []
+
+
+def _blob_names(instance, field_names):
+    """Current blob name per field; FieldFile once accessed, str straight from the DB."""
+    names = {}
+    for field in field_names:
+        value = instance.__dict__.get(field)
+        name = getattr(value, "name", value)
+        if isinstance(name, str) and name.startswith(BLOB_PREFIX):
+            names[field] = name
+    return names
+
+
+def adjust_ref_counts(deltas):
+    """deltas: {blob name: +n / -n}. One UPDATE per distinct delta."""
+    by_delta = {}
+    for name, delta in deltas.items():
+        if delta:
+            by_delta.setdefault(delta, []).append(name)
+    for delta, names in by_delta.items():
+        Blob.objects.filter(name__in=names).update(ref_count=F("ref_count") + delta)
+
+
+def track_blob_references(model, *field_names):
+    """Keeps Blob.ref_count in step with `model`'s FileFields."""
+    BLOB_FIELDS.extend((model, field) for field in field_names)
+    uid = f"blobs:{model._meta.label}"
+
+    def remember(sender, instance, **kwargs):
+        instance._blob_names = _blob_names(instance, field_names)
+
+    def on_save(sender, instance, **kwargs):
+        before = getattr(instance, "_blob_names", {})
+        after = _blob_names(instance, field_names)
+        deltas = Counter(after.values())
+        deltas.subtract(before.values())
+        adjust_ref_counts(deltas)
+        instance._blob_names = after
+
+    def on_delete(sender, instance, **kwargs):
+        adjust_ref_counts({name: -1 for name in _blob_names(instance, field_names).values()})
+
+    post_init.connect(remember, sender=model, weak=False, dispatch_uid=uid)
+    post_save.connect(on_save, sender=model, weak=False, dispatch_uid=uid)
+    post_delete.connect(on_delete, sender=model, weak=False, dispatch_uid=uid)
+
+
+def count_references():
+    """Actual references per blob name across every registered field."""
+    counts = Counter()
+    for model, field in BLOB_FIELDS:
+        rows = (
+            model._default_manager.filter(**{f"{field}__startswith": BLOB_PREFIX})
+            .values(field)
+            .annotate(refs=Count("pk"))
+        )
+        counts.update({row[field]: row["refs"] for row in rows})
+    return counts
+
+
+def _delete_blob(blob_id, cutoff):
+    """
+    Deletes one blob unless an upload reused it meanwhile. The row lock
+    makes a concurrent ContentAddressedStorage._save wait and re-create it.
+    """
+    with transaction.atomic():
+        blob = (
+            Blob.objects.select_for_update()
+            .filter(id=blob_id, last_stored_at__lt=cutoff)
+            .first()
+        )
+        if blob is None or references_to(blob.name):
+            return False
+        blob_storage.purge(blob.name)
+        blob.delete()
+    return True
+
+
+def references_to(name):
+    return any(
+        model._default_manager.filter(**{field: name}).exists()
+        for model, field in BLOB_FIELDS
+    )
+
+
+def collect_garbage(grace_hours=24, dry_run=False):
+    """
+    Recounts references, fixes drifted ref_counts, then deletes blobs
+    (and stray files from interrupted writes) unreferenced for longer
+    than `grace_hours`. Returns a summary dict.
+    """
+    cutoff = timezone.now() - timedelta(hours=grace_hours)
+    references = count_references()
+
+    # 1. Reconcile stored counts with reality; collect expired orphans
+    known, drifted, orphans = set(), [], []
+    blobs = Blob.objects.only("id", "name", "size", "ref_count", "last_stored_at")
+    for blob in blobs.iterator():
+        known.add(blob.name)
+        actual = references.get(blob.name, 0)
+        if actual == 0 and blob.last_stored_at < cutoff:
+            # Fresh blobs may be mid-attach, so they get the grace period
+            orphans.append(blob)
+        elif blob.ref_count != actual:
+            blob.ref_count = actual
+            drifted.append(blob)
+
+    # 2. Unreferenced files under this tenant's prefix with no Blob row
+    #    (interrupted writes)
+    stray = []
+    root = blob_storage.path(f"{BLOB_PREFIX}{connection.schema_name}")
+    for directory, _, files in os.walk(root):
+        for filename in files:
+            path = os.path.join(directory, filename)
+            name = os.path.relpath(path, blob_storage.location).replace(os.sep, "/")
+            if name in known or name in references:
+                continue
+            if os.path.getmtime(path) < cutoff.timestamp():
+                stray.append(name)
+
+    if dry_run:
+        deleted = orphans
+    else:
+        Blob.objects.bulk_update(drifted, ["ref_count"], batch_size=500)
+        deleted = [blob for blob in orphans if _delete_blob(blob.id, cutoff)]
+        for name in stray:
+            blob_storage.purge(name)
+
+    return {
+        "drifted": len(drifted),
+        "deleted": len(deleted),
+        "freed_bytes": sum(blob.size for blob in deleted),
+        "stray_files": len(stray),
+    }
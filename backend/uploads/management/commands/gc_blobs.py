@@ -0,0 +1,61 @@
+from django.core.management.base import BaseCommand
+from django_tenants.utils import tenant_context
+
+from organizations.models import Organization
+from uploads.blobs import collect_garbage
+
+
+class Command(BaseCommand):
+    help = (
+        "Deletes content-addressed blobs that no file field references any "
+        "more, after recounting references and repairing drifted ref counts."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--grace-hours",
+            type=int,
+            default=24,
+            help="Keep unreferenced blobs stored more recently than this",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report what would be deleted without deleting it.",
+        )
+        parser.add_argument(
+            "--schema",
+            action="append",
+            dest="schemas",
+            help="Only collect this schema (can be passed multiple times)",
+        )
+
+    def handle(self, *args, **options):
+        tenants = Organization.objects.exclude(schema_name="public")
+        if options["schemas"]:
+            tenants = tenants.filter(schema_name__in=options["schemas"])
+
+        verb = "Would delete" if options["dry_run"] else "Deleted"
+        deleted = freed = 0
+        self.stdout.write(self.style.MIGRATE_HEADING("--- Blob Garbage Collection ---"))
+
+        for tenant in tenants:
+            with tenant_context(tenant):
+                result = collect_garbage(options["grace_hours"], options["dry_run"])
+
+            if any(result.values()):
+                self.stdout.write(
+                    f"Tenant: {tenant.name} ({tenant.schema_name}) - "
+                    f"{verb.lower()} {result['deleted']} blob(s) "
+                    f"({result['freed_bytes'] / (1024 * 1024):.1f}MB), "
+                    f"{result['stray_files']} stray file(s); "
+                    f"{result['drifted']} ref count(s) repaired"
+                )
+            deleted += result["deleted"]
+            freed += result["freed_bytes"]
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{verb} {deleted} blob(s), {freed / (1024 * 1024):.1f}MB in total."
+            )
+        )
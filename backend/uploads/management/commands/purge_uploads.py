@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand
+from django_tenants.utils import tenant_context
+
+from organizations.models import Organization
+from uploads.services import purge_expired_uploads
+
+
+class Command(BaseCommand):
+    help = "Deletes expired or already attached chunked uploads and their partial files."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--schema",
+            action="append",
+            dest="schemas",
+            help="Only purge this schema (can be passed multiple times)",
+        )
+
+    def handle(self, *args, **options):
+        tenants = Organization.objects.exclude(schema_name="public")
+        if options["schemas"]:
+            tenants = tenants.filter(schema_name__in=options["schemas"])
+
+        total = 0
+        for tenant in tenants:
+            with tenant_context(tenant):
+                purged = purge_expired_uploads()
+                if purged:
+                    total += purged
+                    self.stdout.write(
+                        f"Tenant: {tenant.name} ({tenant.schema_name}) - "
+                        f"{purged} upload(s) purged"
+                    )
+
+        self.stdout.write(self.style.SUCCESS(f"Done. {total} upload(s) purged."))
@@ -0,0 +1,80 @@
+from django.conf import settings
+from django.db import connection, models
+import os
+import uuid
+
+
+class UploadSession(models.Model):
+    """
+    A resumable, chunked upload. Chunks are appended to a partial file on
+    disk as they arrive; once every byte is in and the checksum matches,
+    the file can be attached to a submission or course content.
+    """
+
+    class Purpose(models.TextChoices):
+        SUBMISSION = "submission", "Assignment Submission"
+        COURSE_CONTENT = "course_content", "Course Content"
+
+    class Status(models.TextChoices):
+        UPLOADING = "uploading", "Uploading"
+        COMPLETE = "complete", "Complete"
+        CONSUMED = "consumed", "Attached"
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+
+    # SOFT LINK: global User who started the upload
+    user_id = models.UUIDField(db_index=True)
+
+    purpose = models.CharField(max_length=20, choices=Purpose.choices)
+    filename = models.CharField(max_length=255)
+    content_type = models.CharField(max_length=100, blank=True)
+
+    total_size = models.BigIntegerField()
+    received_bytes = models.BigIntegerField(default=0)
+    # Hex SHA-256 the client announced; filled in from the data if omitted
+    sha256 = models.CharField(max_length=64, blank=True)
+
+    status = models.CharField(
+        max_length=20, choices=Status.choices, default=Status.UPLOADING
+    )
+    expires_at = models.DateTimeField()
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["status", "expires_at"], name="upload_status_expiry_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.filename} ({self.received_bytes}/{self.total_size})"
+
+    @property
+    def part_path(self):
+        """Partial file, namespaced by tenant schema."""
+        return os.path.join(
+            str(settings.UPLOADS["TEMP_DIR"]), connection.schema_name, f"{self.id}.part"
+        )
+
+
+class Blob(models.Model):
+    """
+    One stored file, addressed by the SHA-256 of its content (see
+    uploads.storage). Identical uploads share a blob; ref_count is the
+    number of FileField values pointing at it, and blobs that stay at
+    zero are removed by `gc_blobs`.
+    """
+
+    sha256 = models.CharField(max_length=64, unique=True)
+    name = models.CharField(max_length=255, unique=True)
+    size = models.BigIntegerField()
+    ref_count = models.IntegerField(default=0)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    # Touched whenever an upload reuses the blob; gc_blobs' grace period
+    last_stored_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.sha256[:12]} ({self.ref_count} ref)"
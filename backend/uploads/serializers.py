@@ -0,0 +1,45 @@
+from rest_framework import serializers
+from .models import UploadSession
+
+
+class UploadSessionSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = UploadSession
+        fields = [
+            "id",
+            "purpose",
+            "filename",
+            "content_type",
+            "total_size",
+            "received_bytes",
+            "sha256",
+            "status",
+            "expires_at",
+            "created_at",
+        ]
+        read_only_fields = fields
+
+
+class CompletedUploadField(serializers.UUIDField):
+    """
+    Write-only reference to a finished chunked upload of the given purpose,
+    owned by the requesting user. Validates to the UploadSession itself.
+    """
+
+    def __init__(self, purpose, **kwargs):
+        self.purpose = purpose
+        kwargs.setdefault("write_only", True)
+        kwargs.setdefault("required", False)
+        super().__init__(**kwargs)
+
+    def to_internal_value(self, data):
+        from .services import get_completed_upload
+
+        session_id = super().to_internal_value(data)
+        request = self.context.get("request")
+        session = request and get_completed_upload(
+            session_id, request.user.id, self.purpose
+        )
+        if not session:
+            raise serializers.ValidationError("Upload not found or not complete")
+        return session
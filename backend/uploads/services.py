@@ -0,0 +1,237 @@
+"""
+Chunked, resumable uploads.
+
+The request body of each chunk is streamed straight into the partial
+file in small reads, so a worker never holds more than READ_SIZE bytes
+of an upload in memory, and oversize uploads are refused from their
+declared sizes before any data is read. Each chunk may carry its own
+SHA-256 and is rolled back on mismatch; the whole file is verified
+against the announced SHA-256 when the upload is completed.
+"""
+
+import hashlib
+import os
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files import File
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from rest_framework import status
+
+from .models import UploadSession
+
+READ_SIZE = 64 * 1024
+
+
+class UploadError(ValueError):
+    def __init__(self, message, status_code=status.HTTP_400_BAD_REQUEST, **extra):
+        super().__init__(message)
+        self.status_code = status_code
+        self.extra = extra
+
+
+def _sha256_hex(value, label):
+    value = (value or "").strip().lower()
+    if value and (len(value) != 64 or any(c not in "0123456789abcdef" for c in value)):
+        raise UploadError(f"{label} must be a hex SHA-256 digest")
+    return value
+
+
+def start_upload(user_id, purpose, filename, total_size, content_type="", sha256=""):
+    """Opens an upload session after checking the declared size."""
+    if purpose not in UploadSession.Purpose.values:
+        raise UploadError("Unknown upload purpose")
+
+    filename = os.path.basename(str(filename or "")).strip()
+    if not filename:
+        raise UploadError("filename is required")
+
+    try:
+        total_size = int(total_size)
+    except (TypeError, ValueError):
+        raise UploadError("size must be an integer")
+    if total_size <= 0:
+        raise UploadError("size must be positive")
+
+    max_size = settings.UPLOADS["MAX_SIZE"]
+    if total_size > max_size:
+        raise UploadError(
+            f"File size must not exceed {max_size // (1024 * 1024)}MB",
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        )
+
+    session = UploadSession.objects.create(
+        user_id=user_id,
+        purpose=purpose,
+        filename=filename[:255],
+        content_type=str(content_type or "")[:100],
+        total_size=total_size,
+        sha256=_sha256_hex(sha256, "sha256"),
+        expires_at=timezone.now() + timedelta(hours=settings.UPLOADS["EXPIRY_HOURS"]),
+    )
+    os.makedirs(os.path.dirname(session.part_path), exist_ok=True)
+    open(session.part_path, "wb").close()
+    return session
+
+
+def _lock_session(session_id, user_id):
+    session = (
+        UploadSession.objects.select_for_update()
+        .filter(id=session_id, user_id=user_id)
+        .first()
+    )
+    if session is None:
+        raise UploadError("Upload not found", status_code=status.HTTP_404_NOT_FOUND)
+    if session.expires_at <= timezone.now():
+        raise UploadError("Upload has expired", status_code=status.HTTP_410_GONE)
+    return session
+
+
+def append_chunk(session_id, user_id, offset, length, stream, chunk_sha256="", total_size=None):
+    """
+    Writes `length` bytes from `stream` at `offset`. The offset must equal
+    the bytes already received; after a dropped connection the client asks
+    for the current offset and resumes from there. `total_size`, when the
+    client states one, must match the size the session was opened with.
+    """
+    chunk_sha256 = _sha256_hex(chunk_sha256, "Chunk SHA-256")
+    if length <= 0:
+        raise UploadError("Empty chunk")
+    if length > settings.UPLOADS["CHUNK_SIZE"]:
+        raise UploadError(
+            f"Chunks must not exceed {settings.UPLOADS['CHUNK_SIZE']} bytes",
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        )
+
+    with transaction.atomic():
+        # 1. Serialize writers on the session row; checks use declared sizes only
+        session = _lock_session(session_id, user_id)
+        if session.status != UploadSession.Status.UPLOADING:
+            raise UploadError("Upload is already complete", status_code=status.HTTP_409_CONFLICT)
+        if total_size is not None and total_size != session.total_size:
+            raise UploadError(
+                "Content-Range total does not match the declared file size",
+                size=session.total_size,
+            )
+        if offset != session.received_bytes:
+            raise UploadError(
+                "Chunk does not start at the current offset",
+                status_code=status.HTTP_409_CONFLICT,
+                offset=session.received_bytes,
+            )
+        if offset + length > session.total_size:
+            raise UploadError(
+                "Chunk goes past the declared file size",
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            )
+
+        if not os.path.exists(session.part_path):
+            raise UploadError(
+                "Upload data is missing; restart the upload",
+                status_code=status.HTTP_410_GONE,
+            )
+
+        # 2. Stream the body to disk in small reads, hashing as we go
+        digest = hashlib.sha256()
+        written = 0
+        with open(session.part_path, "r+b") as part:
+            part.seek(offset)
+            while written < length:
+                data = stream.read(min(READ_SIZE, length - written))
+                if not data:
+                    break
+                part.write(data)
+                digest.update(data)
+                written += len(data)
+
+            # 3. Short or corrupted chunks are rolled back so the client can retry
+            if written != length or (chunk_sha256 and digest.hexdigest() != chunk_sha256):
+                part.truncate(offset)
+                raise UploadError(
+                    "Chunk was incomplete" if written != length else "Chunk checksum mismatch",
+                    offset=offset,
+                )
+            part.truncate()
+
+        session.received_bytes = offset + written
+        session.save(update_fields=["received_bytes", "updated_at"])
+    return session
+
+
+def complete_upload(session_id, user_id):
+    """Verifies size and SHA-256 of the assembled file and marks it complete."""
+    with transaction.atomic():
+        session = _lock_session(session_id, user_id)
+        if session.status != UploadSession.Status.UPLOADING:
+            return session
+        if session.received_bytes != session.total_size:
+            raise UploadError(
+                "Upload is missing data",
+                status_code=status.HTTP_409_CONFLICT,
+                offset=session.received_bytes,
+            )
+
+        digest = hashlib.sha256()
+        with open(session.part_path, "rb") as part:
+            for data in iter(lambda: part.read(READ_SIZE), b""):
+                digest.update(data)
+        if session.sha256 and digest.hexdigest() != session.sha256:
+            raise UploadError("File checksum mismatch; restart the upload")
+
+        session.sha256 = digest.hexdigest()
+        session.status = UploadSession.Status.COMPLETE
+        session.save(update_fields=["sha256", "status", "updated_at"])
+    return session
+
+
+def get_completed_upload(session_id, user_id, purpose):
+    """A complete, not yet attached upload owned by the user, or None."""
+    try:
+        session_id = uuid.UUID(str(session_id))
+    except ValueError:
+        return None
+    return UploadSession.objects.filter(
+        id=session_id,
+        user_id=user_id,
+        purpose=purpose,
+        status=UploadSession.Status.COMPLETE,
+        expires_at__gt=timezone.now(),
+    ).first()
+
+
+def attach_upload(session, field_file, save=True):
+    """
+    Saves the assembled file into a FileField (streamed by the storage
+    backend). Call it inside the transaction that saves the row: if that
+    rolls back, the session stays complete and can be attached again; the
+    partial file is only discarded once it commits.
+    """
+    with open(session.part_path, "rb") as part:
+        field_file.save(session.filename, File(part), save=save)
+
+    session.status = UploadSession.Status.CONSUMED
+    session.save(update_fields=["status", "updated_at"])
+    transaction.on_commit(lambda: discard_part(session))
+
+
+def discard_part(session):
+    try:
+        os.remove(session.part_path)
+    except FileNotFoundError:
+        pass
+
+
+def purge_expired_uploads(now=None):
+    """Deletes expired or attached sessions and their partial files."""
+    stale = UploadSession.objects.filter(
+        Q(expires_at__lte=now or timezone.now()) | Q(status=UploadSession.Status.CONSUMED)
+    )
+    count = 0
+    for session in stale.iterator():
+        discard_part(session)
+        count += 1
+    stale.delete()
+    return count
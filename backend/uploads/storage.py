@@ -0,0 +1,75 @@
+"""
+Content-addressed file storage.
+
+Files are stored once per tenant under blobs/<schema>/<aa>/<bb>/<sha256><ext>,
+so the same PDF uploaded to twenty CourseContent items, or the same
+essay resubmitted, takes the disk space of one copy. The FileField keeps
+the blob name; reference counts live in uploads.models.Blob and are
+maintained by uploads.blobs.
+"""
+
+import hashlib
+import os
+import uuid
+
+from django.core.files.storage import FileSystemStorage
+from django.db import connection
+from django.utils import timezone
+
+BLOB_PREFIX = "blobs/"
+
+
+def blob_name(sha256, filename, schema_name=None):
+    ext = os.path.splitext(filename)[1].lower()[:16]
+    schema_name = schema_name or connection.schema_name
+    return f"{BLOB_PREFIX}{schema_name}/{sha256[:2]}/{sha256[2:4]}/{sha256}{ext}"
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    def _save(self, name, content):
+        from .models import Blob
+
+        # 1. Hash while streaming; the requested name only lends its extension
+        digest = hashlib.sha256()
+        content.seek(0)
+        for chunk in content.chunks():
+            digest.update(chunk)
+        sha256 = digest.hexdigest()
+
+        # 2. Claim the row first. Touching last_stored_at waits on (or
+        #    outlives) a gc_blobs run holding the row, so the file is never
+        #    collected between this check and the caller's reference.
+        while True:
+            blob, created = Blob.objects.get_or_create(
+                sha256=sha256,
+                defaults={"name": blob_name(sha256, name), "size": content.size},
+            )
+            if created or Blob.objects.filter(pk=blob.pk).update(
+                last_stored_at=timezone.now()
+            ):
+                break
+
+        # 3. Same bytes, same name: a later upload under another extension
+        #    reuses the first one. Only the first copy is written; rename
+        #    makes concurrent writers safe.
+        if not self.exists(blob.name):
+            content.seek(0)
+            partial = super()._save(f"{blob.name}.{uuid.uuid4().hex}.tmp", content)
+            os.replace(self.path(partial), self.path(blob.name))
+        return blob.name
+
+    def delete(self, name):
+        """Shared blobs are only removed by gc_blobs (see purge)."""
+        if name and name.startswith(BLOB_PREFIX):
+            return
+        super().delete(name)
+
+    def purge(self, name):
+        super().delete(name)
+
+
+blob_storage = ContentAddressedStorage()
+
+
+def get_blob_storage():
+    return blob_storage
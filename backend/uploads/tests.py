@@ -0,0 +1,156 @@
+import io
+import os
+import tempfile
+import uuid
+
+from django.core.exceptions import RequestDataTooBig
+from django.core.files.base import ContentFile
+from django.db import transaction
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import SimpleTestCase, override_settings
+from django_tenants.test.cases import TenantTestCase
+from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
+from rest_framework.test import APIRequestFactory
+from rest_framework.views import APIView
+
+from core.upload_handlers import MaxSizeUploadHandler
+from course_content.models import CourseContent
+from profiles.models import Profile
+from staff.models import StaffMember
+from .blobs import _blob_names, collect_garbage
+from .models import Blob, UploadSession
+from .services import (
+    UploadError,
+    append_chunk,
+    attach_upload,
+    complete_upload,
+    start_upload,
+)
+from .storage import blob_name, blob_storage
+
+LIMITS = {"MAX_SIZE": 1024, "CHUNK_SIZE": 256, "EXPIRY_HOURS": 1, "TEMP_DIR": "/tmp"}
+
+
+@override_settings(UPLOADS=LIMITS)
+class UploadLimitTest(SimpleTestCase):
+    def test_handler_rejects_from_content_length(self):
+        handler = MaxSizeUploadHandler()
+        with self.assertRaises(RequestDataTooBig):
+            handler.handle_raw_input(None, {}, 1024 * 1024, b"--x")
+
+    def test_handler_rejects_once_file_grows_too_big(self):
+        handler = MaxSizeUploadHandler()
+        handler.handle_raw_input(None, {}, None, b"--x")
+        self.assertEqual(handler.receive_data_chunk(b"a" * 512, 0), b"a" * 512)
+        with self.assertRaises(RequestDataTooBig):
+            handler.receive_data_chunk(b"a" * 600, 512)
+
+    def test_oversize_multipart_upload_is_413_like_chunked_uploads(self):
+        class EchoView(APIView):
+            authentication_classes = []
+            permission_classes = [AllowAny]
+
+            def post(self, request):
+                return Response({"fields": sorted(request.data)})
+
+        request = APIRequestFactory().post(
+            "/", {"file": SimpleUploadedFile("essay.pdf", b"a" * 2048)}, format="multipart"
+        )
+        response = EchoView.as_view()(request)
+
+        self.assertEqual(response.status_code, 413)
+
+    def test_oversize_session_refused_before_any_write(self):
+        with self.assertRaises(UploadError) as ctx:
+            start_upload(None, "submission", "essay.pdf", 2048)
+        self.assertEqual(ctx.exception.status_code, 413)
+
+
+class BlobNameTest(SimpleTestCase):
+    sha = "ab" * 32
+
+    def test_blob_name_is_sharded_by_hash_and_keeps_extension(self):
+        self.assertEqual(
+            blob_name(self.sha, "Essay.PDF", schema_name="school"),
+            f"blobs/school/ab/ab/{self.sha}.pdf",
+        )
+
+    def test_tracked_names_read_raw_values_and_field_files(self):
+        name = blob_name(self.sha, "notes.pdf", schema_name="school")
+        content = CourseContent(file=name)
+        self.assertEqual(_blob_names(content, ["file"]), {"file": name})
+        content.file  # the descriptor swaps the str for a FieldFile
+        self.assertEqual(_blob_names(content, ["file"]), {"file": name})
+
+        legacy = CourseContent(file="course_content/2026/01/notes.pdf")
+        self.assertEqual(_blob_names(legacy, ["file"]), {})
+
+
+class ContentAddressedStorageTest(TenantTestCase):
+    def setUp(self):
+        media_root = self.enterContext(tempfile.TemporaryDirectory())
+        temp_dir = self.enterContext(tempfile.TemporaryDirectory())
+        self.enterContext(override_settings(MEDIA_ROOT=media_root))
+        self.enterContext(override_settings(UPLOADS={**LIMITS, "TEMP_DIR": temp_dir}))
+
+    def completed_upload(self, data):
+        user_id = uuid.uuid4()
+        session = start_upload(user_id, "course_content", "notes.pdf", len(data))
+        append_chunk(session.id, user_id, 0, len(data), io.BytesIO(data))
+        return complete_upload(session.id, user_id)
+
+    def test_chunk_with_a_different_total_is_rejected(self):
+        user_id = uuid.uuid4()
+        session = start_upload(user_id, "course_content", "notes.pdf", 10)
+
+        with self.assertRaises(UploadError) as ctx:
+            append_chunk(session.id, user_id, 0, 5, io.BytesIO(b"a" * 5), total_size=5)
+
+        self.assertEqual(ctx.exception.status_code, 400)
+        session.refresh_from_db()
+        self.assertEqual(session.received_bytes, 0)
+
+    def test_rolled_back_attach_leaves_upload_reusable(self):
+        session = self.completed_upload(b"draft")
+        with self.captureOnCommitCallbacks() as callbacks:
+            with self.assertRaises(RuntimeError), transaction.atomic():
+                attach_upload(session, CourseContent().file, save=False)
+                raise RuntimeError("row could not be saved")
+
+        session.refresh_from_db()
+        self.assertEqual(session.status, UploadSession.Status.COMPLETE)
+        self.assertTrue(os.path.exists(session.part_path))
+        self.assertEqual(callbacks, [])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            attach_upload(session, CourseContent().file, save=False)
+        self.assertFalse(os.path.exists(session.part_path))
+
+    def test_same_bytes_under_another_extension_reuse_the_blob(self):
+        first = blob_storage.save("notes.pdf", ContentFile(b"same bytes"))
+        second = blob_storage.save("notes.txt", ContentFile(b"same bytes"))
+
+        self.assertEqual(second, first)
+        self.assertTrue(first.endswith(".pdf"))
+        self.assertEqual(Blob.objects.count(), 1)
+        stored = os.listdir(os.path.dirname(blob_storage.path(first)))
+        self.assertEqual(stored, [os.path.basename(first)])
+
+    def test_gc_keeps_referenced_files_without_a_blob_row(self):
+        name = blob_storage.save("notes.pdf", ContentFile(b"legacy bytes"))
+        Blob.objects.all().delete()
+        staff = StaffMember.objects.create(
+            profile=Profile.objects.create(first_name="Ada", last_name="Lovelace"),
+            employee_id="T-1",
+            designation="Teacher",
+        )
+        CourseContent.objects.create(
+            title="Notes", description="", content_type="document", file=name, created_by=staff
+        )
+        os.utime(blob_storage.path(name), (0, 0))
+
+        summary = collect_garbage(grace_hours=0)
+
+        self.assertEqual(summary["stray_files"], 0)
+        self.assertTrue(blob_storage.exists(name))
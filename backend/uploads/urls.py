@@ -0,0 +1,12 @@
+from django.urls import path
+from .views import UploadSessionView, UploadChunkView, UploadCompleteView
+
+urlpatterns = [
+    path("", UploadSessionView.as_view(), name="upload-start"),
+    path("<uuid:upload_id>/", UploadChunkView.as_view(), name="upload-chunk"),
+    path(
+        "<uuid:upload_id>/complete/",
+        UploadCompleteView.as_view(),
+        name="upload-complete",
+    ),
+]
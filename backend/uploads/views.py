@@ -0,0 +1,124 @@
+import re
+
+from django.conf import settings
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from .models import UploadSession
+from .serializers import UploadSessionSerializer
+from .services import (
+    UploadError,
+    append_chunk,
+    complete_upload,
+    discard_part,
+    start_upload,
+)
+
+CONTENT_RANGE = re.compile(r"^bytes (\d+)-(\d+)/(\d+|\*)$")
+
+
+def _error_response(error):
+    return Response({"error": str(error), **error.extra}, status=error.status_code)
+
+
+def _session_payload(session):
+    return {
+        **UploadSessionSerializer(session).data,
+        "offset": session.received_bytes,
+        "chunk_size": settings.UPLOADS["CHUNK_SIZE"],
+    }
+
+
+class UploadSessionView(APIView):
+    """
+    POST {purpose, filename, size, content_type?, sha256?}
+         -> opens a resumable upload; oversize files are refused here
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        try:
+            session = start_upload(
+                request.user.id,
+                purpose=request.data.get("purpose"),
+                filename=request.data.get("filename"),
+                total_size=request.data.get("size"),
+                content_type=request.data.get("content_type", ""),
+                sha256=request.data.get("sha256", ""),
+            )
+        except UploadError as e:
+            return _error_response(e)
+        return Response(_session_payload(session), status=status.HTTP_201_CREATED)
+
+
+class UploadChunkView(APIView):
+    """
+    GET    -> status and the offset to resume from
+    PUT    raw bytes with `Content-Range: bytes <start>-<end>/<total>`
+           (optional `X-Chunk-SHA256`) -> appends one chunk
+    DELETE -> abandons the upload
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def get_session(self, request, upload_id):
+        return UploadSession.objects.filter(id=upload_id, user_id=request.user.id).first()
+
+    def get(self, request, upload_id):
+        session = self.get_session(request, upload_id)
+        if not session:
+            return Response({"error": "Upload not found"}, status=status.HTTP_404_NOT_FOUND)
+        return Response(_session_payload(session))
+
+    def put(self, request, upload_id):
+        # 1. Everything is decided from headers before the body is read
+        match = CONTENT_RANGE.match(request.META.get("HTTP_CONTENT_RANGE", ""))
+        try:
+            length = int(request.META.get("CONTENT_LENGTH") or 0)
+        except ValueError:
+            length = -1
+        if not match or length != int(match.group(2)) - int(match.group(1)) + 1:
+            return Response(
+                {"error": "Content-Range must match Content-Length"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        # 2. The body is streamed, never parsed (request.data is not touched)
+        total = match.group(3)
+        try:
+            session = append_chunk(
+                upload_id,
+                request.user.id,
+                offset=int(match.group(1)),
+                length=length,
+                stream=request.stream,
+                chunk_sha256=request.META.get("HTTP_X_CHUNK_SHA256", ""),
+                total_size=None if total == "*" else int(total),
+            )
+        except UploadError as e:
+            return _error_response(e)
+        return Response(_session_payload(session))
+
+    def delete(self, request, upload_id):
+        session = self.get_session(request, upload_id)
+        if not session:
+            return Response({"error": "Upload not found"}, status=status.HTTP_404_NOT_FOUND)
+        discard_part(session)
+        session.delete()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class UploadCompleteView(APIView):
+    """POST -> verifies the whole file's SHA-256; the id can then be attached."""
+
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, upload_id):
+        try:
+            session = complete_upload(upload_id, request.user.id)
+        except UploadError as e:
+            return _error_response(e)
+        return Response(_session_payload(session))